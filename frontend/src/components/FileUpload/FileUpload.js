@@ -2,10 +2,33 @@
 import React, { useState } from 'react';
 import './FileUpload.css'; // Убедитесь, что стили лежат рядом
 
+// Как часто опрашивать статус задачи загрузки, мс
+const POLL_INTERVAL = 1000;
+// Сколько ошибок строк показывать пользователю
+const SHOWN_ROW_ERRORS = 5;
+
+// Сервер принимает файл сразу (202) и обрабатывает его в фоне:
+// опрашиваем задачу, пока она не завершится (done или failed)
+const waitForUploadJob = async (jobUrl, onProgress) => {
+  for (;;) {
+    const response = await fetch(jobUrl);
+    if (!response.ok) {
+      throw new Error(`Не удалось получить статус обработки: ${response.status} ${response.statusText}`);
+    }
+    const job = await response.json();
+    if (job.status === 'done' || job.status === 'failed') {
+      return job;
+    }
+    onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL));
+  }
+};
+
 const FileUpload = () => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploadStatus, setUploadStatus] = useState(''); // '', 'uploading', 'success', 'error'
   const [uploadMessage, setUploadMessage] = useState(''); // Для отображения сообщений пользователю
+  const [rowErrors, setRowErrors] = useState([]); // Ошибки в строках обработанного файла
 
   const handleFileChange = (event) => {
     const file = event.target.files[0];
@@ -15,6 +38,7 @@ const FileUpload = () => {
       setSelectedFile(file);
       setUploadStatus('');
       setUploadMessage('');
+      setRowErrors([]);
     } else {
       alert('Пожалуйста, выберите файл в формате .xlsx');
       event.target.value = null; // Сбросить выбор файла в инпуте
@@ -33,6 +57,7 @@ const FileUpload = () => {
 
     setUploadStatus('uploading');
     setUploadMessage('Загрузка файла...');
+    setRowErrors([]);
     
     // Определяем URL сервера в зависимости от среды
     let serverUrl = "localhost:8000"; // По умолчанию для разработки
@@ -61,14 +86,28 @@ const FileUpload = () => {
       console.log('Ответ от сервера загрузки:', response);
 
       if (response.ok) {
-        // Файл успешно загружен
-        const result = await response.json(); // Предполагаем, что сервер возвращает JSON
-        console.log('Успешная загрузка:', result);
-        setUploadStatus('success');
-        // Сообщение может прийти от сервера, например, result.message
-        setUploadMessage(result?.message || `Файл "${selectedFile.name}" успешно загружен.`);
-        
-        // Сбросить выбор файла после успешной загрузки
+        // Файл принят, сервер вернул задачу его обработки
+        const result = await response.json();
+        console.log('Файл принят в обработку:', result);
+        setUploadMessage(`Файл "${selectedFile.name}" загружен, идёт обработка...`);
+
+        const job = await waitForUploadJob(`${uploadUrl}${result.id}`, (progress) => {
+          setUploadMessage(`Обработка файла "${selectedFile.name}": прочитано строк ${progress.rows_parsed}...`);
+        });
+        console.log('Результат обработки:', job);
+        setRowErrors(job.row_errors || []);
+        if (job.status === 'done') {
+          setUploadStatus('success');
+          setUploadMessage(
+            `Файл "${selectedFile.name}" обработан: добавлено полётов ${job.rows_inserted}, `
+            + `отклонено строк ${job.rows_rejected}.`
+          );
+        } else {
+          setUploadStatus('error');
+          setUploadMessage(`Ошибка обработки файла "${selectedFile.name}": ${job.error || 'неизвестная ошибка'}`);
+        }
+
+        // Сбросить выбор файла после загрузки
         setSelectedFile(null);
         // Сбросить значение инпута файла, чтобы можно было выбрать тот же файл снова
         const fileInput = document.getElementById('excel-file');
@@ -143,6 +182,20 @@ const FileUpload = () => {
             {uploadMessage}
           </p>
         )}
+
+        {/* Первые ошибки в строках файла: номер строки листа, колонка и причина */}
+        {rowErrors.length > 0 && (
+          <ul className="row-errors">
+            {rowErrors.slice(0, SHOWN_ROW_ERRORS).map((error) => (
+              <li key={`${error.row}-${error.column}`}>
+                Строка {error.row}, {error.column}: {error.reason}
+              </li>
+            ))}
+            {rowErrors.length > SHOWN_ROW_ERRORS && (
+              <li>и ещё ошибок: {rowErrors.length - SHOWN_ROW_ERRORS}</li>
+            )}
+          </ul>
+        )}
       </div>
     </div>
   );
@@ -5,6 +5,8 @@ from app.config import DefaultSettings, get_settings
 from app.endpoints import list_of_routes
 from app.schemas.application import ErrorResponse
 from app.utils.application import validation_exception_handler
+from app.utils.executor import shutdown_executors
+from app.utils.flight import fail_stale_upload_jobs, prepare_region_boundaries
 
 
 def bind_routes(application: FastAPI, setting: DefaultSettings) -> None:
@@ -39,6 +41,9 @@ def get_app() -> FastAPI:
     settings = get_settings()
     bind_routes(application, settings)
     application.state.settings = settings
+    application.add_event_handler("startup", prepare_region_boundaries)
+    application.add_event_handler("startup", fail_stale_upload_jobs)
+    application.add_event_handler("shutdown", shutdown_executors)
     application.add_exception_handler(
         exceptions.RequestValidationError,
         validation_exception_handler,
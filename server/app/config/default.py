@@ -1,4 +1,5 @@
-from os import environ
+from os import environ, path
+from tempfile import gettempdir
 
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
@@ -31,6 +32,44 @@ class DefaultSettings(BaseSettings):
     ALGORITHM: str = environ.get("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
 
+    # count of rows of uploaded file, which are parsed and inserted at once
+    UPLOAD_CHUNK_SIZE: int = int(environ.get("UPLOAD_CHUNK_SIZE", 10000))
+    # count of errors of invalid rows, which are kept in the upload job
+    UPLOAD_MAX_ROW_ERRORS: int = int(environ.get("UPLOAD_MAX_ROW_ERRORS", 1000))
+    # uploaded files are kept here until their ingest job finishes
+    UPLOAD_DIR: str = environ.get("UPLOAD_DIR", gettempdir())
+    # web workers mark their unfinished upload jobs alive this often, in seconds; a job, which
+    # was not marked alive for `UPLOAD_STALE_SECONDS`, has lost its worker and is marked failed
+    UPLOAD_HEARTBEAT_SECONDS: float = float(environ.get("UPLOAD_HEARTBEAT_SECONDS", 30))
+    UPLOAD_STALE_SECONDS: float = float(environ.get("UPLOAD_STALE_SECONDS", 300))
+    # limits of uploaded ZIP archive, checked before anything is extracted: count of its xlsx files,
+    # their total size in bytes and the largest ratio of size of a file to its compressed size
+    UPLOAD_ARCHIVE_MAX_FILES: int = int(environ.get("UPLOAD_ARCHIVE_MAX_FILES", 100))
+    UPLOAD_ARCHIVE_MAX_SIZE: int = int(environ.get("UPLOAD_ARCHIVE_MAX_SIZE", 2 * 1024 ** 3))
+    UPLOAD_ARCHIVE_MAX_RATIO: float = float(environ.get("UPLOAD_ARCHIVE_MAX_RATIO", 100))
+    # count of processes of every web worker, which parse and insert uploaded files in background;
+    # gunicorn runs `2 * cpu_count() + 1` web workers (see gunicorn.py), so they all have about
+    # 2 ingest processes per CPU with 1 of them, and a larger count only makes them compete for CPU
+    INGEST_WORKERS: int = int(environ.get("INGEST_WORKERS", 1))
+    # count of threads and processes, which run CPU-bound work of requests out of the event loop
+    THREAD_WORKERS: int = int(environ.get("THREAD_WORKERS", 4))
+    PROCESS_WORKERS: int = int(environ.get("PROCESS_WORKERS", 2))
+    # less rows are processed right in the event loop: sending them to a process costs more
+    PROCESS_MIN_ROWS: int = int(environ.get("PROCESS_MIN_ROWS", 20000))
+
+    # count of cached responses of statistic and their lifetime in seconds
+    STATISTIC_CACHE_SIZE: int = int(environ.get("STATISTIC_CACHE_SIZE", 256))
+    STATISTIC_CACHE_TTL: int = int(environ.get("STATISTIC_CACHE_TTL", 600))
+
+    # compiled index of regions of the shapefile, shared by all workers
+    REGION_INDEX_DIR: str = environ.get("REGION_INDEX_DIR", path.join(gettempdir(), "region-index"))
+    # cells per degree of the grid of index: most points get region from their cell without polygons
+    REGION_GRID_CELLS_PER_DEGREE: int = int(environ.get("REGION_GRID_CELLS_PER_DEGREE", 10))
+    # count of cells of grid of coordinates with known regions, which are kept in memory of process
+    REGION_CELLS_CACHE_SIZE: int = int(environ.get("REGION_CELLS_CACHE_SIZE", 200000))
+    # simplified boundaries of regions are kept here between restarts, until the shapefile changes
+    BOUNDARIES_DIR: str = environ.get("BOUNDARIES_DIR", path.join(gettempdir(), "region-boundaries"))
+
     PWD_CONTEXT: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
     OAUTH2_SCHEME: OAuth2PasswordBearer = OAuth2PasswordBearer(tokenUrl=f"{PATH_PREFIX}/user/authentication")
     model_config = SettingsConfigDict(
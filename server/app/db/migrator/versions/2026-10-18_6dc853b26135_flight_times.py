@@ -0,0 +1,74 @@
+"""flight_times
+
+Revision ID: 6dc853b26135
+Revises: eec9c7cea4b6
+Create Date: 2026-10-18 09:06:03.057951
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '6dc853b26135'
+down_revision = 'eec9c7cea4b6'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 50000
+
+BACKFILL = sa.text("""
+WITH batch AS (
+    SELECT sid FROM flights
+    WHERE sid > :last_sid
+    ORDER BY sid
+    LIMIT :batch_size
+),
+times AS (
+    SELECT
+        sid,
+        departure_date + departure_time AS departure_at,
+        arrival_date + arrival_time AS arrival_at
+    FROM flights
+    WHERE sid IN (SELECT sid FROM batch)
+),
+updated AS (
+    UPDATE flights SET
+        departure_at = times.departure_at,
+        arrival_at = CASE
+            WHEN times.arrival_at < times.departure_at THEN times.arrival_at + interval '1 day'
+            ELSE times.arrival_at
+        END,
+        duration_minutes = extract(epoch FROM times.arrival_at - times.departure_at) / 60 + CASE
+            WHEN times.arrival_at < times.departure_at THEN 24 * 60
+            ELSE 0
+        END
+    FROM times
+    WHERE flights.sid = times.sid
+)
+SELECT max(sid) FROM batch
+""")
+
+
+def upgrade():
+    op.add_column('flights', sa.Column('departure_at', sa.DateTime(), nullable=True))
+    op.add_column('flights', sa.Column('arrival_at', sa.DateTime(), nullable=True))
+    op.add_column('flights', sa.Column('duration_minutes', sa.Float(), nullable=True))
+
+    # existing flights are updated in batches of SIDs, indexes are built after backfill
+    connection = op.get_bind()
+    last_sid = -1
+    while last_sid is not None:
+        last_sid = connection.execute(BACKFILL, {"last_sid": last_sid, "batch_size": BATCH_SIZE}).scalar()
+
+    op.create_index(op.f('ix__flights__arrival_at'), 'flights', ['arrival_at'], unique=False)
+    op.create_index(op.f('ix__flights__departure_at'), 'flights', ['departure_at'], unique=False)
+    op.create_index(op.f('ix__flights__duration_minutes'), 'flights', ['duration_minutes'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix__flights__duration_minutes'), table_name='flights')
+    op.drop_index(op.f('ix__flights__departure_at'), table_name='flights')
+    op.drop_index(op.f('ix__flights__arrival_at'), table_name='flights')
+    op.drop_column('flights', 'duration_minutes')
+    op.drop_column('flights', 'arrival_at')
+    op.drop_column('flights', 'departure_at')
@@ -0,0 +1,109 @@
+"""flight daily stats
+
+Revision ID: 7e4bf7d63e84
+Revises: 3fe9bcf49670
+Create Date: 2026-10-18 08:53:58.687597
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7e4bf7d63e84'
+down_revision = '3fe9bcf49670'
+branch_labels = None
+depends_on = None
+
+# counters of flights which are already in the database,
+# the same as FlightRepository.update_daily_stats does for new flights
+BACKFILL = """
+WITH durations AS (
+    SELECT
+        *,
+        CASE
+            WHEN extract(epoch FROM (arrival_date + arrival_time) - (departure_date + departure_time)) / 60 < 0
+            THEN extract(epoch FROM (arrival_date + arrival_time) - (departure_date + departure_time)) / 60 + 1440
+            ELSE extract(epoch FROM (arrival_date + arrival_time) - (departure_date + departure_time)) / 60
+        END AS duration
+    FROM flights
+)
+INSERT INTO flight_daily_stats (
+    departure_date, reg_departure, reg_arrival, type_aircraft,
+    flights, duration_total, duration_count,
+    duration__0, duration__1, duration__2, duration__3, duration__4,
+    duration__5, duration__6, duration__7, duration__8,
+    null__arrival_date, null__arrival_time, null__reg_arrival, null__arrival_latitude,
+    null__arrival_longitude, null__type_aircraft, null__departure_date, null__departure_time,
+    null__reg_departure, null__departure_latitude, null__departure_longitude
+)
+SELECT
+    departure_date, reg_departure, reg_arrival, type_aircraft,
+    count(*), coalesce(sum(duration), 0), count(duration),
+    count(*) FILTER (WHERE duration <= 10),
+    count(*) FILTER (WHERE duration > 10 AND duration <= 30),
+    count(*) FILTER (WHERE duration > 30 AND duration <= 60),
+    count(*) FILTER (WHERE duration > 60 AND duration <= 120),
+    count(*) FILTER (WHERE duration > 120 AND duration <= 240),
+    count(*) FILTER (WHERE duration > 240 AND duration <= 480),
+    count(*) FILTER (WHERE duration > 480 AND duration <= 720),
+    count(*) FILTER (WHERE duration > 720 AND duration <= 1440),
+    count(*) FILTER (WHERE duration > 1440),
+    count(*) FILTER (WHERE arrival_date IS NULL),
+    count(*) FILTER (WHERE arrival_time IS NULL),
+    count(*) FILTER (WHERE reg_arrival IS NULL OR reg_arrival = ''),
+    count(*) FILTER (WHERE arrival_latitude IS NULL OR arrival_latitude = 0),
+    count(*) FILTER (WHERE arrival_longitude IS NULL OR arrival_longitude = 0),
+    count(*) FILTER (WHERE type_aircraft IS NULL OR type_aircraft = ''),
+    count(*) FILTER (WHERE departure_date IS NULL),
+    count(*) FILTER (WHERE departure_time IS NULL),
+    count(*) FILTER (WHERE reg_departure IS NULL OR reg_departure = ''),
+    count(*) FILTER (WHERE departure_latitude IS NULL OR departure_latitude = 0),
+    count(*) FILTER (WHERE departure_longitude IS NULL OR departure_longitude = 0)
+FROM durations
+GROUP BY departure_date, reg_departure, reg_arrival, type_aircraft
+"""
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('flight_daily_stats',
+    sa.Column('departure_date', sa.Date(), nullable=True),
+    sa.Column('reg_departure', sa.String(length=128), nullable=True),
+    sa.Column('reg_arrival', sa.String(length=128), nullable=True),
+    sa.Column('type_aircraft', sa.String(length=128), nullable=True),
+    sa.Column('flights', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration_total', sa.Numeric(), server_default='0', nullable=False),
+    sa.Column('duration_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__0', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__1', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__2', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__3', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__4', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__5', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__6', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__7', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('duration__8', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__arrival_date', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__arrival_time', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__reg_arrival', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__arrival_latitude', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__arrival_longitude', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__type_aircraft', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__departure_date', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__departure_time', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__reg_departure', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__departure_latitude', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('null__departure_longitude', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk__flight_daily_stats')),
+    sa.UniqueConstraint('departure_date', 'reg_departure', 'reg_arrival', 'type_aircraft', name='uq__flight_daily_stats__key', postgresql_nulls_not_distinct=True),
+    sa.UniqueConstraint('id', name=op.f('uq__flight_daily_stats__id'))
+    )
+    # ### end Alembic commands ###
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('flight_daily_stats')
+    # ### end Alembic commands ###
@@ -0,0 +1,99 @@
+"""partitioned_flights
+
+Revision ID: eec9c7cea4b6
+Revises: deda52f121ce
+Create Date: 2026-10-18 09:02:14.934625
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'eec9c7cea4b6'
+down_revision = 'deda52f121ce'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    'sid, type_aircraft, departure_date, departure_time, reg_departure, reg_departure_id, '
+    'departure_latitude, departure_longitude, arrival_time, arrival_date, reg_arrival, reg_arrival_id, '
+    'arrival_latitude, arrival_longitude'
+)
+
+
+def flights_columns(sid: sa.Column):
+    return [
+        sid,
+        sa.Column('type_aircraft', sa.String(length=128), nullable=True),
+        sa.Column('departure_date', sa.Date(), nullable=True),
+        sa.Column('departure_time', sa.Time(), nullable=True),
+        sa.Column('reg_departure', sa.String(length=128), nullable=True),
+        sa.Column('reg_departure_id', sa.Integer(), nullable=True),
+        sa.Column('departure_latitude', sa.Numeric(precision=10, scale=8), nullable=True),
+        sa.Column('departure_longitude', sa.Numeric(precision=11, scale=8), nullable=True),
+        sa.Column('arrival_time', sa.Time(), nullable=True),
+        sa.Column('arrival_date', sa.Date(), nullable=True),
+        sa.Column('reg_arrival', sa.String(length=128), nullable=True),
+        sa.Column('reg_arrival_id', sa.Integer(), nullable=True),
+        sa.Column('arrival_latitude', sa.Numeric(precision=10, scale=8), nullable=True),
+        sa.Column('arrival_longitude', sa.Numeric(precision=11, scale=8), nullable=True),
+        sa.ForeignKeyConstraint(['reg_departure_id'], ['regions.id'], name=op.f('fk__flights__reg_departure_id__regions')),
+        sa.ForeignKeyConstraint(['reg_arrival_id'], ['regions.id'], name=op.f('fk__flights__reg_arrival_id__regions')),
+    ]
+
+
+def upgrade():
+    op.drop_index(op.f('ix__flights__reg_departure_id'), table_name='flights')
+    op.drop_index(op.f('ix__flights__reg_arrival_id'), table_name='flights')
+    op.rename_table('flights', 'flights_unpartitioned')
+
+    op.create_table('flights',
+    *flights_columns(sa.Column('sid', sa.BIGINT(), nullable=False)),
+    postgresql_partition_by='RANGE (departure_date)'
+    )
+    op.execute("CREATE TABLE flights_default PARTITION OF flights DEFAULT")
+    # partitions of months of existing flights, partitions of new months are created on upload
+    op.execute("""
+        DO $$
+        DECLARE month date;
+        BEGIN
+            FOR month IN
+                SELECT DISTINCT date_trunc('month', departure_date)::date
+                FROM flights_unpartitioned
+                WHERE departure_date IS NOT NULL
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF flights FOR VALUES FROM (%L) TO (%L)',
+                    'flights_' || to_char(month, 'YYYY_MM'), month, month + interval '1 month'
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"INSERT INTO flights ({COLUMNS}) SELECT {COLUMNS} FROM flights_unpartitioned")
+
+    op.create_table('flight_sids',
+    sa.Column('sid', sa.BIGINT(), autoincrement=False, nullable=False),
+    sa.PrimaryKeyConstraint('sid', name=op.f('pk__flight_sids'))
+    )
+    op.execute("INSERT INTO flight_sids (sid) SELECT sid FROM flights_unpartitioned")
+    op.drop_table('flights_unpartitioned')
+
+    # indexes are built after data is moved, on every partition
+    op.create_index(op.f('ix__flights__sid'), 'flights', ['sid'], unique=False)
+    op.create_index(op.f('ix__flights__departure_date'), 'flights', ['departure_date'], unique=False)
+    op.create_index(op.f('ix__flights__reg_departure_id'), 'flights', ['reg_departure_id'], unique=False)
+    op.create_index(op.f('ix__flights__reg_arrival_id'), 'flights', ['reg_arrival_id'], unique=False)
+
+
+def downgrade():
+    op.create_table('flights_unpartitioned',
+    *flights_columns(sa.Column('sid', sa.BIGINT(), autoincrement=True, nullable=False)),
+    sa.PrimaryKeyConstraint('sid', name=op.f('pk__flights'))
+    )
+    op.execute(f"INSERT INTO flights_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM flights")
+    op.drop_table('flights')
+    op.drop_table('flight_sids')
+    op.rename_table('flights_unpartitioned', 'flights')
+    op.execute("ALTER SEQUENCE flights_unpartitioned_sid_seq RENAME TO flights_sid_seq")
+    op.create_index(op.f('ix__flights__reg_departure_id'), 'flights', ['reg_departure_id'], unique=False)
+    op.create_index(op.f('ix__flights__reg_arrival_id'), 'flights', ['reg_arrival_id'], unique=False)
@@ -1,7 +1,19 @@
+from .dataset_version import DatasetVersion
 from .flight import Flight
+from .flight_daily_stats import FlightDailyStats
+from .flight_sid import FlightSid
+from .region import Region
+from .region_cell import RegionCell
+from .upload_job import UploadJob
 from .user import User
 
 __all__ = [
+    "DatasetVersion",
     "Flight",
+    "FlightDailyStats",
+    "FlightSid",
+    "Region",
+    "RegionCell",
+    "UploadJob",
     "User",
 ]
@@ -0,0 +1,30 @@
+from sqlalchemy import BIGINT, Column, DateTime, Integer
+from sqlalchemy.sql import func
+
+from app.db import DeclarativeBase
+
+
+class DatasetVersion(DeclarativeBase):
+    """
+    The only row of this table is bumped by every upload which changed flights,
+    so cached statistic of older versions is stale.
+    """
+    __tablename__ = "dataset_version"
+
+    id = Column(
+        "id",
+        Integer,
+        primary_key=True,
+    )
+    version = Column(
+        "version",
+        BIGINT,
+        nullable=False,
+        server_default="1",
+    )
+    updated_at = Column(
+        "updated_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),  # pylint: disable=not-callable
+    )
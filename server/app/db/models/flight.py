@@ -1,17 +1,36 @@
-from sqlalchemy import Column, Date, Numeric, String, Time
+from sqlalchemy import Column, Computed, Date, DateTime, Float, ForeignKey, Integer, Numeric, String, Time
 from sqlalchemy.dialects.postgresql import BIGINT
 
 from app.db import DeclarativeBase
 
+# cells of the finest grid of departure and arrival points per degree of latitude or longitude
+GRID_CELLS_PER_DEGREE = 100
+
+
+def grid_cell(coordinate: str, offset: int) -> Computed:
+    """
+    Number of cell of the finest grid, counted from -`offset` degrees, so it is never negative.
+    """
+    return Computed(f"floor(({coordinate} + {offset}) * {GRID_CELLS_PER_DEGREE})", persisted=True)
+
 
 class Flight(DeclarativeBase):
+    """
+    Table of flights is partitioned by month of departure (flights without
+    departure date are kept in the default partition), so queries by range
+    of departure dates read only partitions of months of the range.
+
+    Primary key of partitioned table must include the partition key, so SID
+    is not unique in the table itself: uniqueness of SIDs is kept by `FlightSid`.
+    """
     __tablename__ = 'flights'
+    __table_args__ = {"postgresql_partition_by": "RANGE (departure_date)"}
 
     sid = Column(
         "sid",
         BIGINT,
-        primary_key=True,
-        autoincrement=True,
+        nullable=False,
+        index=True,
     )
     type_aircraft = Column(
         "type_aircraft",
@@ -22,6 +41,7 @@ class Flight(DeclarativeBase):
         "departure_date",
         Date,
         nullable=True,
+        index=True,
     )
     departure_time = Column(
         "departure_time",
@@ -33,6 +53,13 @@ class Flight(DeclarativeBase):
         String(128),
         nullable=True,
     )
+    reg_departure_id = Column(
+        "reg_departure_id",
+        Integer,
+        ForeignKey("regions.id"),
+        nullable=True,
+        index=True,
+    )
     departure_latitude = Column(
         "departure_latitude",
         Numeric(10, 8),
@@ -58,6 +85,13 @@ class Flight(DeclarativeBase):
         String(128),
         nullable=True,
     )
+    reg_arrival_id = Column(
+        "reg_arrival_id",
+        Integer,
+        ForeignKey("regions.id"),
+        nullable=True,
+        index=True,
+    )
     arrival_latitude = Column(
         "arrival_latitude",
         Numeric(10, 8),
@@ -68,6 +102,53 @@ class Flight(DeclarativeBase):
         Numeric(11, 8),
         nullable=True,
     )
+    # computed on insert from dates and times above, see `FlightRepository.create_batch`
+    departure_at = Column(
+        "departure_at",
+        DateTime,
+        nullable=True,
+        index=True,
+    )
+    arrival_at = Column(
+        "arrival_at",
+        DateTime,
+        nullable=True,
+        index=True,
+    )
+    duration_minutes = Column(
+        "duration_minutes",
+        Float,
+        nullable=True,
+        index=True,
+    )
+
+    # computed by the database from coordinates above, see `FlightRepository.get_heatmap`
+    departure_lat_cell = Column(
+        "departure_lat_cell",
+        Integer,
+        grid_cell("departure_latitude", 90),
+        nullable=True,
+    )
+    departure_lon_cell = Column(
+        "departure_lon_cell",
+        Integer,
+        grid_cell("departure_longitude", 180),
+        nullable=True,
+    )
+    arrival_lat_cell = Column(
+        "arrival_lat_cell",
+        Integer,
+        grid_cell("arrival_latitude", 90),
+        nullable=True,
+    )
+    arrival_lon_cell = Column(
+        "arrival_lon_cell",
+        Integer,
+        grid_cell("arrival_longitude", 180),
+        nullable=True,
+    )
+
+    __mapper_args__ = {"primary_key": [sid]}
 
     def __repr__(self):
         columns = {column.name: getattr(self, column.name) for column in self.__table__.columns}
@@ -0,0 +1,69 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, String, UniqueConstraint
+
+from .base import BaseTable
+
+
+class FlightDailyStats(BaseTable):
+    """
+    Counters of flights with the same departure date, regions and type of aircraft.
+
+    Counters are sums, so any set of rows can be merged into statistic of its flights.
+    `duration__<index>` is count of flights in bin of `DURATION_BINS` with this index,
+    `null__<column>` is count of flights without value of the column.
+    """
+    __tablename__ = "flight_daily_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "departure_date",
+            "reg_departure",
+            "reg_arrival",
+            "type_aircraft",
+            name="uq__flight_daily_stats__key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    departure_date = Column("departure_date", Date, nullable=True)
+    reg_departure = Column("reg_departure", String(128), nullable=True)
+    reg_arrival = Column("reg_arrival", String(128), nullable=True)
+    type_aircraft = Column("type_aircraft", String(128), nullable=True)
+    reg_departure_id = Column("reg_departure_id", Integer, ForeignKey("regions.id"), nullable=True, index=True)
+    reg_arrival_id = Column("reg_arrival_id", Integer, ForeignKey("regions.id"), nullable=True, index=True)
+
+    flights = Column("flights", Integer, nullable=False, server_default="0")
+    duration_total = Column(
+        "duration_total",
+        Numeric,
+        nullable=False,
+        server_default="0",
+        doc="Sum of known durations of flights in minutes.",
+    )
+    duration_count = Column(
+        "duration_count",
+        Integer,
+        nullable=False,
+        server_default="0",
+        doc="Count of flights with known duration.",
+    )
+
+    duration__0 = Column("duration__0", Integer, nullable=False, server_default="0")
+    duration__1 = Column("duration__1", Integer, nullable=False, server_default="0")
+    duration__2 = Column("duration__2", Integer, nullable=False, server_default="0")
+    duration__3 = Column("duration__3", Integer, nullable=False, server_default="0")
+    duration__4 = Column("duration__4", Integer, nullable=False, server_default="0")
+    duration__5 = Column("duration__5", Integer, nullable=False, server_default="0")
+    duration__6 = Column("duration__6", Integer, nullable=False, server_default="0")
+    duration__7 = Column("duration__7", Integer, nullable=False, server_default="0")
+    duration__8 = Column("duration__8", Integer, nullable=False, server_default="0")
+
+    null__arrival_date = Column("null__arrival_date", Integer, nullable=False, server_default="0")
+    null__arrival_time = Column("null__arrival_time", Integer, nullable=False, server_default="0")
+    null__reg_arrival = Column("null__reg_arrival", Integer, nullable=False, server_default="0")
+    null__arrival_latitude = Column("null__arrival_latitude", Integer, nullable=False, server_default="0")
+    null__arrival_longitude = Column("null__arrival_longitude", Integer, nullable=False, server_default="0")
+    null__type_aircraft = Column("null__type_aircraft", Integer, nullable=False, server_default="0")
+    null__departure_date = Column("null__departure_date", Integer, nullable=False, server_default="0")
+    null__departure_time = Column("null__departure_time", Integer, nullable=False, server_default="0")
+    null__reg_departure = Column("null__reg_departure", Integer, nullable=False, server_default="0")
+    null__departure_latitude = Column("null__departure_latitude", Integer, nullable=False, server_default="0")
+    null__departure_longitude = Column("null__departure_longitude", Integer, nullable=False, server_default="0")
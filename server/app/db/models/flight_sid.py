@@ -0,0 +1,19 @@
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import BIGINT
+
+from app.db import DeclarativeBase
+
+
+class FlightSid(DeclarativeBase):
+    """
+    SIDs of all flights: partitioned table of flights can't have unique index
+    on SID alone, so SIDs of new flights are claimed here first.
+    """
+    __tablename__ = "flight_sids"
+
+    sid = Column(
+        "sid",
+        BIGINT,
+        primary_key=True,
+        autoincrement=False,
+    )
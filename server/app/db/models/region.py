@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String
+
+from app.db import DeclarativeBase
+
+
+class Region(DeclarativeBase):
+    """
+    Names of regions of `admin_4.shp`, which flights refer to by id.
+    """
+    __tablename__ = "regions"
+
+    id = Column(
+        "id",
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+    name = Column(
+        "name",
+        String(128),
+        nullable=False,
+        unique=True,
+    )
@@ -0,0 +1,41 @@
+from sqlalchemy import Boolean, Column, Integer, String
+
+from app.db import DeclarativeBase
+
+
+class RegionCell(DeclarativeBase):
+    """
+    Regions of cells of 0.001 degree of coordinates, computed once for a version of `admin_4.shp`.
+    """
+    __tablename__ = "region_cells"
+
+    shapefile = Column(
+        "shapefile",
+        String(16),
+        primary_key=True,
+        doc="Hash of the shapefile, which regions are computed from.",
+    )
+    lon_cell = Column(
+        "lon_cell",
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+    )
+    lat_cell = Column(
+        "lat_cell",
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+    )
+    region = Column(
+        "region",
+        String(128),
+        nullable=True,
+        doc="Region, which contains the whole cell, or None when the cell is out of all regions.",
+    )
+    boundary = Column(
+        "boundary",
+        Boolean,
+        nullable=False,
+        doc="Cell is crossed by a boundary of region, so its points are tested one by one.",
+    )
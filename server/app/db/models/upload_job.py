@@ -0,0 +1,88 @@
+from sqlalchemy import Column, DateTime, Float, Integer
+from sqlalchemy.dialects.postgresql import JSONB, TEXT, UUID
+from sqlalchemy.sql import func
+
+from .base import BaseTable
+
+
+class UploadJob(BaseTable):
+    __tablename__ = "upload_jobs"
+
+    filename = Column(
+        "filename",
+        TEXT,
+        nullable=False,
+        doc="Name of uploaded file.",
+    )
+    batch_id = Column(
+        "batch_id",
+        UUID(as_uuid=True),
+        nullable=True,
+        index=True,
+        doc="Batch of files uploaded together, None for a single file.",
+    )
+    status = Column(
+        "status",
+        TEXT,
+        nullable=False,
+        server_default="pending",
+        doc="pending, running, done or failed.",
+    )
+    rows_parsed = Column("rows_parsed", Integer, nullable=False, server_default="0")
+    rows_geocoded = Column("rows_geocoded", Integer, nullable=False, server_default="0")
+    rows_inserted = Column("rows_inserted", Integer, nullable=False, server_default="0")
+    rows_rejected = Column(
+        "rows_rejected",
+        Integer,
+        nullable=False,
+        server_default="0",
+        doc="Rows which were not inserted (SID is already in the database or row is invalid).",
+    )
+    row_errors = Column(
+        "row_errors",
+        JSONB,
+        nullable=False,
+        server_default="[]",
+        doc="Errors of invalid rows: number of row in the sheet, column and reason.",
+    )
+    region_cache_hits = Column(
+        "region_cache_hits",
+        Integer,
+        nullable=False,
+        server_default="0",
+        doc="Points, which got their region from cache of cells of coordinates.",
+    )
+    region_cache_misses = Column(
+        "region_cache_misses",
+        Integer,
+        nullable=False,
+        server_default="0",
+        doc="Points, which were tested against polygons of regions.",
+    )
+    parse_seconds = Column("parse_seconds", Float, nullable=False, server_default="0")
+    geocode_seconds = Column("geocode_seconds", Float, nullable=False, server_default="0")
+    insert_seconds = Column("insert_seconds", Float, nullable=False, server_default="0")
+    error = Column(
+        "error",
+        TEXT,
+        nullable=True,
+        doc="Reason of failure of the job.",
+    )
+    created_at = Column(
+        "created_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),  # pylint: disable=not-callable
+    )
+    heartbeat_at = Column(
+        "heartbeat_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),  # pylint: disable=not-callable
+        doc="Last time the web worker, which runs the job, was alive.",
+    )
+    finished_at = Column(
+        "finished_at",
+        DateTime(timezone=True),
+        nullable=True,
+    )
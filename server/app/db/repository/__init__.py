@@ -1,7 +1,17 @@
+from .dataset_version import DatasetVersionRepository
 from .flight import FlightRepository
+from .flight_daily_stats import FlightDailyStatsRepository
+from .region import RegionRepository
+from .region_cell import RegionCellRepository
+from .upload_job import UploadJobRepository
 from .user import UserRepository
 
 __all__ = [
+    "DatasetVersionRepository",
     "FlightRepository",
+    "FlightDailyStatsRepository",
+    "RegionRepository",
+    "RegionCellRepository",
+    "UploadJobRepository",
     "UserRepository",
 ]
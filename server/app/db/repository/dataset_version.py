@@ -0,0 +1,25 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DatasetVersion
+
+from .base import BaseRepository
+
+
+class DatasetVersionRepository(BaseRepository[DatasetVersion, None, None]):
+    def __init__(self):
+        super().__init__(DatasetVersion)
+
+    async def get_current(self, session: AsyncSession) -> DatasetVersion:
+        return await session.scalar(select(self.model))
+
+    async def bump(self, session: AsyncSession) -> None:
+        """
+        Increments version in the transaction of session, so it is visible with the changes only.
+        """
+        await session.execute(
+            update(self.model).values(
+                version=self.model.version + 1,
+                updated_at=func.now(),  # pylint: disable=not-callable
+            ),
+        )
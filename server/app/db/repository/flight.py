@@ -1,14 +1,23 @@
-from datetime import date, time
-from typing import Any
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Any, Iterable, Sequence
 
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import exc, or_, select
+from sqlalchemy import ColumnElement, Numeric, RowMapping, Select, String, and_, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Flight
-from app.schemas.flights import FlightCreateModel
+from app.db.models import Flight, FlightDailyStats, FlightSid
+from app.schemas.flights import DURATION_BINS, NULL_FEATURES, FlightCreateModel, UploadSummary
 
 from .base import BaseRepository
+from .dataset_version import DatasetVersionRepository
+from .region import RegionRepository
+
+# key of advisory lock held while partitions of flights are created
+PARTITIONS_LOCK = 1_000_011
+
+# flights with the same values of these columns share a row of `FlightDailyStats`
+DAILY_STATS_KEY = ["departure_date", "reg_departure", "reg_arrival", "type_aircraft"]
 
 
 class FlightRepository(BaseRepository[Flight, FlightCreateModel, None]):
@@ -18,55 +27,262 @@ class FlightRepository(BaseRepository[Flight, FlightCreateModel, None]):
     async def create_batch(
         self,
         session: AsyncSession,
-        *, objs_in: list[FlightCreateModel] | list[dict[str, Any]],
-    ) -> None:
-        for obj in objs_in:
-            if isinstance(obj, dict):
-                obj_in_data = obj
-            else:
-                obj_in_data = jsonable_encoder(obj)
-            db_obj = self.model(**obj_in_data)  # type: ignore
-            if obj_in_data["arrival_date"]:
-                db_obj.arrival_date = date.fromisoformat(obj_in_data["arrival_date"])
-
-            if obj_in_data["departure_date"]:
-                db_obj.departure_date = date.fromisoformat(obj_in_data["departure_date"])
-
-            if obj_in_data["arrival_time"]:
-                db_obj.arrival_time = time.fromisoformat(obj_in_data["arrival_time"])
-
-            if obj_in_data["departure_time"]:
-                db_obj.departure_time = time.fromisoformat(obj_in_data["departure_time"])
-
-            try:
-                session.add(db_obj)
-                await session.commit()
-            except (exc.IntegrityError, exc.PendingRollbackError) as exception:
-                print(exception)
-                continue
-
-    async def get_statistic(  # pylint: disable=unused-argument, too-many-arguments
+        *, objs_in: list[FlightCreateModel] | list[dict[str, Any]] | list[tuple],
+        columns: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> UploadSummary:
+        """
+        Inserts flights with multi-row `INSERT` statements of `chunk_size` rows in one transaction.
+
+        Flights are models, dicts or, with `columns`, plain tuples of values of `columns`
+        (see `build_flight_rows`), which are not validated again.
+
+        SIDs of every chunk are claimed in `FlightSid` with `INSERT ... ON CONFLICT DO NOTHING` first:
+        flights with SID which is already in the table (or earlier in the batch) are skipped.
+        Timestamps and duration of flights are computed here once, see `flight_times`.
+        Counters of `FlightDailyStats` and `DatasetVersion` are updated in the same transaction.
+
+        Partitions of new months are created before, in their own transaction (see `create_partitions`),
+        so `session` must not have written anything in its open transaction yet. Uploads run
+        at the same time, so the transaction takes its locks in the same order in all of them:
+        table of flights first, then regions, SIDs and counters, every kind in sorted order.
+        """
+        if columns is not None:
+            rows = [dict(zip(columns, values)) for values in objs_in]
+        else:
+            rows = [obj if isinstance(obj, dict) else obj.model_dump() for obj in objs_in]
+        await self.create_partitions(session, (row.get("departure_date") for row in rows))
+
+        # creation of a partition waits for inserts into flights, so an insert takes the lock of flights
+        # before any lock, which creation of a partition needs (regions are referenced by partitions)
+        await session.execute(text(f"LOCK TABLE {self.model.__tablename__} IN ROW EXCLUSIVE MODE"))
+        region_ids = await RegionRepository().get_or_create_ids(
+            session,
+            (row[column] for row in rows for column in ("reg_departure", "reg_arrival") if row.get(column)),
+        )
+        rows = sorted(
+            (
+                {
+                    **row,
+                    "reg_departure_id": region_ids.get(row.get("reg_departure")),
+                    "reg_arrival_id": region_ids.get(row.get("reg_arrival")),
+                    **flight_times(row),
+                }
+                for row in rows
+            ),
+            # sort is stable, so the first of flights with the same SID is still inserted
+            key=itemgetter("sid"),
+        )
+        claim = insert(FlightSid).on_conflict_do_nothing().returning(FlightSid.sid)
+
+        inserted_sids = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            result = await session.execute(claim.values([{"sid": row["sid"]} for row in chunk]))
+            claimed = set(result.scalars().all())
+            new_rows = []
+            for row in chunk:
+                if row["sid"] in claimed:
+                    claimed.discard(row["sid"])
+                    new_rows.append(row)
+            if new_rows:
+                await session.execute(insert(self.model).values(new_rows))
+                inserted_sids.extend(row["sid"] for row in new_rows)
+        if inserted_sids:
+            await self.update_daily_stats(session, inserted_sids)
+            await DatasetVersionRepository().bump(session)
+        await session.commit()
+
+        return UploadSummary(inserted=len(inserted_sids), skipped=len(rows) - len(inserted_sids))
+
+    async def create_partitions(self, session: AsyncSession, departure_dates: Iterable[date | None]) -> None:
+        """
+        Creates partitions of flights for months of departure dates which don't have them yet.
+
+        Without a partition of its month a flight would get to the default partition,
+        and the partition couldn't be created later without moving such flights.
+
+        Creation of partition locks the whole table of flights, so partitions are created
+        on their own connection in a short transaction, which is committed at once,
+        instead of the transaction of `session`, which would hold the lock until its commit.
+        """
+        months = {departure_date.replace(day=1) for departure_date in departure_dates if departure_date}
+        if not months:
+            return
+        async with session.bind.begin() as connection:
+            result = await connection.execute(
+                text(
+                    "SELECT pg_class.relname FROM pg_inherits "
+                    "JOIN pg_class ON pg_class.oid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = CAST(:table AS regclass)",
+                ),
+                {"table": self.model.__tablename__},
+            )
+            existing = set(result.scalars().all())
+            missing = sorted(month for month in months if partition_name(month) not in existing)
+            if not missing:
+                return
+
+            # uploads running at the same time may need the same partitions
+            await connection.execute(select(func.pg_advisory_xact_lock(PARTITIONS_LOCK)))
+            for month in missing:
+                next_month = (month + timedelta(days=32)).replace(day=1)
+                await connection.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+                        f"PARTITION OF {self.model.__tablename__} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')",
+                    ),
+                )
+
+    async def update_daily_stats(self, session: AsyncSession, sids: list[int]) -> None:
+        """
+        Adds flights with given SIDs to counters of `FlightDailyStats`.
+        """
+        key = [getattr(self.model, column) for column in DAILY_STATS_KEY]
+        region_ids = [self.model.reg_departure_id, self.model.reg_arrival_id]
+        groups = (
+            select(*key, *region_ids, *self.statistic_columns())
+            .where(self.model.sid.in_(sids))
+            .group_by(*key, *region_ids)
+            .order_by(*key)
+        )
+        counters = [column.name for column in self.statistic_columns()]
+
+        query = insert(FlightDailyStats).from_select(groups.selected_columns.keys(), groups)
+        query = query.on_conflict_do_update(
+            index_elements=DAILY_STATS_KEY,
+            set_={
+                column: getattr(FlightDailyStats, column) + getattr(query.excluded, column)
+                for column in counters
+            },
+        )
+        await session.execute(query)
+
+    async def get_heatmap(  # pylint: disable=too-many-arguments
         self,
         session: AsyncSession,
-        *, departure_date_from: date, departure_date_to: date,
-        region: str,
+        *, point: str, cells_per_bin: int,
+        departure_date_from: date, departure_date_to: date,
         flag_full_dataset: bool,
-    ) -> list[Flight]:
-        query = select(self.model)
-
-        if not flag_full_dataset:
-            if departure_date_from:
-                query = query.filter(Flight.departure_date >= departure_date_from)
-            if departure_date_to:
-                query = query.filter(Flight.departure_date <= departure_date_to)
-
-        if region:
-            query = query.where(
-                or_(
-                    self.model.reg_departure.ilike(f"%{region}%"),
-                    self.model.reg_arrival.ilike(f"%{region}%"),
-                ),
-            )
+    ) -> list[RowMapping]:
+        """
+        Counts of matching flights in non-empty bins of grid of `point` ("departure" or "arrival").
+
+        Bin is a square of `cells_per_bin` cells of the finest grid (see `GRID_CELLS_PER_DEGREE`),
+        which cells of points are stored in, so flights are grouped by integer division of them:
+        `lat_bin` and `lon_bin` are numbers of bin from -90 degrees of latitude and -180 of longitude.
+        """
+        lat_cell = getattr(self.model, f"{point}_lat_cell")
+        lon_cell = getattr(self.model, f"{point}_lon_cell")
+        lat_bin = (lat_cell // cells_per_bin).label("lat_bin")
+        lon_bin = (lon_cell // cells_per_bin).label("lon_bin")
+        query = (
+            select(lat_bin, lon_bin, func.count().label("flights"))  # pylint: disable=not-callable
+            .where(lat_cell.is_not(None), lon_cell.is_not(None))
+            .group_by(lat_bin, lon_bin)
+            .order_by(lat_bin, lon_bin)
+        )
+        # bins are not filtered by region: the map shows points of all regions
+        result = await session.execute(
+            filter_statistic(
+                query,
+                self.model,
+                region_ids=None,
+                departure_date_from=departure_date_from,
+                departure_date_to=departure_date_to,
+                flag_full_dataset=flag_full_dataset,
+            ),
+        )
+        return result.mappings().all()
+
+    def statistic_columns(self) -> list[ColumnElement]:
+        """
+        Aggregates of flights, from which `Statistic` is built: count of `flights`,
+        sum and count of known durations in minutes (`duration_total`, `duration_count`),
+        count of flights in every bin of `DURATION_BINS` (`duration__<index of bin>`)
+        and count of flights without every feature of `NULL_FEATURES` (`null__<column>`).
+        """
+        # pylint: disable=not-callable
+        duration = self.model.duration_minutes
+        limits = [0, *(limit for _, limit in DURATION_BINS)]
+        return [
+            func.count().label("flights"),
+            func.coalesce(func.sum(duration), 0).label("duration_total"),
+            func.count(duration).label("duration_count"),
+            *(
+                func.count().filter(
+                    and_(duration > lower, duration <= upper) if index else duration <= upper,
+                ).label(f"duration__{index}")
+                for index, (lower, upper) in enumerate(zip(limits, limits[1:]))
+            ),
+            *(
+                func.count().filter(self.is_null_feature(column)).label(f"null__{column}")
+                for column in NULL_FEATURES.values()
+            ),
+        ]
+
+    def is_null_feature(self, column: str) -> ColumnElement:
+        """
+        Missing value of column: NULL, empty string or zero coordinate.
+        """
+        value = getattr(self.model, column)
+        if isinstance(value.type, String):
+            return or_(value.is_(None), value == "")
+        if isinstance(value.type, Numeric):
+            return or_(value.is_(None), value == 0)
+        return value.is_(None)
+
+
+def flight_times(flight: dict[str, Any]) -> dict[str, datetime | float | None]:
+    """
+    Values of `departure_at`, `arrival_at` and `duration_minutes` of flight,
+    None without date or time of departure or arrival (duration without any of them).
+    Arrival earlier than departure means the flight landed on the next day.
+    """
+    departure_at = arrival_at = duration = None
+    if flight.get("departure_date") and flight.get("departure_time"):
+        departure_at = datetime.combine(flight["departure_date"], flight["departure_time"])
+    if flight.get("arrival_date") and flight.get("arrival_time"):
+        arrival_at = datetime.combine(flight["arrival_date"], flight["arrival_time"])
+    if departure_at and arrival_at:
+        if arrival_at < departure_at:
+            arrival_at += timedelta(days=1)
+        duration = (arrival_at - departure_at).total_seconds() / 60
+    return {"departure_at": departure_at, "arrival_at": arrival_at, "duration_minutes": duration}
+
+
+def partition_name(month: date) -> str:
+    """
+    Name of partition of flights departed in the month, like `flights_2025_01`.
+    """
+    return f"{Flight.__tablename__}_{month:%Y_%m}"
+
+
+def filter_statistic(  # pylint: disable=too-many-arguments
+    query: Select,
+    model: type[Flight] | type[FlightDailyStats],
+    *, departure_date_from: date, departure_date_to: date,
+    region_ids: list[int] | None,
+    flag_full_dataset: bool,
+) -> Select:
+    """
+    Filters flights (or their daily counters) by departure date and region of departure or arrival.
+
+    `region_ids` are ids of regions found by `RegionRepository.find_ids`,
+    None means any region, empty list means no region matched.
+    """
+    if not flag_full_dataset:
+        if departure_date_from:
+            query = query.filter(model.departure_date >= departure_date_from)
+        if departure_date_to:
+            query = query.filter(model.departure_date <= departure_date_to)
 
-        result = await session.execute(query)
-        return result.scalars().all()
+    if region_ids is not None:
+        query = query.where(
+            or_(
+                model.reg_departure_id.in_(region_ids),
+                model.reg_arrival_id.in_(region_ids),
+            ),
+        )
+    return query
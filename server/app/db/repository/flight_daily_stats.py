@@ -0,0 +1,124 @@
+from datetime import date
+
+from sqlalchemy import BIGINT, RowMapping, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import FlightDailyStats
+
+from .base import BaseRepository
+from .flight import DAILY_STATS_KEY, filter_statistic
+from .region import RegionRepository
+
+
+class FlightDailyStatsRepository(BaseRepository[FlightDailyStats, None, None]):
+    def __init__(self):
+        super().__init__(FlightDailyStats)
+
+    async def get_statistic(  # pylint: disable=too-many-arguments
+        self,
+        session: AsyncSession,
+        *, departure_date_from: date, departure_date_to: date,
+        region: str,
+        flag_full_dataset: bool,
+    ) -> list[RowMapping]:
+        """
+        Merges daily counters of matching flights, grouped by departure date and type of aircraft.
+
+        Every group has the aggregates of `FlightRepository.statistic_columns`.
+        """
+        counters = [
+            column for column in self.model.__table__.columns
+            if column.name not in ("id", "reg_departure_id", "reg_arrival_id", *DAILY_STATS_KEY)
+        ]
+        query = (
+            select(
+                self.model.departure_date,
+                self.model.type_aircraft,
+                *(
+                    (func.sum(column) if column.name == "duration_total" else cast(func.sum(column), BIGINT))
+                    .label(column.name)
+                    for column in counters
+                ),
+            )
+            .group_by(self.model.departure_date, self.model.type_aircraft)
+        )
+        query = filter_statistic(
+            query,
+            self.model,
+            departure_date_from=departure_date_from,
+            departure_date_to=departure_date_to,
+            region_ids=await RegionRepository().find_ids(session, region) if region else None,
+            flag_full_dataset=flag_full_dataset,
+        )
+        result = await session.execute(query)
+        return result.mappings().all()
+
+    async def get_region_statistic(
+        self,
+        session: AsyncSession,
+        *, departure_date_from: date, departure_date_to: date,
+        flag_full_dataset: bool,
+    ) -> list[RowMapping]:
+        """
+        Merges daily counters of flights between every pair of regions: `flights`,
+        `duration_total` and `duration_count` grouped by `reg_departure` and `reg_arrival`.
+        """
+        query = (
+            select(
+                self.model.reg_departure,
+                self.model.reg_arrival,
+                cast(func.sum(self.model.flights), BIGINT).label("flights"),
+                func.sum(self.model.duration_total).label("duration_total"),
+                cast(func.sum(self.model.duration_count), BIGINT).label("duration_count"),
+            )
+            .group_by(self.model.reg_departure, self.model.reg_arrival)
+        )
+        query = filter_statistic(
+            query,
+            self.model,
+            departure_date_from=departure_date_from,
+            departure_date_to=departure_date_to,
+            region_ids=None,
+            flag_full_dataset=flag_full_dataset,
+        )
+        result = await session.execute(query)
+        return result.mappings().all()
+
+    async def get_routes(  # pylint: disable=too-many-arguments
+        self,
+        session: AsyncSession,
+        *, departure_date_from: date, departure_date_to: date,
+        type_aircraft: str | None,
+        flag_full_dataset: bool,
+        limit: int,
+    ) -> list[RowMapping]:
+        """
+        Merges daily counters of flights between known regions into `limit` busiest routes:
+        `flights`, `duration_total` and `duration_count` of every pair of `reg_departure` and `reg_arrival`.
+        """
+        flights = cast(func.sum(self.model.flights), BIGINT).label("flights")
+        query = (
+            select(
+                self.model.reg_departure,
+                self.model.reg_arrival,
+                flights,
+                func.sum(self.model.duration_total).label("duration_total"),
+                cast(func.sum(self.model.duration_count), BIGINT).label("duration_count"),
+            )
+            .where(self.model.reg_departure_id.is_not(None), self.model.reg_arrival_id.is_not(None))
+            .group_by(self.model.reg_departure, self.model.reg_arrival)
+            .order_by(flights.desc(), self.model.reg_departure, self.model.reg_arrival)
+            .limit(limit)
+        )
+        if type_aircraft:
+            query = query.where(self.model.type_aircraft == type_aircraft)
+        query = filter_statistic(
+            query,
+            self.model,
+            departure_date_from=departure_date_from,
+            departure_date_to=departure_date_to,
+            region_ids=None,
+            flag_full_dataset=flag_full_dataset,
+        )
+        result = await session.execute(query)
+        return result.mappings().all()
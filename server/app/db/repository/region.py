@@ -0,0 +1,39 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Region
+
+from .base import BaseRepository
+
+
+class RegionRepository(BaseRepository[Region, None, None]):
+    def __init__(self):
+        super().__init__(Region)
+
+    async def get_or_create_ids(self, session: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+        """
+        Ids of regions by names, regions which are not in the table yet are added.
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+        await session.execute(
+            insert(self.model)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=[self.model.name]),
+        )
+        result = await session.execute(select(self.model.name, self.model.id).where(self.model.name.in_(names)))
+        return dict(result.all())
+
+    async def find_ids(self, session: AsyncSession, region: str) -> list[int]:
+        """
+        Ids of regions, which names contain `region` (case insensitive).
+
+        The table of regions is small, so its scan is cheap, while flights
+        are then filtered by indexed ids instead of names.
+        """
+        result = await session.scalars(select(self.model.id).where(self.model.name.ilike(f"%{region}%")))
+        return result.all()
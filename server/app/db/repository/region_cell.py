@@ -0,0 +1,59 @@
+from operator import itemgetter
+from typing import Iterable, Mapping
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import RegionCell
+
+from .base import BaseRepository
+
+# cells of one statement: bind parameters of statement are limited to 32767
+CELLS_CHUNK_SIZE = 5000
+
+
+class RegionCellRepository(BaseRepository[RegionCell, None, None]):
+    def __init__(self):
+        super().__init__(RegionCell)
+
+    async def get_cells(
+        self,
+        session: AsyncSession,
+        shapefile: str,
+        cells: Iterable[tuple[int, int]],
+    ) -> dict[tuple[int, int], tuple[str | None, bool]]:
+        """
+        Region and boundary flag of cells `(lon_cell, lat_cell)`, which are in the table.
+        """
+        cells = list(cells)
+        found = {}
+        for start in range(0, len(cells), CELLS_CHUNK_SIZE):
+            result = await session.execute(
+                select(self.model.lon_cell, self.model.lat_cell, self.model.region, self.model.boundary)
+                .where(self.model.shapefile == shapefile)
+                .where(tuple_(self.model.lon_cell, self.model.lat_cell).in_(cells[start:start + CELLS_CHUNK_SIZE])),
+            )
+            found.update({(lon_cell, lat_cell): (region, boundary) for lon_cell, lat_cell, region, boundary in result})
+        return found
+
+    async def save_cells(
+        self,
+        session: AsyncSession,
+        shapefile: str,
+        cells: Mapping[tuple[int, int], tuple[str | None, bool]],
+    ) -> None:
+        """
+        Adds cells, cells which are in the table already (saved by another job) are kept.
+
+        Cells are added in sorted order: jobs, which save the same cells at the same time,
+        lock them in the same order and don't deadlock.
+        """
+        rows = [
+            {"shapefile": shapefile, "lon_cell": lon_cell, "lat_cell": lat_cell, "region": region, "boundary": boundary}
+            for (lon_cell, lat_cell), (region, boundary) in sorted(cells.items(), key=itemgetter(0))
+        ]
+        for start in range(0, len(rows), CELLS_CHUNK_SIZE):
+            await session.execute(
+                insert(self.model).values(rows[start:start + CELLS_CHUNK_SIZE]).on_conflict_do_nothing(),
+            )
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import UploadJob
+from app.schemas.flights import UploadJobStatus
+
+from .base import BaseRepository
+
+
+class UploadJobRepository(BaseRepository[UploadJob, None, None]):
+    def __init__(self):
+        super().__init__(UploadJob)
+
+    async def get_batch(self, session: AsyncSession, batch_id: UUID) -> list[UploadJob]:
+        """
+        Jobs of files of batch in the order of upload.
+        """
+        result = await session.scalars(
+            select(self.model).where(self.model.batch_id == batch_id).order_by(self.model.created_at, self.model.id),
+        )
+        return result.all()
+
+    async def beat(self, session: AsyncSession, job_ids: Iterable[UUID]) -> None:
+        """
+        Marks unfinished jobs alive.
+        """
+        await session.execute(
+            update(self.model)
+            .where(self.model.id.in_(list(job_ids)), self.model.finished_at.is_(None))
+            .values(heartbeat_at=func.now()),  # pylint: disable=not-callable
+        )
+        await session.commit()
+
+    async def fail_stale(self, session: AsyncSession, stale_after: timedelta) -> int:
+        """
+        Fails unfinished jobs, which were not marked alive for `stale_after`:
+        the web worker, which ran them, has stopped. Returns count of such jobs.
+        """
+        result = await session.execute(
+            update(self.model)
+            .where(
+                self.model.finished_at.is_(None),
+                self.model.heartbeat_at < func.now() - stale_after,  # pylint: disable=not-callable
+            )
+            .values(
+                status=UploadJobStatus.failed.value,
+                error="Worker of the job has stopped",
+                finished_at=func.now(),  # pylint: disable=not-callable
+            ),
+        )
+        await session.commit()
+        return result.rowcount
@@ -1,6 +1,9 @@
+import gzip
 import os
+import zipfile
 from datetime import date
-from typing import Optional
+from typing import Literal, Optional
+from uuid import UUID, uuid4
 
 from fastapi import (
     APIRouter,
@@ -9,15 +12,41 @@ from fastapi import (
     HTTPException,
     Query,
     Request,
+    Response,
     UploadFile,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.db.connection import get_session
-from app.db.repository import FlightRepository
-from app.schemas.flights import Statistic
-from app.utils.flight import format_flight_data, parse_input_file
+from app.db.models.flight import GRID_CELLS_PER_DEGREE
+from app.db.repository import FlightDailyStatsRepository, FlightRepository, UploadJobRepository
+from app.schemas.flights import (
+    HeatmapGrid,
+    RegionStatistic,
+    RouteMatrix,
+    Statistic,
+    UploadBatchSchema,
+    UploadJobSchema,
+)
+from app.utils.executor import run_cpu_bound, thread_executor
+from app.utils.flight import (
+    accepts_encoding,
+    cached_by_dataset_version,
+    fail_stale_upload_jobs,
+    file_extension,
+    format_heatmap,
+    format_region_statistic,
+    format_routes,
+    format_statistic,
+    get_region_boundaries,
+    is_not_modified,
+    region_names,
+    save_archive,
+    save_upload,
+    start_upload_job,
+    summarize_batch,
+)
 
 api_router = APIRouter(
     prefix="/flights",
@@ -35,7 +64,8 @@ api_router = APIRouter(
     },
 )
 async def get_statistic( # pylint: disable=too-many-arguments, unused-variable, too-many-positional-arguments
-    _: Request,
+    request: Request,
+    response: Response,
     from_: Optional[date] = Query(date(2025,1,1), alias="from", description="DD-MM-YYYY"),
     to: Optional[date] = Query(date.today(), description="DD-MM-YYYY"),
     region: str = Query(None, description='Регион'),
@@ -43,26 +73,209 @@ async def get_statistic( # pylint: disable=too-many-arguments, unused-variable,
     flag_full_dataset: bool = Query(False, description='Игнорированиие среза данных'),
     session: AsyncSession = Depends(get_session),
 ):
-    flights = await FlightRepository().get_statistic(
-        session=session,
-        departure_date_from=from_,
-        departure_date_to=to,
-        region=region,
-        flag_full_dataset=flag_full_dataset,
+    async def build(build_session: AsyncSession) -> Statistic:
+        groups = await FlightDailyStatsRepository().get_statistic(
+            session=build_session,
+            departure_date_from=from_,
+            departure_date_to=to,
+            region=region,
+            flag_full_dataset=flag_full_dataset,
+        )
+
+        if not groups:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND,
+                detail="Has not some statistic",
+            )
+
+        return await run_cpu_bound(format_statistic, groups, linear_step)
+
+    key = (
+        None if flag_full_dataset else from_,
+        None if flag_full_dataset else to,
+        region or None,
+        linear_step,
+    )
+    return await cached_by_dataset_version(request, response, session, key, build)
+
+
+@api_router.get(
+    "/regions/",
+    status_code=status.HTTP_200_OK,
+    response_model=list[RegionStatistic],
+)
+async def get_region_statistic( # pylint: disable=too-many-arguments, too-many-positional-arguments
+    request: Request,
+    response: Response,
+    from_: Optional[date] = Query(date(2025,1,1), alias="from", description="DD-MM-YYYY"),
+    to: Optional[date] = Query(date.today(), description="DD-MM-YYYY"),
+    flag_full_dataset: bool = Query(False, description='Игнорированиие среза данных'),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Counts of flights and mean duration of flights of every region, for choropleth map.
+    """
+    async def build(build_session: AsyncSession) -> list[RegionStatistic]:
+        groups = await FlightDailyStatsRepository().get_region_statistic(
+            session=build_session,
+            departure_date_from=from_,
+            departure_date_to=to,
+            flag_full_dataset=flag_full_dataset,
+        )
+        return await run_cpu_bound(format_region_statistic, groups, region_names())
+
+    key = (
+        "regions",
+        None if flag_full_dataset else from_,
+        None if flag_full_dataset else to,
     )
+    return await cached_by_dataset_version(request, response, session, key, build)
+
 
-    if not flights:
+@api_router.get(
+    "/regions/boundaries/",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/geo+json": {}},
+            "description": "GeoJSON of boundaries of regions",
+        },
+    },
+)
+async def get_region_boundaries_geojson(
+    request: Request,
+    detail: Literal["low", "medium", "high"] = Query("medium", description='Детализация границ'),
+):
+    """
+    Simplified boundaries of regions for the map, compressed with gzip when the client accepts it.
+
+    Boundaries change only with the shapefile, so clients keep them for a day
+    and then revalidate them by ETag.
+    """
+    boundaries = await thread_executor.run(get_region_boundaries, detail)
+    compressed = accepts_encoding(request, "gzip")
+    etag = boundaries.gzip_etag if compressed else boundaries.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=86400",
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request, etag, boundaries.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if compressed:
+        return Response(
+            content=boundaries.body,
+            media_type="application/geo+json",
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+    return Response(
+        content=gzip.decompress(boundaries.body),
+        media_type="application/geo+json",
+        headers=headers,
+    )
+
+
+@api_router.get(
+    "/routes/",
+    status_code=status.HTTP_200_OK,
+    response_model=RouteMatrix,
+)
+async def get_routes( # pylint: disable=too-many-arguments, too-many-positional-arguments
+    request: Request,
+    response: Response,
+    from_: Optional[date] = Query(date(2025,1,1), alias="from", description="DD-MM-YYYY"),
+    to: Optional[date] = Query(date.today(), description="DD-MM-YYYY"),
+    type_aircraft: Optional[str] = Query(None, description='Тип ВС'),
+    limit: int = Query(20, ge=1, le=1000, description='Количество маршрутов'),
+    flag_full_dataset: bool = Query(False, description='Игнорированиие среза данных'),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    The busiest routes between regions with counts and mean duration of flights.
+    """
+    async def build(build_session: AsyncSession) -> RouteMatrix:
+        groups = await FlightDailyStatsRepository().get_routes(
+            session=build_session,
+            departure_date_from=from_,
+            departure_date_to=to,
+            type_aircraft=type_aircraft,
+            flag_full_dataset=flag_full_dataset,
+            limit=limit,
+        )
+        return await run_cpu_bound(format_routes, groups)
+
+    key = (
+        "routes",
+        None if flag_full_dataset else from_,
+        None if flag_full_dataset else to,
+        type_aircraft or None,
+        limit,
+    )
+    return await cached_by_dataset_version(request, response, session, key, build)
+
+
+@api_router.get(
+    "/heatmap/",
+    status_code=status.HTTP_200_OK,
+    response_model=HeatmapGrid,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Resolution is not a multiple of the finest grid",
+        },
+    },
+)
+async def get_heatmap( # pylint: disable=too-many-arguments, too-many-positional-arguments
+    request: Request,
+    response: Response,
+    from_: Optional[date] = Query(date(2025,1,1), alias="from", description="DD-MM-YYYY"),
+    to: Optional[date] = Query(date.today(), description="DD-MM-YYYY"),
+    point: Literal["departure", "arrival"] = Query("departure", description='Точки вылета или посадки'),
+    resolution: float = Query(
+        0.1,
+        ge=1 / GRID_CELLS_PER_DEGREE,
+        le=10,
+        description='Размер ячейки в градусах',
+    ),
+    flag_full_dataset: bool = Query(False, description='Игнорированиие среза данных'),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Counts of flights in non-empty cells of grid of departure or arrival points, for heatmap.
+    """
+    cells_per_bin = round(resolution * GRID_CELLS_PER_DEGREE)
+    if abs(cells_per_bin - resolution * GRID_CELLS_PER_DEGREE) > 1e-6:
         raise HTTPException(
-            status.HTTP_404_NOT_FOUND,
-            detail="Has not some statistic",
+            status.HTTP_400_BAD_REQUEST,
+            detail=f"Resolution must be a multiple of {1 / GRID_CELLS_PER_DEGREE}",
+        )
+
+    async def build(build_session: AsyncSession) -> HeatmapGrid:
+        groups = await FlightRepository().get_heatmap(
+            session=build_session,
+            point=point,
+            cells_per_bin=cells_per_bin,
+            departure_date_from=from_,
+            departure_date_to=to,
+            flag_full_dataset=flag_full_dataset,
         )
+        return await run_cpu_bound(format_heatmap, groups, cells_per_bin)
 
-    return format_flight_data(flights, linear_step)
+    key = (
+        "heatmap",
+        None if flag_full_dataset else from_,
+        None if flag_full_dataset else to,
+        point,
+        cells_per_bin,
+    )
+    return await cached_by_dataset_version(request, response, session, key, build)
 
 
 @api_router.post(
     "/upload/",
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=UploadJobSchema,
     responses={
         status.HTTP_400_BAD_REQUEST: {
             "description": "Bad parameters",
@@ -73,7 +286,7 @@ async def create_file(
     file: UploadFile = File(),
     session: AsyncSession = Depends(get_session),
 ):
-    if os.path.splitext(file.filename)[-1] != ".xlsx":
+    if file_extension(file.filename) != ".xlsx":
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST,
             detail="Incorrect file extension",
@@ -85,7 +298,126 @@ async def create_file(
             detail="File is empty",
         )
 
-    content = await file.read()
-    flights = parse_input_file(content)
+    path = await thread_executor.run(save_upload, file.file)
+    job = await UploadJobRepository().create(session, obj_in={"filename": file.filename})
+    start_upload_job(job.id, path, session.bind.url.render_as_string(hide_password=False))
+    return job
+
+
+@api_router.get(
+    "/upload/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadJobSchema,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Upload job not found",
+        },
+    },
+)
+async def get_upload_job(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_session),
+):
+    await fail_stale_upload_jobs(session)
+    job = await UploadJobRepository().get(session, job_id)
+    if job is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            detail="Upload job not found",
+        )
+    return job
+
 
-    await FlightRepository().create_batch(session=session, objs_in=flights)
+@api_router.post(
+    "/upload/batch/",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=UploadBatchSchema,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Bad parameters",
+        },
+    },
+)
+async def create_upload_batch(
+    files: list[UploadFile] = File(),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Uploads many `.xlsx` files or ZIP archives of them at once.
+
+    Every file is ingested by its own job, jobs run in parallel in the process pool;
+    progress of all files is returned by `/upload/batch/{batch_id}`.
+    """
+    for file in files:
+        if file_extension(file.filename) not in (".xlsx", ".zip"):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"Incorrect file extension: {file.filename}",
+            )
+        if file.size == 0:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail=f"File is empty: {file.filename}",
+            )
+
+    saved = []
+    try:
+        for file in files:
+            if file_extension(file.filename) == ".zip":
+                try:
+                    members = await thread_executor.run(save_archive, file.file, file.filename)
+                except zipfile.BadZipFile as exc:
+                    raise HTTPException(
+                        status.HTTP_400_BAD_REQUEST,
+                        detail=f"Incorrect ZIP archive: {file.filename}",
+                    ) from exc
+                except ValueError as exc:
+                    raise HTTPException(
+                        status.HTTP_400_BAD_REQUEST,
+                        detail=f"{exc}: {file.filename}",
+                    ) from exc
+                if not members:
+                    raise HTTPException(
+                        status.HTTP_400_BAD_REQUEST,
+                        detail=f"Archive has no xlsx files: {file.filename}",
+                    )
+                saved.extend(members)
+            else:
+                saved.append((file.filename, await thread_executor.run(save_upload, file.file)))
+    except Exception:
+        for _, path in saved:
+            os.remove(path)
+        raise
+
+    batch_id = uuid4()
+    database_uri = session.bind.url.render_as_string(hide_password=False)
+    jobs = []
+    for filename, path in saved:
+        job = await UploadJobRepository().create(session, obj_in={"filename": filename, "batch_id": batch_id})
+        start_upload_job(job.id, path, database_uri)
+        jobs.append(job)
+    return summarize_batch(batch_id, jobs)
+
+
+@api_router.get(
+    "/upload/batch/{batch_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadBatchSchema,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Upload batch not found",
+        },
+    },
+)
+async def get_upload_batch(
+    batch_id: UUID,
+    session: AsyncSession = Depends(get_session),
+):
+    await fail_stale_upload_jobs(session)
+    jobs = await UploadJobRepository().get_batch(session, batch_id)
+    if not jobs:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            detail="Upload batch not found",
+        )
+    return summarize_batch(batch_id, jobs)
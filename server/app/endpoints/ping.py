@@ -3,7 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.db.connection import get_session
-from app.schemas.application_health import PingResponse
+from app.schemas.application_health import CacheMetrics, ExecutorMetrics, PingResponse
+from app.utils.executor import executor_metrics
+from app.utils.flight import cache_metrics
 from app.utils.health_check import health_check_db
 
 api_router = APIRouter(
@@ -43,3 +45,32 @@ async def ping_database(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         detail="Database isn't working",
     )
+
+
+@api_router.get(
+    "/executors",
+    response_model=list[ExecutorMetrics],
+    status_code=status.HTTP_200_OK,
+)
+async def get_executor_metrics(
+    _: Request,
+):
+    """
+    Load of pools, which run CPU-bound work: running and queued calls of each of them.
+    """
+    return executor_metrics()
+
+
+@api_router.get(
+    "/caches",
+    response_model=list[CacheMetrics],
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_metrics(
+    _: Request,
+):
+    """
+    Use of caches of responses: hits and misses, running builds and counts of requests
+    of recently used keys, which waited for a running build instead of making their own.
+    """
+    return cache_metrics()
@@ -1,5 +1,10 @@
+from .cache import CacheMetrics, CoalescedCalls
+from .executor import ExecutorMetrics
 from .ping import PingResponse
 
 __all__ = [
+    "CacheMetrics",
+    "CoalescedCalls",
+    "ExecutorMetrics",
     "PingResponse",
 ]
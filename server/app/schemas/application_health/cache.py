@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class CoalescedCalls(BaseModel):
+    key: str
+    count: int
+
+
+class CacheMetrics(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    running: int
+    coalesced: list[CoalescedCalls]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class ExecutorMetrics(BaseModel):
+    name: str
+    max_concurrency: int
+    running: int
+    queued: int
+    completed: int
+    failed: int
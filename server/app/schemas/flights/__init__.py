@@ -1,7 +1,27 @@
 from .flight import FlightCreateModel
-from .statistic import Statistic
+from .statistic import (
+    DURATION_BINS,
+    NULL_FEATURES,
+    HeatmapGrid,
+    RegionStatistic,
+    RouteMatrix,
+    Statistic,
+    Weekday,
+)
+from .upload import UploadBatchSchema, UploadJobSchema, UploadJobStatus, UploadRowError, UploadSummary
 
 __all__ = [
+    "DURATION_BINS",
+    "NULL_FEATURES",
+    "HeatmapGrid",
+    "RegionStatistic",
+    "RouteMatrix",
     "Statistic",
+    "Weekday",
     "FlightCreateModel",
+    "UploadBatchSchema",
+    "UploadJobSchema",
+    "UploadJobStatus",
+    "UploadRowError",
+    "UploadSummary",
 ]
@@ -27,3 +27,62 @@ class Statistic(BaseModel):
     distribution_by_type: dict[str, int]
     distribution_null_features: dict[str, int]
     count_flights_by_month: list[dict[str, int]]
+
+
+class RegionStatistic(BaseModel):
+    region: str
+    departure_count: int = Field(ge=0)
+    arrival_count: int = Field(ge=0)
+    # flights which departed from or arrived to the region
+    total_count: int = Field(ge=0)
+    mean_duration: int = Field(ge=0)
+
+
+class RouteMatrix(BaseModel):
+    """
+    Routes between regions column by column: route `i` is from `departure[i]` to `arrival[i]`.
+    """
+    departure: list[str]
+    arrival: list[str]
+    count_flights: list[int]
+    mean_duration: list[int]
+
+
+class HeatmapGrid(BaseModel):
+    """
+    Non-empty bins of grid column by column: bin `i` with center
+    at `latitude[i]`, `longitude[i]` has `count_flights[i]` flights.
+    """
+    resolution: float
+    latitude: list[float]
+    longitude: list[float]
+    count_flights: list[int]
+
+
+# label of bin in `distribution_by_flight_duration` and its upper limit in minutes
+DURATION_BINS = [
+    ('< 10 мин', 10),
+    ('10 - 30 мин', 30),
+    ('30 мин - 1 ч', 60),
+    ('1 - 2 ч', 120),
+    ('2 - 4 ч', 240),
+    ('4 - 8 ч', 480),
+    ('8 - 12 ч', 720),
+    ('12 - 24 ч', 1440),
+    ('24+ ч', float('inf')),
+]
+
+# label of feature in `distribution_null_features` and column of flight
+NULL_FEATURES = {
+    "Дата посадки": "arrival_date",
+    "Время посадки": "arrival_time",
+    "Регион посадки": "reg_arrival",
+    "Широта региона посадки": "arrival_latitude",
+    "Долгота региона посадки": "arrival_longitude",
+    "Тип ВС": "type_aircraft",
+    "Дата вылета": "departure_date",
+    "Время вылета": "departure_time",
+    "Регион вылета": "reg_departure",
+    "Широта региона вылета": "departure_latitude",
+    "Долгота региона вылета": "departure_longitude",
+}
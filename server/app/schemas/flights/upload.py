@@ -0,0 +1,56 @@
+import enum
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class UploadSummary(BaseModel):
+    inserted: int = Field(ge=0, description="Flights saved to the database")
+    skipped: int = Field(ge=0, description="Flights with SID already in the database")
+
+
+class UploadJobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class UploadRowError(BaseModel):
+    row: int = Field(description="Number of row in the sheet")
+    column: str
+    reason: str
+
+
+class UploadJobSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    batch_id: UUID | None
+    filename: str
+    status: UploadJobStatus
+    rows_parsed: int
+    rows_geocoded: int
+    rows_inserted: int
+    rows_rejected: int
+    row_errors: list[UploadRowError]
+    region_cache_hits: int
+    region_cache_misses: int
+    parse_seconds: float
+    geocode_seconds: float
+    insert_seconds: float
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+
+class UploadBatchSchema(BaseModel):
+    id: UUID
+    status: UploadJobStatus = Field(description="done or failed when all files are finished")
+    rows_parsed: int
+    rows_inserted: int
+    rows_rejected: int
+    created_at: datetime
+    finished_at: datetime | None = Field(description="When the last file was finished")
+    jobs: list[UploadJobSchema] = Field(description="Summary of every file")
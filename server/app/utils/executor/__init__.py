@@ -0,0 +1,19 @@
+from .pool import (
+    MeteredExecutor,
+    executor_metrics,
+    ingest_executor,
+    process_executor,
+    run_cpu_bound,
+    shutdown_executors,
+    thread_executor,
+)
+
+__all__ = [
+    "MeteredExecutor",
+    "executor_metrics",
+    "ingest_executor",
+    "process_executor",
+    "run_cpu_bound",
+    "shutdown_executors",
+    "thread_executor",
+]
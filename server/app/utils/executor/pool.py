@@ -0,0 +1,127 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Sequence
+
+from app.config import get_settings
+
+# less rows are processed right in the event loop, see `run_cpu_bound`
+PROCESS_MIN_ROWS = get_settings().PROCESS_MIN_ROWS
+
+
+class MeteredExecutor:
+    """
+    Pool of workers, which runs blocking functions for coroutines out of the event loop.
+
+    At most `max_concurrency` calls run at once, the others wait in the event loop
+    without taking workers; counts of running, queued, completed and failed calls
+    are kept as metrics of the pool. The pool itself is created on the first call.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor], max_concurrency: int):
+        self.name = name
+        self.factory = factory
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self.factory()
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        # a semaphore is bound to the event loop, where a call waited on it first
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            result = await loop.run_in_executor(self.executor, partial(func, *args))
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self._slots.release()
+        self.completed += 1
+        return result
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Processes are spawned, not forked: a forked process would inherit the event loop
+    and the connections to the database of the application.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+# pandas, numpy, shapely and file I/O, which release the GIL
+thread_executor = MeteredExecutor(
+    "threads",
+    partial(ThreadPoolExecutor, max_workers=get_settings().THREAD_WORKERS, thread_name_prefix="cpu"),
+    get_settings().THREAD_WORKERS,
+)
+# loops in pure Python, which hold the GIL
+process_executor = MeteredExecutor(
+    "processes",
+    partial(_process_pool, get_settings().PROCESS_WORKERS),
+    get_settings().PROCESS_WORKERS,
+)
+# ingest jobs of uploaded files, which run for minutes
+ingest_executor = MeteredExecutor(
+    "ingest",
+    partial(_process_pool, get_settings().INGEST_WORKERS),
+    get_settings().INGEST_WORKERS,
+)
+
+executors = [thread_executor, process_executor, ingest_executor]
+
+
+async def run_cpu_bound(func: Callable[..., Any], rows: Sequence, *args: Any) -> Any:
+    """
+    Calls `func(rows, *args)` in the pool of processes, when `rows` are many enough
+    to pay for sending them there, and right in the event loop otherwise.
+    """
+    if len(rows) < PROCESS_MIN_ROWS:
+        return func(rows, *args)
+    return await process_executor.run(func, [dict(row) for row in rows], *args)
+
+
+def executor_metrics() -> list[dict[str, Any]]:
+    return [executor.metrics() for executor in executors]
+
+
+def shutdown_executors() -> None:
+    for executor in executors:
+        executor.shutdown()
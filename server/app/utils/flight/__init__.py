@@ -1,6 +1,57 @@
-from .business_logic import format_flight_data, parse_input_file
+from .boundaries import BOUNDARY_TOLERANCES, get_region_boundaries, prepare_region_boundaries
+from .cache import (
+    LRUCache,
+    SingleFlight,
+    accepts_encoding,
+    cache_metrics,
+    cached_by_dataset_version,
+    is_not_modified,
+    make_etag,
+    statistic_cache,
+    statistic_flights,
+    validation_headers,
+)
+from .regions import region_names
+from .statistic import (
+    StatisticAccumulator,
+    format_heatmap,
+    format_region_statistic,
+    format_routes,
+    format_statistic,
+)
+from .upload import (
+    fail_stale_upload_jobs,
+    file_extension,
+    save_archive,
+    save_upload,
+    start_upload_job,
+    summarize_batch,
+)
 
 __all__ = [
-    "parse_input_file",
-    "format_flight_data",
-]
\ No newline at end of file
+    "BOUNDARY_TOLERANCES",
+    "get_region_boundaries",
+    "prepare_region_boundaries",
+    "region_names",
+    "format_heatmap",
+    "format_region_statistic",
+    "format_routes",
+    "format_statistic",
+    "StatisticAccumulator",
+    "LRUCache",
+    "SingleFlight",
+    "accepts_encoding",
+    "cache_metrics",
+    "cached_by_dataset_version",
+    "is_not_modified",
+    "make_etag",
+    "statistic_cache",
+    "statistic_flights",
+    "validation_headers",
+    "fail_stale_upload_jobs",
+    "file_extension",
+    "save_archive",
+    "save_upload",
+    "start_upload_job",
+    "summarize_batch",
+]
@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import NamedTuple
+
+import geopandas as gpd
+
+from app.config import get_settings
+
+from .region_index import REGIONS_PATH, shapefile_digest
+from .regions import get_regions
+
+# tolerance of simplification in degrees for every level of detail of boundaries
+BOUNDARY_TOLERANCES = {
+    "low": 0.05,
+    "medium": 0.01,
+    "high": 0.002,
+}
+
+
+class RegionBoundaries(NamedTuple):
+    """
+    Boundaries of regions as gzip-compressed GeoJSON.
+
+    Compressed and uncompressed responses are different representations,
+    so they have different ETags: `gzip_etag` and `etag`.
+    """
+    body: bytes
+    etag: str
+    gzip_etag: str
+    last_modified: datetime
+
+
+def simplify_regions(tolerance: float, regions_gdf: gpd.GeoDataFrame | None = None) -> str:
+    """
+    GeoJSON of regions with boundaries simplified to `tolerance` degrees.
+
+    Topology is preserved, so no region loses its polygons, however small they are.
+    """
+    if regions_gdf is None:
+        regions_gdf = get_regions()
+    simplified = gpd.GeoDataFrame(
+        {"name": regions_gdf["name_ru"]},
+        geometry=regions_gdf.geometry.simplify(tolerance, preserve_topology=True),
+        crs=regions_gdf.crs,
+    )
+    return simplified.to_json(drop_id=True, ensure_ascii=False)
+
+
+@lru_cache
+def get_region_boundaries(level: str) -> RegionBoundaries:
+    """
+    Boundaries of regions with level of detail `level` (see `BOUNDARY_TOLERANCES`).
+
+    Compressed GeoJSON is kept in `BOUNDARIES_DIR` under the hash of the shapefile,
+    so it is made again only when the shapefile changes, not on every start.
+    """
+    digest = shapefile_digest()
+    path = Path(get_settings().BOUNDARIES_DIR) / f"{REGIONS_PATH.stem}-{digest[:16]}-{level}.geojson.gz"
+    if not path.exists():
+        body = gzip.compress(simplify_regions(BOUNDARY_TOLERANCES[level]).encode(), mtime=0)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # other workers may make the same file at the same time, so it appears at once
+        with NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(body)
+        os.replace(file.name, path)
+
+    body = path.read_bytes()
+    digest = hashlib.sha1(body).hexdigest()
+    return RegionBoundaries(
+        body=body,
+        etag=f'"{digest}"',
+        gzip_etag=f'"{digest}-gzip"',
+        last_modified=datetime.fromtimestamp(REGIONS_PATH.stat().st_mtime, timezone.utc),
+    )
+
+
+def prepare_region_boundaries() -> None:
+    """
+    Makes boundaries of all levels of detail, so the first requests don't wait for them.
+    """
+    for level in BOUNDARY_TOLERANCES:
+        get_region_boundaries(level)
@@ -1,248 +1,166 @@
-import re
-import tempfile
-from collections import Counter
-from datetime import datetime, timedelta
-from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple
 
-import geopandas as gpd
+import numpy as np
+import openpyxl
 import pandas as pd
-from shapely.geometry import Point
-
-from app.db.models import Flight
-from app.schemas.flights import FlightCreateModel, Statistic
-
-regions = gpd.read_file(str(Path(__file__).parent / "admin_4.shp"))
-
-
-def parse_input_file(content: bytes) -> list[FlightCreateModel]:
-    with tempfile.NamedTemporaryFile() as namedFile:
-        namedFile.write(content)
-        df = pd.read_excel(namedFile.name, header=0)
-        df["SID"] = df['SHR'].str.extract(r"SID/([0-9]+)")
-        df["TYP"] = df['SHR'].str.extract(r"TYP/[0-9]*([a-zA-Z]+)")
-
-        zona1 = df['SHR'].str.extract(r'/ZONA\s+([^/\s]+)')
-        zona2 = df['SHR'].str.extract(r'(\d+[NSС]\d+[EWВ])')
-        df["ZONA"] = zona1[0].fillna(zona2[0])
-        df["DODEP"] = (
-            df['DEP']
-            .str.extract(r"ADD\s([0-9]{6})")[0]   
-            .pipe(pd.to_datetime, format="%y%m%d") 
-            .dt.date                              
-        )
-        df["TODEP"] = (
-            df['DEP']
-            .str.extract(r"ATD\s([0-9]{4})")[0]  
-            .pipe(pd.to_datetime, format="%H%M") 
-            .dt.time                                
-        )
-
-        df["DEP_coord"] = df['DEP'].str.extract(r"ADEPZ\s(\d+[NSС]\d+[EWВ])")[0]
-        df[["LAT_DEP", "LON_DEP"]] = df["DEP_coord"].apply(lambda x: pd.Series(parse_coord(x)))
-        df['REG DEP'] = df.apply(lambda row: reg(row['LON_DEP'], row['LAT_DEP']), axis=1)
-
-        df["DOARR"] = (
-            df['ARR']
-            .str.extract(r"ADA\s([0-9]{6})")[0]   
-            .pipe(pd.to_datetime, format="%y%m%d") 
-            .dt.date                               
-        )
-        df["TOARR"] = (
-            df['ARR']
-            .str.extract(r"ATA\s([0-9]{4})")[0] 
-            .pipe(pd.to_datetime, format="%H%M") 
-            .dt.time                                
-        )
-
-        df["DEST"] = df['ARR'].str.extract(r"ADARRZ\s(\d+[NSС]\d+[EWВ])")[0]
-        df[["LAT_ARR", "LON_ARR"]] = df["DEST"].apply(lambda x: pd.Series(parse_coord(x)))
-        df['REG ARR'] = df.apply(lambda row: reg(row['LON_ARR'], row['LAT_ARR']), axis=1)
-
-        cols = ["Центр ЕС ОрВД", "SID", "TYP", "DODEP", "TODEP", 'REG DEP', "LAT_DEP", "LON_DEP", "DOARR", "TOARR", 'REG ARR', "LAT_ARR", "LON_ARR"]
-        df_new = df[cols].copy()
-
-        df_new = df_new.rename(columns={
-            "Центр ЕС ОрВД": "Center",
-            "DODEP": "DepDate",
-            "TODEP": "DepTime",
-            "DOARR": "ArrDate",
-            "TOARR": "ArrTime",
-            "LAT_DEP": "DepLat",
-            "LON_DEP": "DepLon",
-            "LAT_ARR": "ArrLat",
-            "LON_ARR": "ArrLon",
-            "REG DEP": "RegDep",
-            "REG ARR": "RegArr",
-        })
-
-    flights = []
-    for _, row in df_new.iterrows():
-        flight = FlightCreateModel(
-            sid=row["SID"],
-            type_aircraft=row["TYP"] if row["TYP"] and pd.notna(row["TYP"]) else None,
-            departure_date=row["DepDate"] if row["DepDate"] and pd.notna(row["DepDate"]) else None,
-            departure_time=row["DepTime"] if row["DepTime"] and pd.notna(row["DepTime"]) else None,
-            reg_departure=row["RegDep"] if row["RegDep"] and pd.notna(row["RegDep"]) else None,
-            departure_latitude=round(row["DepLat"],3 ) if row["DepLat"] and pd.notna(row["DepLat"]) else None,
-            departure_longitude=round(row["DepLon"],3) if row["DepLon"] and pd.notna(row["DepLon"]) else None,
-            arrival_date=row["ArrDate"] if row["ArrDate"] and pd.notna(row["ArrDate"]) else None,
-            arrival_time=row["ArrTime"] if row["ArrTime"] and pd.notna(row["ArrTime"]) else None,
-            reg_arrival=row["RegArr"] if row["RegArr"] and pd.notna(row["RegArr"]) else None,
-            arrival_latitude=round(row["ArrLat"],3) if row["ArrLat"] and pd.notna(row["ArrLat"]) else None,
-            arrival_longitude=round(row["ArrLon"], 3) if row["ArrLon"] and pd.notna(row["ArrLon"]) else None,
-        )
-        flights.append(flight)
-    
-    return flights
-
-
-def parse_dms(part: str) -> float:
-    direction = part[-1].upper()
-    digits = part[:-1]
-
-    if direction in "NS":
-        deg_len = 2  
-    else:
-        deg_len = 3 
-
-    d = int(digits[:deg_len])
-    m = int(digits[deg_len:deg_len+2]) if len(digits) >= deg_len+2 else 0
-    s = int(digits[deg_len+2:deg_len+4]) if len(digits) >= deg_len+4 else 0
-
-    dd = d + m/60 + s/3600
-    if direction in "SW": 
-        dd *= -1
-    return dd
-
-def parse_coord(coord: str):
-    if not isinstance(coord, str) or coord.strip() == "":
-        return None, None
-    
-    match = re.match(r"(\d+[NSС])(\d+[EWВ])", coord)
-    if not match:
-        return None, None
-    
-    lat_raw, lon_raw = match.groups()
-    lat_raw = lat_raw.replace("С", "N")
-    lon_raw = lon_raw.replace("В", "E")
-    return parse_dms(lat_raw), parse_dms(lon_raw)
-
-
-def reg(lon, lat):
-    point = Point(lon, lat)
-    region = regions[regions.contains(point)]
-    if len(region) > 0:
-        return region['name_ru'].values[0]
-    return None
-
-
-def format_flight_data(flights: list[Flight], linear_step: str):
-    total_count_flights = len(flights)
-
-    durations = []
-    for flight in flights:
-        if flight.departure_date and flight.departure_time and flight.arrival_date and flight.arrival_time:
-            dep_dt = datetime.combine(flight.departure_date, flight.departure_time)
-            arr_dt = datetime.combine(flight.arrival_date, flight.arrival_time)
-            if arr_dt < dep_dt:
-                arr_dt += timedelta(days=1)
-            duration = (arr_dt - dep_dt).total_seconds() / 60
-            durations.append(duration)
-
-    total_duration = sum(durations)
-    mean_duration = total_duration / len(durations) if durations else 0
-
-    weekdays = ['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс']
-    count_flights_per_weekday = [{} for _ in range(7)]
-    weekday_counts = Counter()
-    for flight in flights:
-        if flight.departure_date:
-            weekday = flight.departure_date.weekday()
-            weekday_counts[weekdays[weekday]] += 1
-    for i, day in enumerate(weekdays):
-        count_flights_per_weekday[i] = {day: weekday_counts[day]}
-
-    bins = [
-        ('< 10 мин', 10),
-        ('10 - 30 мин', 30),
-        ('30 мин - 1 ч', 60),
-        ('1 - 2 ч', 120),
-        ('2 - 4 ч', 240),
-        ('4 - 8 ч', 480),
-        ('8 - 12 ч', 720),
-        ('12 - 24 ч', 1440),
-        ('24+ ч', float('inf'))
+
+from app.schemas.flights import FlightCreateModel
+
+from .coordinates import decode_coordinates
+from .messages import MIDNIGHT, tokenize_messages
+from .region_cells import RegionCells
+from .regions import resolve_regions
+
+# fields of flights, in the order of values of tuples made by `build_flight_rows`
+FLIGHT_ROW_COLUMNS = tuple(FlightCreateModel.model_fields)
+
+# columns of decoded dataframe with values of fields of flights
+DATAFRAME_COLUMNS = {
+    "sid": "SID",
+    "type_aircraft": "TYP",
+    "departure_date": "DODEP",
+    "departure_time": "TODEP",
+    "reg_departure": "REG DEP",
+    "departure_latitude": "LAT_DEP",
+    "departure_longitude": "LON_DEP",
+    "arrival_date": "DOARR",
+    "arrival_time": "TOARR",
+    "reg_arrival": "REG ARR",
+    "arrival_latitude": "LAT_ARR",
+    "arrival_longitude": "LON_ARR",
+}
+
+LATITUDE_COLUMNS = ("departure_latitude", "arrival_latitude")
+LONGITUDE_COLUMNS = ("departure_longitude", "arrival_longitude")
+
+
+class RowError(NamedTuple):
+    """
+    Reason, by which a row of uploaded file is not a valid flight.
+    """
+    row: int
+    column: str
+    reason: str
+
+
+class FlightRows(NamedTuple):
+    """
+    Valid flights as tuples of values of `FLIGHT_ROW_COLUMNS` and errors of invalid rows.
+    """
+    rows: list[tuple]
+    errors: list[RowError]
+
+
+def read_excel_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Reads the first sheet of xlsx file in read-only mode and yields its rows
+    as dataframes of `chunk_size` rows. The first row is used as header,
+    the index of dataframes is the number of row in the sheet.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        chunk, numbers = [], []
+        # rows are numbered like in the sheet, the header is the row 1
+        for number, row in enumerate(rows, start=2):
+            if all(value is None for value in row):
+                continue
+            chunk.append(row)
+            numbers.append(number)
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=header, index=numbers)
+                chunk, numbers = [], []
+        if chunk:
+            yield pd.DataFrame.from_records(chunk, columns=header, index=numbers)
+    finally:
+        workbook.close()
+
+
+def decode_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extracts fields of flights from messages and decodes dates, times and coordinates.
+    """
+    fields = tokenize_messages(df)
+    df["SID"] = fields["sid"]
+    df["TYP"] = fields["type_aircraft"]
+    df["ZONA"] = fields["zona"]
+
+    df["DODEP"] = fields["departure_date"].dt.date
+    df["TODEP"] = (MIDNIGHT + fields["departure_time"]).dt.time
+    df["DEP_coord"] = fields["departure_coordinate"]
+    df["LAT_DEP"], df["LON_DEP"] = decode_coordinates(df["DEP_coord"])
+
+    df["DOARR"] = fields["arrival_date"].dt.date
+    df["TOARR"] = (MIDNIGHT + fields["arrival_time"]).dt.time
+    df["DEST"] = fields["arrival_coordinate"]
+    df["LAT_ARR"], df["LON_ARR"] = decode_coordinates(df["DEST"])
+    return df
+
+
+def geocode_dataframe(df: pd.DataFrame, cells: RegionCells | None = None) -> pd.DataFrame:
+    """
+    Finds regions of departure and arrival points of decoded flights,
+    with regions of cells of points from `cells`, when they are given.
+    """
+    resolve = resolve_regions if cells is None else cells.resolve
+    df['REG DEP'] = resolve(df['LON_DEP'], df['LAT_DEP'])
+    df['REG ARR'] = resolve(df['LON_ARR'], df['LAT_ARR'])
+    return df
+
+
+def build_flight_rows(df: pd.DataFrame) -> FlightRows:
+    """
+    Validates decoded and geocoded flights column by column and makes tuples of values
+    of valid ones, ready to be inserted (see `FlightRepository.create_batch`).
+
+    A row is invalid without SID or type of aircraft, with SID less than 1 or with coordinates
+    out of range; every failed check of such row is in the errors with the number of row (the index of `df`).
+    """
+    columns = {column: _column_values(df[source], column) for column, source in DATAFRAME_COLUMNS.items()}
+
+    has_sid = columns["sid"][1]
+    checks = [
+        ("sid", has_sid, "is missing"),
+        ("sid", ~has_sid | (df["SID"].fillna(1).to_numpy(dtype=np.int64) >= 1), "must be at least 1"),
+        ("type_aircraft", columns["type_aircraft"][1], "is missing"),
     ]
-    distribution_by_flight_duration = [{} for _ in range(len(bins))]
-
-    duration_dist = Counter()
-    for dur in durations:
-        for label, limit in bins:
-            if dur <= limit:
-                duration_dist[label] += 1
-                break
-    for i, bin in enumerate(bins):
-        for label, count in duration_dist.items():
-            if label == bin[0]:
-                distribution_by_flight_duration[i] = {label: count}
-                break
-
-    type_counts = Counter(f.type_aircraft for f in flights if f.type_aircraft)
-    distribution_by_type = dict(type_counts)
-
-    null_features = Counter()
-    for f in flights:
-        if not f.arrival_date:
-            null_features["Дата посадки"] += 1
-        if not f.arrival_time:
-            null_features["Время посадки"] += 1
-        if not f.reg_arrival:
-            null_features["Регион посадки"] += 1
-        if not f.arrival_latitude:
-            null_features["Широта региона посадки"] += 1
-        if not f.arrival_longitude:
-            null_features["Долгота региона посадки"] += 1
-        if not f.type_aircraft:
-            null_features["Тип ВС"] += 1
-        if not f.departure_date:
-            null_features["Дата вылета"] += 1
-        if not f.departure_time:
-            null_features["Время вылета"] += 1
-        if not f.reg_departure:
-            null_features["Регион вылета"] += 1
-        if not f.departure_latitude:
-            null_features["Широта региона вылета"] += 1
-        if not f.departure_longitude:
-            null_features["Долгота региона вылета"] += 1
-    distribution_null_features = dict(null_features)
-
-    time_counts = Counter()
-    for f in flights:
-        if f.departure_date:
-            key = get_time_key(f.departure_date, linear_step)
-            time_counts[key] += 1
-    count_flights_by_month = [{k: v} for k, v in sorted(time_counts.items())]
-
-    return Statistic(
-        total_count_flights=total_count_flights,
-        total_duration=round(total_duration),
-        mean_duration=round(mean_duration),
-        count_flights_per_weekday=count_flights_per_weekday,
-        distribution_by_flight_duration=distribution_by_flight_duration,
-        distribution_by_type=distribution_by_type,
-        distribution_null_features=distribution_null_features,
-        count_flights_by_month=count_flights_by_month,
-    )
-
-
-def get_time_key(date: datetime.date, granularity: str) -> str:
-    if granularity == 'day':
-        return date.strftime("%d.%m.%Y")
-    elif granularity == 'week':
-        return date.strftime("%Y-W%W")
-    elif granularity == 'month':
-        return date.strftime("%m.%Y")
-    elif granularity == 'year':
-        return date.strftime("%Y")
+    for column in LATITUDE_COLUMNS + LONGITUDE_COLUMNS:
+        limit = 90 if column in LATITUDE_COLUMNS else 180
+        values = df[DATAFRAME_COLUMNS[column]].to_numpy(dtype=float, na_value=np.nan)
+        checks.append((column, np.isnan(values) | (np.abs(values) <= limit), f"must be between -{limit} and {limit}"))
+
+    valid = np.ones(len(df), dtype=bool)
+    errors = []
+    for column, passed, reason in checks:
+        valid &= passed
+        errors.extend(RowError(int(row), column, reason) for row in df.index[~passed])
+    errors.sort(key=lambda error: error.row)
+
+    values = [columns[column][0][valid].tolist() for column in FLIGHT_ROW_COLUMNS]
+    return FlightRows(rows=list(zip(*values)), errors=errors)
+
+
+def _column_values(series: pd.Series, column: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Values of column as array of Python objects with None for missing values,
+    and mask of rows, which have a value.
+
+    Empty strings and zero coordinates are missing values too, coordinates are rounded to 3 digits.
+    """
+    if column in LATITUDE_COLUMNS + LONGITUDE_COLUMNS:
+        numbers = series.to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(numbers) & (numbers != 0)
+        values = np.round(numbers, 3).astype(object)
+    elif column == "sid":
+        present = series.notna().to_numpy()
+        values = series.astype(object).to_numpy()
     else:
-        raise ValueError(f"Unsupported granularity: {granularity}")
+        values = series.to_numpy(dtype=object)
+        present = series.notna().to_numpy() & (values != "")
+    values = values.copy()
+    values[~present] = None
+    return values, present
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette import status
+
+from app.config import get_settings
+from app.db.repository import DatasetVersionRepository
+
+
+class LRUCache:
+    """
+    Bounded cache, which forgets the least recently used entries
+    and entries older than `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or self.timer() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (self.timer(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SingleFlight:
+    """
+    Shares one running call among all concurrent callers with the same key.
+
+    The first caller of a key starts the call, the callers which come while it runs
+    wait for its result (or its exception) instead of making their own call. Counts
+    of such coalesced callers are kept for the `maxsize` most recently used keys.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.coalesced: OrderedDict[Hashable, int] = OrderedDict()
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced[key] = self.coalesced.get(key, 0) + 1
+            self.coalesced.move_to_end(key)
+            while len(self.coalesced) > self.maxsize:
+                self.coalesced.popitem(last=False)
+        # a caller, which is cancelled, doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": len(self._calls),
+            "coalesced": [{"key": repr(key), "count": count} for key, count in self.coalesced.items()],
+        }
+
+
+statistic_cache = LRUCache(
+    maxsize=get_settings().STATISTIC_CACHE_SIZE,
+    ttl=get_settings().STATISTIC_CACHE_TTL,
+)
+statistic_flights = SingleFlight(maxsize=get_settings().STATISTIC_CACHE_SIZE)
+
+
+def cache_metrics() -> list[dict[str, Any]]:
+    return [{"name": "statistic", **statistic_cache.metrics(), **statistic_flights.metrics()}]
+
+
+def make_etag(key: Hashable) -> str:
+    return '"{}"'.format(hashlib.sha1(repr(key).encode()).hexdigest())
+
+
+def validation_headers(etag: str, last_modified: datetime) -> dict[str, str]:
+    """
+    Headers, with which the client revalidates its copy of response on every request.
+    """
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Checks conditional headers of request: `If-None-Match` or, without it, `If-Modified-Since`.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """
+    Checks, whether `Accept-Encoding` of request allows content coding `encoding`:
+    it is listed or `*` is, with quality value above 0 (`gzip;q=0` refuses gzip).
+    """
+    qualities = {}
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+async def cached_by_dataset_version(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    key: tuple,
+    build: Callable[[AsyncSession], Awaitable[Any]],
+) -> Any:
+    """
+    Value made by `build` for parameters of request `key` and the current version of dataset.
+
+    Values are kept in `statistic_cache`, so each of them is built once per version of dataset,
+    and concurrent requests of a value, which is not cached yet, wait for one build of it;
+    the client, which has the value of this version already, gets empty `304 Not Modified` response.
+
+    The build is shared by requests, so it gets its own session on the engine of `session`:
+    the session of the request, which started it, is closed when that request ends.
+    """
+    dataset = await DatasetVersionRepository().get_current(session)
+    key = (dataset.version, dataset.updated_at, *key)
+    etag = make_etag(key)
+    headers = validation_headers(etag, dataset.updated_at)
+    if is_not_modified(request, etag, dataset.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    async def build_and_cache() -> Any:
+        async with sessionmaker(session.bind, class_=AsyncSession, expire_on_commit=False)() as build_session:
+            value = await build(build_session)
+        statistic_cache.set(key, value)
+        return value
+
+    value = statistic_cache.get(key)
+    if value is None:
+        value = await statistic_flights.do(key, build_and_cache)
+    response.headers.update(headers)
+    return value
@@ -0,0 +1,96 @@
+import unicodedata
+from typing import Iterable
+
+import numpy as np
+
+# Longer values are rare (coordinates have at most 15 characters) and are decoded
+# apart from the others, so a single broken cell doesn't blow up the width of the whole array.
+MAX_VECTORIZED_LENGTH = 32
+
+LATITUDE = {ord("N"): 1.0, ord("С"): 1.0, ord("S"): -1.0}
+LONGITUDE = {ord("E"): 1.0, ord("В"): 1.0, ord("W"): -1.0}
+
+
+def decode_coordinates(coords: Iterable) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decodes all coordinates like `5540С03730В` or `554000N0373000E` at once
+    with array arithmetic over their characters.
+
+    Returns arrays of latitudes and longitudes; the leading digits of a part are
+    degrees (2 of latitude, 3 of longitude), the next two are minutes and the next
+    two are seconds. Values, which don't start with such parts, are NaN.
+    """
+    values = [_ascii_digits(coord) if isinstance(coord, str) else "" for coord in coords]
+    lat = np.full(len(values), np.nan)
+    lon = np.full(len(values), np.nan)
+
+    long_values = np.array([len(value) > MAX_VECTORIZED_LENGTH for value in values], dtype=bool)
+    for rows in (np.flatnonzero(~long_values), np.flatnonzero(long_values)):
+        if rows.size:
+            lat[rows], lon[rows] = _decode([values[i] for i in rows])
+    return lat, lon
+
+
+def _ascii_digits(value: str) -> str:
+    """
+    Replaces Unicode decimal digits (`٠`, `５`, ...) with ASCII ones: they are digits of coordinates too.
+    """
+    if value.isascii():
+        return value
+    return "".join(str(unicodedata.decimal(char, char)) for char in value)
+
+
+def _decode(values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    lat = np.full(len(values), np.nan)
+    lon = np.full(len(values), np.nan)
+
+    strings = np.array(values, dtype=str)
+    # one zero column more, so every row has a non-digit character after the digits
+    width = strings.dtype.itemsize // 4 + 1
+    chars = np.zeros((len(values), width), dtype=np.uint32)
+    chars[:, :width - 1] = strings.view(np.uint32).reshape(len(values), width - 1)
+
+    digits = chars - ord("0")
+    is_digit = digits <= 9
+    rows = np.arange(len(values))
+
+    lat_end = np.argmax(~is_digit, axis=1)
+    lon_start = lat_end + 1
+    lon_end = np.argmax(~is_digit & (np.arange(width) > lat_end[:, None]), axis=1)
+
+    lat_sign = _signs(chars[rows, lat_end], LATITUDE)
+    lon_sign = _signs(chars[rows, lon_end], LONGITUDE)
+    valid = (lat_end > 0) & (lon_end > lon_start) & (lat_sign != 0) & (lon_sign != 0)
+
+    lat[valid] = (lat_sign * _dms(digits, np.zeros_like(lat_end), lat_end, 2))[valid]
+    lon[valid] = (lon_sign * _dms(digits, lon_start, lon_end - lon_start, 3))[valid]
+    return lat, lon
+
+
+def _signs(chars: np.ndarray, hemispheres: dict[int, float]) -> np.ndarray:
+    signs = np.zeros(len(chars))
+    for char, sign in hemispheres.items():
+        signs[chars == char] = sign
+    return signs
+
+
+def _dms(digits: np.ndarray, start: np.ndarray, length: np.ndarray, deg_len: int) -> np.ndarray:
+    """
+    Degrees, minutes and seconds of digits `digits[row, start:start + length]` of every row in degrees.
+    """
+    d = _number(digits, start, np.minimum(length, deg_len))
+    m = _number(digits, start + deg_len, np.where(length >= deg_len + 2, 2, 0))
+    s = _number(digits, start + deg_len + 2, np.where(length >= deg_len + 4, 2, 0))
+    return d + m/60 + s/3600
+
+
+def _number(digits: np.ndarray, start: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """
+    Integer value of `count` digits from `start` of every row (0 when `count` is 0).
+    """
+    rows = np.arange(len(digits))
+    number = np.zeros(len(digits), dtype=np.int64)
+    for offset in range(int(count.max(initial=0))):
+        position = np.minimum(start + offset, digits.shape[1] - 1)
+        number = np.where(offset < count, number * 10 + digits[rows, position], number)
+    return number
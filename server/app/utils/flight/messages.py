@@ -0,0 +1,130 @@
+import re
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+COORDINATE = r"\d+[NSС]\d+[EWВ]"
+COORDINATE_PATTERN = re.compile(COORDINATE)
+
+DATE_FORMAT = "%y%m%d"
+TIME_FORMAT = "%H%M"
+MIDNIGHT = pd.Timestamp("1900-01-01")
+
+
+class Token(NamedTuple):
+    """
+    Field of message: literal keyword and pattern of value right after it
+    (the first group of the pattern is the value of the field).
+    """
+    keyword: str
+    value: re.Pattern
+
+
+SHR_TOKENS = {
+    "sid": Token("SID/", re.compile(r"([0-9]+)")),
+    "type_aircraft": Token("TYP/", re.compile(r"[0-9]*([a-zA-Z]+)")),
+    "zona": Token("/ZONA", re.compile(r"\s+([^/\s]+)")),
+}
+DEP_TOKENS = {
+    "departure_date": Token("ADD", re.compile(r"\s([0-9]{6})")),
+    "departure_time": Token("ATD", re.compile(r"\s([0-9]{4})")),
+    "departure_coordinate": Token("ADEPZ", re.compile(rf"\s({COORDINATE})")),
+}
+ARR_TOKENS = {
+    "arrival_date": Token("ADA", re.compile(r"\s([0-9]{6})")),
+    "arrival_time": Token("ATA", re.compile(r"\s([0-9]{4})")),
+    "arrival_coordinate": Token("ADARRZ", re.compile(rf"\s({COORDINATE})")),
+}
+
+
+def scan_messages(messages: Iterable, tokens: dict[str, Token]) -> dict[str, list[str | None]]:
+    """
+    Extracts all fields from every message in one pass over messages.
+
+    The value of each field is the same as `re.search(keyword + value)` gives,
+    but the keyword is looked up with `str.find`, which is much faster than
+    the regex engine trying the pattern at every position of the message.
+    Values which are not strings (empty cells) give None for all fields.
+    """
+    fields = {name: [] for name in tokens}
+    items = [
+        (fields[name].append, token.keyword, len(token.keyword), token.value.match)
+        for name, token in tokens.items()
+    ]
+    for message in messages:
+        if isinstance(message, str):
+            for append, keyword, length, match in items:
+                value = None
+                start = message.find(keyword)
+                while start != -1:
+                    found = match(message, start + length)
+                    if found:
+                        value = found.group(1)
+                        break
+                    start = message.find(keyword, start + 1)
+                append(value)
+        else:
+            for append, *_ in items:
+                append(None)
+    return fields
+
+
+def tokenize_messages(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extracts all fields of SHR, DEP and ARR messages in one pass over each column.
+
+    Returns dataframe with the index of `df` and columns:
+    `sid` (Int64), `type_aircraft`, `zona`, `departure_coordinate`, `arrival_coordinate` (str),
+    `departure_date`, `arrival_date` (datetime64) and `departure_time`, `arrival_time`
+    (timedelta64 since midnight). Missing fields are None, <NA> or NaT.
+    """
+    shr = scan_messages(df["SHR"], SHR_TOKENS)
+    dep = scan_messages(df["DEP"], DEP_TOKENS)
+    arr = scan_messages(df["ARR"], ARR_TOKENS)
+
+    # without ZONA field, the first coordinate of SHR message is used as zone
+    zona = [
+        value if value is not None or not isinstance(message, str) else _search_coordinate(message)
+        for value, message in zip(shr["zona"], df["SHR"])
+    ]
+
+    return pd.DataFrame(
+        {
+            "sid": pd.array([int(sid) if sid else None for sid in shr["sid"]], dtype="Int64"),
+            "type_aircraft": shr["type_aircraft"],
+            "zona": zona,
+            "departure_date": _to_date(dep["departure_date"]),
+            "departure_time": _to_time(dep["departure_time"]),
+            "departure_coordinate": dep["departure_coordinate"],
+            "arrival_date": _to_date(arr["arrival_date"]),
+            "arrival_time": _to_time(arr["arrival_time"]),
+            "arrival_coordinate": arr["arrival_coordinate"],
+        },
+        index=df.index,
+    )
+
+
+def _search_coordinate(message: str) -> str | None:
+    match = COORDINATE_PATTERN.search(message)
+    return match.group(0) if match else None
+
+
+def _to_date(values: list[str | None]) -> np.ndarray:
+    return _parse_unique(values, lambda uniques: pd.to_datetime(uniques, format=DATE_FORMAT))
+
+
+def _to_time(values: list[str | None]) -> np.ndarray:
+    return _parse_unique(values, lambda uniques: pd.to_datetime(uniques, format=TIME_FORMAT) - MIDNIGHT)
+
+
+def _parse_unique(values: list[str | None], parse: Callable[[pd.Index], pd.Index]) -> np.ndarray:
+    """
+    Parses only distinct values: dates and times of flights repeat a lot.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parsed = parse(uniques).to_numpy()
+    result = np.full(len(codes), parsed.dtype.type("NaT"), dtype=parsed.dtype)
+    present = codes >= 0
+    result[present] = parsed[codes[present]]
+    return result
@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Mapping
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.repository import RegionCellRepository
+
+from .region_index import BORDER, OUTSIDE, cell_boxes, classify_boxes, shapefile_digest
+from .regions import RegionLocator, get_region_locator, get_regions, resolve_regions
+
+# cells of 0.001 degree: coordinates of flights are stored with 3 decimals
+CELLS_PER_DEGREE = 1000
+
+# region of a cell, which is crossed by a boundary of region: its points are tested one by one
+BOUNDARY = object()
+
+_MISSING = object()
+
+Cell = tuple[int, int]
+
+
+class RegionCells:
+    """
+    Bounded LRU cache of regions of cells of grid of coordinates, `(lon_cell, lat_cell)`.
+
+    A cell, which lies inside of regions as a whole (or out of all regions), gives its
+    region to all its points without point-in-polygon tests; a cell crossed by a boundary
+    of region is marked with `BOUNDARY`, and its points are tested with `resolve_regions`.
+    Cells are saved to the table `region_cells` of the database, so they are computed
+    once for a version of the shapefile, not once per process.
+
+    `hits` are points, which got their region from the cache, `misses` are points,
+    which were tested against polygons, either their cell was new or it is a boundary.
+    """
+
+    def __init__(self, maxsize: int, regions_gdf: gpd.GeoDataFrame | None = None, shapefile: str | None = None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # cells computed here, which are not saved to the database yet
+        self.new_cells: dict[Cell, str | None | object] = {}
+        self._regions_gdf = regions_gdf
+        self._locator = None if regions_gdf is None else RegionLocator(regions_gdf.geometry.to_numpy())
+        self._shapefile = shapefile
+        self._cells: OrderedDict[Cell, str | None | object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @property
+    def regions_gdf(self) -> gpd.GeoDataFrame:
+        return get_regions() if self._regions_gdf is None else self._regions_gdf
+
+    @property
+    def locator(self) -> RegionLocator:
+        return get_region_locator() if self._locator is None else self._locator
+
+    @property
+    def shapefile(self) -> str:
+        if self._shapefile is None:
+            self._shapefile = shapefile_digest()[:16]
+        return self._shapefile
+
+    def missing(self, lons: pd.Series, lats: pd.Series) -> list[Cell]:
+        """
+        Cells of points, which are not in the cache.
+        """
+        cells, _, _ = _cells_of_points(*_coordinates(lons, lats))
+        return [cell for cell in cells if cell not in self._cells]
+
+    def update(self, cells: Mapping[Cell, str | None | object]) -> None:
+        for cell, region in cells.items():
+            self._cells[cell] = region
+            self._cells.move_to_end(cell)
+        while len(self._cells) > self.maxsize:
+            self._cells.popitem(last=False)
+
+    def resolve(self, lons: pd.Series, lats: pd.Series) -> pd.Series:
+        """
+        Same as `resolve_regions` with regions of cells, see `RegionCells`.
+        """
+        x, y = _coordinates(lons, lats)
+        cells, inverse, index = _cells_of_points(x, y)
+
+        known = {}
+        unknown = []
+        for cell in cells:
+            region = self._cells.get(cell, _MISSING)
+            if region is _MISSING:
+                unknown.append(cell)
+            else:
+                self._cells.move_to_end(cell)
+                known[cell] = region
+        computed = self.compute(unknown)
+        self.update(computed)
+        self.new_cells.update(computed)
+        known.update(computed)
+
+        regions = np.empty(len(cells), dtype=object)
+        regions[:] = [known[cell] for cell in cells]
+        cached = np.array([cell not in computed for cell in cells], dtype=bool)
+        boundary = np.array([region is BOUNDARY for region in regions], dtype=bool)
+
+        result = np.full(len(x), None, dtype=object)
+        result[index] = regions[inverse]
+        exact = index[boundary[inverse]]
+        if exact.size:
+            result[exact] = resolve_regions(x[exact], y[exact], self.regions_gdf).to_numpy(dtype=object)
+
+        self.hits += int((cached & ~boundary)[inverse].sum())
+        self.misses += int((~cached | boundary)[inverse].sum())
+        return pd.Series(result, index=pd.Series(lons).index, dtype=object)
+
+    def compute(self, cells: list[Cell]) -> dict[Cell, str | None | object]:
+        """
+        Regions of cells: the first region, which contains a cell, `BOUNDARY` for cells
+        crossed by a boundary of any region and None for cells out of all regions.
+        """
+        if not cells:
+            return {}
+        corners = np.array(cells, dtype=np.int64)
+        boxes = cell_boxes(corners[:, 0], corners[:, 1], CELLS_PER_DEGREE)
+        classes = classify_boxes(boxes, self.locator.geometries, self.locator.tree)
+        names = self.regions_gdf["name_ru"].to_numpy(dtype=object)
+        return {
+            cell: BOUNDARY if region == BORDER else None if region == OUTSIDE else names[region]
+            for cell, region in zip(cells, classes.tolist())
+        }
+
+    async def load(self, session: AsyncSession, lons: pd.Series, lats: pd.Series) -> None:
+        """
+        Adds cells of points, which are saved in the database, to the cache.
+        """
+        missing = self.missing(lons, lats)
+        if missing:
+            saved = await RegionCellRepository().get_cells(session, self.shapefile, missing)
+            self.update({cell: BOUNDARY if boundary else region for cell, (region, boundary) in saved.items()})
+
+    async def save(self, session: AsyncSession) -> None:
+        """
+        Saves new cells to the database, in the transaction of `session`.
+        """
+        if self.new_cells:
+            await RegionCellRepository().save_cells(
+                session,
+                self.shapefile,
+                {
+                    cell: (None, True) if region is BOUNDARY else (region, False)
+                    for cell, region in self.new_cells.items()
+                },
+            )
+            self.new_cells = {}
+
+
+def _coordinates(lons: pd.Series, lats: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    x = pd.to_numeric(pd.Series(lons), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    y = pd.to_numeric(pd.Series(lats), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return x, y
+
+
+def _cells_of_points(x: np.ndarray, y: np.ndarray) -> tuple[list[Cell], np.ndarray, np.ndarray]:
+    """
+    Distinct cells of points with coordinates, number of cell of every such point
+    and positions of such points.
+    """
+    index = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    points = np.floor(np.column_stack([x[index], y[index]]) * CELLS_PER_DEGREE).astype(np.int64)
+    cells, inverse = np.unique(points, axis=0, return_inverse=True)
+    return list(map(tuple, cells.tolist())), inverse.reshape(-1), index
+
+
+region_cells = RegionCells(maxsize=get_settings().REGION_CELLS_CACHE_SIZE)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import NamedTuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from app.config import get_settings
+
+REGIONS_PATH = Path(__file__).parent / "admin_4.shp"
+
+# version of files of index, a new version is compiled next to the old ones
+REGION_INDEX_FORMAT = 2
+
+# values of cells of the grid of index, which are not numbers of regions
+OUTSIDE = -1
+BORDER = -2
+
+# cells are tested a bit wider, so a point, which got to the cell by rounding of `floor`, is in it too
+CELL_MARGIN = 1e-9
+
+
+class RegionIndex(NamedTuple):
+    """
+    Regions of shapefile compiled to arrays, which are memory-mapped from files of index,
+    so workers share pages of the grid and bounds, which locate most points, in the page cache.
+
+    Polygons, which points near boundaries are tested against, are not shared: every worker,
+    which needs them, parses them from WKB (see `geometries`), still much faster than the shapefile.
+    """
+    names: list[str | None]
+    crs: str
+    # minx, miny, maxx, maxy of every region, candidates of exact tests of points (see `RegionLocator`)
+    bounds: np.ndarray
+    # WKB of all regions one after another, WKB of region `i` is `wkb[offsets[i]:offsets[i + 1]]`
+    offsets: np.ndarray
+    wkb: np.ndarray
+    # uniform grid over regions: number of the region, which contains the whole cell, `BORDER`
+    # for cells crossed by a boundary and `OUTSIDE` for cells out of all regions; cell `grid[j, i]`
+    # is the cell `(grid_origin[0] + i, grid_origin[1] + j)` of `grid_cells_per_degree` cells per degree
+    grid: np.ndarray
+    grid_origin: tuple[int, int]
+    grid_cells_per_degree: int
+
+    def geometries(self) -> np.ndarray:
+        return shapely.from_wkb([
+            self.wkb[start:end].tobytes() for start, end in zip(self.offsets[:-1], self.offsets[1:])
+        ])
+
+
+def shapefile_digest(shapefile: Path = REGIONS_PATH) -> str:
+    """
+    Hash of contents of all files of shapefile (`.shp`, `.shx`, `.dbf`, `.prj`, ...).
+
+    Files are hashed once per process while their paths, times of modification and sizes stay the same,
+    so the index, boundaries and cells of regions share the hash made for the first of them.
+    """
+    parts = []
+    for part in sorted(shapefile.parent.glob(f"{shapefile.stem}.*")):
+        stat = part.stat()
+        parts.append((part, stat.st_mtime_ns, stat.st_size))
+    return _hash_parts(tuple(parts))
+
+
+@lru_cache
+def _hash_parts(parts: tuple[tuple[Path, int, int], ...]) -> str:
+    digest = hashlib.sha1()
+    for part, _, _ in parts:
+        digest.update(part.suffix.encode())
+        digest.update(part.read_bytes())
+    return digest.hexdigest()
+
+
+def classify_boxes(boxes: np.ndarray, geometries: np.ndarray, tree: shapely.STRtree) -> np.ndarray:
+    """
+    Number of the first region, which contains every box in its interior, for boxes inside of regions,
+    `BORDER` for boxes crossed by a boundary of any region and `OUTSIDE` for boxes out of all regions.
+
+    `tree` is the spatial index of `geometries`, which should be prepared.
+    """
+    box_idx, region_idx = tree.query(boxes, predicate="intersects")
+    inside = shapely.contains_properly(geometries[region_idx], boxes[box_idx])
+
+    classes = np.full(len(boxes), len(geometries), dtype=np.int64)
+    np.minimum.at(classes, box_idx, region_idx)
+    classes[classes == len(geometries)] = OUTSIDE
+    classes[box_idx[~inside]] = BORDER
+    return classes
+
+
+def cell_boxes(lon_cells: np.ndarray, lat_cells: np.ndarray, cells_per_degree: int) -> np.ndarray:
+    return shapely.box(
+        lon_cells / cells_per_degree - CELL_MARGIN,
+        lat_cells / cells_per_degree - CELL_MARGIN,
+        (lon_cells + 1) / cells_per_degree + CELL_MARGIN,
+        (lat_cells + 1) / cells_per_degree + CELL_MARGIN,
+    )
+
+
+def compile_region_grid(geometries: np.ndarray, cells_per_degree: int) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Grid of cells over bounds of `geometries`, see `RegionIndex.grid`, and its origin.
+    """
+    shapely.prepare(geometries)
+    min_x, min_y, max_x, max_y = shapely.total_bounds(geometries)
+    origin = (int(np.floor(min_x * cells_per_degree)), int(np.floor(min_y * cells_per_degree)))
+    width = int(np.floor(max_x * cells_per_degree)) - origin[0] + 1
+    height = int(np.floor(max_y * cells_per_degree)) - origin[1] + 1
+
+    lat_cells, lon_cells = np.divmod(np.arange(width * height), width)
+    boxes = cell_boxes(lon_cells + origin[0], lat_cells + origin[1], cells_per_degree)
+    grid = classify_boxes(boxes, geometries, shapely.STRtree(geometries))
+    return grid.astype(np.int16).reshape(height, width), origin
+
+
+def compile_region_index(shapefile: Path, directory: Path) -> None:
+    """
+    Writes arrays of `RegionIndex` of regions of `shapefile` to `directory`.
+
+    Files are written to a temporary directory, which is renamed at once:
+    workers, which start together, never see a half-written index.
+    """
+    regions_gdf = gpd.read_file(str(shapefile))
+    wkb = shapely.to_wkb(regions_gdf.geometry.to_numpy())
+    offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+    np.cumsum([len(geometry) for geometry in wkb], out=offsets[1:])
+
+    cells_per_degree = get_settings().REGION_GRID_CELLS_PER_DEGREE
+    grid, origin = compile_region_grid(regions_gdf.geometry.to_numpy(), cells_per_degree)
+
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    temporary = Path(mkdtemp(dir=directory.parent))
+    with open(temporary / "meta.json", "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "names": regions_gdf["name_ru"].tolist(),
+                "crs": regions_gdf.crs.to_string(),
+                "grid_origin": origin,
+                "grid_cells_per_degree": cells_per_degree,
+            },
+            file,
+        )
+    np.save(temporary / "bounds.npy", shapely.bounds(regions_gdf.geometry.to_numpy()))
+    np.save(temporary / "offsets.npy", offsets)
+    np.save(temporary / "wkb.npy", np.frombuffer(b"".join(wkb), dtype=np.uint8))
+    np.save(temporary / "grid.npy", grid)
+    try:
+        temporary.rename(directory)
+    except OSError:
+        # another worker has compiled the same index already
+        shutil.rmtree(temporary)
+
+
+@lru_cache
+def load_region_index(shapefile: Path = REGIONS_PATH, index_dir: Path | None = None) -> RegionIndex:
+    """
+    Region index of `shapefile`, compiled to `index_dir` (`REGION_INDEX_DIR` by default)
+    under the hash of the shapefile, so it is compiled again only when the shapefile changes.
+    """
+    directory = Path(index_dir or get_settings().REGION_INDEX_DIR) / (
+        f"{shapefile.stem}-{shapefile_digest(shapefile)[:16]}"
+        f"-v{REGION_INDEX_FORMAT}-g{get_settings().REGION_GRID_CELLS_PER_DEGREE}"
+    )
+    if not directory.exists():
+        compile_region_index(shapefile, directory)
+
+    with open(directory / "meta.json", encoding="utf-8") as file:
+        meta = json.load(file)
+    return RegionIndex(
+        names=meta["names"],
+        crs=meta["crs"],
+        bounds=np.load(directory / "bounds.npy", mmap_mode="r"),
+        offsets=np.load(directory / "offsets.npy", mmap_mode="r"),
+        wkb=np.load(directory / "wkb.npy", mmap_mode="r"),
+        grid=np.load(directory / "grid.npy", mmap_mode="r"),
+        grid_origin=tuple(meta["grid_origin"]),
+        grid_cells_per_degree=meta["grid_cells_per_degree"],
+    )
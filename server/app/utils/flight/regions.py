@@ -0,0 +1,146 @@
+from functools import cached_property, lru_cache
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from .region_index import BORDER, OUTSIDE, load_region_index
+
+# points, which are compared with bounding boxes of all regions at once
+POINTS_CHUNK_SIZE = 4096
+
+
+class RegionLocator:
+    """
+    Finds numbers of regions of points (in the order of `geometries`, -1 out of all regions).
+
+    With the grid of `RegionIndex`, a point in a cell inside of a region (or out of all regions)
+    gets its region from the cell at once. Other points, near boundaries, are tested exactly:
+    bounding boxes of regions (`bounds`, computed from `geometries` when not given) give
+    candidates, which prepared polygons are then tested against the point.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        geometries: np.ndarray,
+        grid: np.ndarray | None = None,
+        grid_origin: tuple[int, int] = (0, 0),
+        grid_cells_per_degree: int = 1,
+        bounds: np.ndarray | None = None,
+    ):
+        self.geometries = geometries
+        shapely.prepare(self.geometries)
+        self.bounds = shapely.bounds(geometries) if bounds is None else bounds
+        self.grid = grid
+        self.grid_origin = grid_origin
+        self.grid_cells_per_degree = grid_cells_per_degree
+        # points, which got region from the grid, and points tested against polygons
+        self.grid_points = 0
+        self.exact_points = 0
+
+    @cached_property
+    def tree(self) -> shapely.STRtree:
+        """
+        Spatial index of regions, built on the first use: locating points doesn't need it.
+        """
+        return shapely.STRtree(self.geometries)
+
+    def locate(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        regions = np.full(len(x), BORDER, dtype=np.int64)
+        if self.grid is not None:
+            height, width = self.grid.shape
+            i = np.floor(x * self.grid_cells_per_degree).astype(np.int64) - self.grid_origin[0]
+            j = np.floor(y * self.grid_cells_per_degree).astype(np.int64) - self.grid_origin[1]
+            in_grid = (i >= 0) & (i < width) & (j >= 0) & (j < height)
+            # out of the grid is out of bounds of all regions
+            regions[~in_grid] = OUTSIDE
+            regions[in_grid] = self.grid[j[in_grid], i[in_grid]]
+
+        exact = np.flatnonzero(regions == BORDER)
+        self.grid_points += len(x) - exact.size
+        self.exact_points += exact.size
+        regions[exact] = self._contains(x[exact], y[exact])
+        return regions
+
+    def _contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        The first region, which contains every point.
+        """
+        min_x, min_y, max_x, max_y = np.asarray(self.bounds).T
+        first_region = np.full(len(x), len(self.geometries), dtype=np.int64)
+        for start in range(0, len(x), POINTS_CHUNK_SIZE):
+            chunk_x = x[start:start + POINTS_CHUNK_SIZE, np.newaxis]
+            chunk_y = y[start:start + POINTS_CHUNK_SIZE, np.newaxis]
+            point_idx, region_idx = np.nonzero(
+                (chunk_x >= min_x) & (chunk_x <= max_x) & (chunk_y >= min_y) & (chunk_y <= max_y),
+            )
+            inside = shapely.contains_xy(self.geometries[region_idx], chunk_x[point_idx, 0], chunk_y[point_idx, 0])
+            np.minimum.at(first_region, start + point_idx[inside], region_idx[inside])
+        first_region[first_region == len(self.geometries)] = OUTSIDE
+        return first_region
+
+
+@lru_cache
+def get_regions() -> gpd.GeoDataFrame:
+    """
+    Regions of `admin_4.shp`, loaded from the compiled region index on the first use.
+    """
+    index = load_region_index()
+    return gpd.GeoDataFrame({"name_ru": index.names}, geometry=index.geometries(), crs=index.crs)
+
+
+@lru_cache
+def get_region_locator() -> RegionLocator:
+    """
+    Locator of regions of `admin_4.shp` with the grid of the compiled region index.
+    """
+    index = load_region_index()
+    return RegionLocator(
+        get_regions().geometry.to_numpy(),
+        index.grid,
+        index.grid_origin,
+        index.grid_cells_per_degree,
+        index.bounds,
+    )
+
+
+def resolve_regions(
+    lons: pd.Series,
+    lats: pd.Series,
+    regions_gdf: gpd.GeoDataFrame | None = None,
+) -> pd.Series:
+    """
+    Finds regions for all points at once with `RegionLocator`; regions of `admin_4.shp`
+    are located with the grid of the region index, other `regions_gdf` without it.
+
+    Points without coordinates or outside of all regions get None, a point inside
+    several regions gets the first of them in the order of the shapefile.
+    """
+    if regions_gdf is None:
+        regions_gdf, locator = get_regions(), get_region_locator()
+    else:
+        locator = RegionLocator(regions_gdf.geometry.to_numpy())
+    lons = pd.to_numeric(pd.Series(lons), errors="coerce")
+    lats = pd.to_numeric(pd.Series(lats), errors="coerce")
+    x = lons.to_numpy(dtype=float, na_value=np.nan)
+    y = lats.to_numpy(dtype=float, na_value=np.nan)
+
+    result = np.full(len(x), None, dtype=object)
+    valid = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if valid.size and len(regions_gdf):
+        first_region = locator.locate(x[valid], y[valid])
+        found = first_region >= 0
+        names = regions_gdf["name_ru"].to_numpy(dtype=object)
+        result[valid[found]] = names[first_region[found]]
+
+    return pd.Series(result, index=lons.index, dtype=object)
+
+
+def region_names(regions_gdf: gpd.GeoDataFrame | None = None) -> list[str]:
+    """
+    Names of all regions, which flights are geocoded to.
+    """
+    if regions_gdf is None:
+        regions_gdf = get_regions()
+    return sorted(set(regions_gdf["name_ru"].dropna()))
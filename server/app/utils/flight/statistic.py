@@ -0,0 +1,200 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from app.db.models.flight import GRID_CELLS_PER_DEGREE
+from app.schemas.flights import (
+    DURATION_BINS,
+    NULL_FEATURES,
+    HeatmapGrid,
+    RegionStatistic,
+    RouteMatrix,
+    Statistic,
+    Weekday,
+)
+
+WEEKDAYS = [weekday.value for weekday in Weekday]
+
+# 1970-01-01, day 0 of `datetime64[D]`, is Thursday
+EPOCH_WEEKDAY = 3
+
+
+@dataclass
+class StatisticAccumulator:
+    """
+    Sums and counters of flights, from which `Statistic` is built.
+
+    Groups of flights can be added in any order.
+    """
+    total_count_flights: int = 0
+    total_duration: float = 0
+    count_durations: int = 0
+    flights_by_date: Counter = field(default_factory=Counter)
+    flights_by_duration: Counter = field(default_factory=Counter)
+    flights_by_type: Counter = field(default_factory=Counter)
+    null_features: Counter = field(default_factory=Counter)
+
+    def add_group(self, group: Mapping[str, Any]) -> None:
+        """
+        Adds group of flights aggregated by `FlightDailyStatsRepository.get_statistic`.
+        """
+        self.total_count_flights += group["flights"]
+        self.total_duration += float(group["duration_total"] or 0)
+        self.count_durations += group["duration_count"]
+        for index, (label, _) in enumerate(DURATION_BINS):
+            self.flights_by_duration[label] += group[f"duration__{index}"]
+
+        if group["departure_date"]:
+            self.flights_by_date[group["departure_date"]] += group["flights"]
+        if group["type_aircraft"]:
+            self.flights_by_type[group["type_aircraft"]] += group["flights"]
+        for label, column in NULL_FEATURES.items():
+            self.null_features[label] += group[f"null__{column}"]
+
+    def to_statistic(self, linear_step: str) -> Statistic:
+        mean_duration = self.total_duration / self.count_durations if self.count_durations else 0
+
+        dates = np.array(list(self.flights_by_date), dtype="datetime64[D]")
+        counts = np.array(list(self.flights_by_date.values()), dtype=np.int64)
+        weekday_counts = np.bincount((dates.astype(np.int64) + EPOCH_WEEKDAY) % 7, weights=counts, minlength=7)
+        time_counts = count_by_time_key(dates, counts, linear_step)
+
+        return Statistic(
+            total_count_flights=self.total_count_flights,
+            total_duration=round(self.total_duration),
+            mean_duration=round(mean_duration),
+            count_flights_per_weekday=[{day: int(weekday_counts[i])} for i, day in enumerate(WEEKDAYS)],
+            distribution_by_flight_duration=[
+                {label: self.flights_by_duration[label]} if self.flights_by_duration[label] else {}
+                for label, _ in DURATION_BINS
+            ],
+            distribution_by_type={
+                type_aircraft: count for type_aircraft, count in sorted(self.flights_by_type.items()) if count
+            },
+            distribution_null_features={
+                label: self.null_features[label] for label in NULL_FEATURES if self.null_features[label]
+            },
+            count_flights_by_month=[{k: v} for k, v in sorted(time_counts.items())],
+        )
+
+
+def format_statistic(groups: Iterable[Mapping[str, Any]], linear_step: str) -> Statistic:
+    """
+    Builds statistic from groups of flights aggregated in the database.
+    """
+    accumulator = StatisticAccumulator()
+    for group in groups:
+        accumulator.add_group(group)
+    return accumulator.to_statistic(linear_step)
+
+
+def format_region_statistic(groups: Iterable[Mapping[str, Any]], regions: Iterable[str]) -> list[RegionStatistic]:
+    """
+    Builds statistic of every region from groups of flights between pairs of regions
+    (see `FlightDailyStatsRepository.get_region_statistic`).
+
+    All `regions` are in the result, the ones without flights too; a flight inside
+    of one region is counted once in its total.
+    """
+    counters = {region: Counter() for region in regions}
+    for group in groups:
+        departure, arrival = group["reg_departure"], group["reg_arrival"]
+        if departure:
+            counters.setdefault(departure, Counter())["departure_count"] += group["flights"]
+        if arrival:
+            counters.setdefault(arrival, Counter())["arrival_count"] += group["flights"]
+        for region in {departure, arrival} - {None, ""}:
+            counter = counters[region]
+            counter["total_count"] += group["flights"]
+            counter["duration_total"] += float(group["duration_total"] or 0)
+            counter["duration_count"] += group["duration_count"]
+
+    return [
+        RegionStatistic(
+            region=region,
+            departure_count=counter["departure_count"],
+            arrival_count=counter["arrival_count"],
+            total_count=counter["total_count"],
+            mean_duration=round(counter["duration_total"] / counter["duration_count"])
+            if counter["duration_count"] else 0,
+        )
+        for region, counter in sorted(counters.items())
+    ]
+
+
+def format_routes(groups: Iterable[Mapping[str, Any]]) -> RouteMatrix:
+    """
+    Builds route matrix from groups of flights between pairs of regions
+    (see `FlightDailyStatsRepository.get_routes`), in the order of groups.
+    """
+    matrix = RouteMatrix(departure=[], arrival=[], count_flights=[], mean_duration=[])
+    for group in groups:
+        matrix.departure.append(group["reg_departure"])
+        matrix.arrival.append(group["reg_arrival"])
+        matrix.count_flights.append(group["flights"])
+        matrix.mean_duration.append(
+            round(float(group["duration_total"]) / group["duration_count"]) if group["duration_count"] else 0,
+        )
+    return matrix
+
+
+def format_heatmap(groups: list[Mapping[str, Any]], cells_per_bin: int) -> HeatmapGrid:
+    """
+    Builds heatmap from counts of flights in bins of grid (see `FlightRepository.get_heatmap`).
+    """
+    resolution = cells_per_bin / GRID_CELLS_PER_DEGREE
+    lat_bin = np.array([group["lat_bin"] for group in groups], dtype=np.int64)
+    lon_bin = np.array([group["lon_bin"] for group in groups], dtype=np.int64)
+    return HeatmapGrid(
+        resolution=resolution,
+        latitude=np.round((lat_bin + 0.5) * resolution - 90, 8).tolist(),
+        longitude=np.round((lon_bin + 0.5) * resolution - 180, 8).tolist(),
+        count_flights=[group["flights"] for group in groups],
+    )
+
+
+def count_by_time_key(dates: np.ndarray, counts: np.ndarray, granularity: str) -> dict[str, int]:
+    """
+    Sums counts of dates by keys of `get_time_key`.
+
+    Keys are computed as integers from days since epoch,
+    so `get_time_key` is called only once for each distinct key.
+    """
+    days = dates.astype(np.int64)
+    year = dates.astype("datetime64[Y]").astype(np.int64)
+    if granularity == 'day':
+        codes = days
+    elif granularity == 'week':
+        # number of week like `%W`: days before the first Monday of year are in week 0
+        day_of_year = (dates - dates.astype("datetime64[Y]")).astype(np.int64)
+        weekday = (days + EPOCH_WEEKDAY) % 7
+        codes = year * 100 + (day_of_year + 7 - weekday) // 7
+    elif granularity == 'month':
+        codes = dates.astype("datetime64[M]").astype(np.int64)
+    elif granularity == 'year':
+        codes = year
+    else:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    sums = np.bincount(inverse, weights=counts, minlength=len(first))
+    return {
+        get_time_key(date, granularity): int(total)
+        for date, total in zip(dates[first].tolist(), sums.tolist())
+    }
+
+
+def get_time_key(date: datetime.date, granularity: str) -> str:
+    if granularity == 'day':
+        return date.strftime("%d.%m.%Y")
+    elif granularity == 'week':
+        return date.strftime("%Y-W%W")
+    elif granularity == 'month':
+        return date.strftime("%m.%Y")
+    elif granularity == 'year':
+        return date.strftime("%Y")
+    else:
+        raise ValueError(f"Unsupported granularity: {granularity}")
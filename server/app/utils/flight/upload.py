@@ -0,0 +1,300 @@
+import asyncio
+import os
+import shutil
+import zipfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import PurePosixPath
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import AsyncIterator, BinaryIO, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.db.connection import SessionManager
+from app.db.models import UploadJob
+from app.db.repository import FlightRepository, UploadJobRepository
+from app.schemas.flights import UploadBatchSchema, UploadJobSchema, UploadJobStatus
+from app.utils.executor import ingest_executor
+
+from .business_logic import (
+    FLIGHT_ROW_COLUMNS,
+    build_flight_rows,
+    decode_dataframe,
+    geocode_dataframe,
+    read_excel_chunks,
+)
+from .region_cells import region_cells
+
+UPLOAD_HEARTBEAT_SECONDS = get_settings().UPLOAD_HEARTBEAT_SECONDS
+UPLOAD_ARCHIVE_MAX_FILES = get_settings().UPLOAD_ARCHIVE_MAX_FILES
+UPLOAD_ARCHIVE_MAX_SIZE = get_settings().UPLOAD_ARCHIVE_MAX_SIZE
+UPLOAD_ARCHIVE_MAX_RATIO = get_settings().UPLOAD_ARCHIVE_MAX_RATIO
+
+# watchers of unfinished jobs of this worker by database (they are not garbage collected, while they are here)
+# and tasks, which mark these jobs alive, see `_beat_upload_jobs`
+_running_jobs: dict[str, dict[UUID, asyncio.Task]] = {}
+_heartbeats: dict[str, asyncio.Task] = {}
+
+
+def save_upload(file: BinaryIO) -> str:
+    """
+    Copies uploaded file to `UPLOAD_DIR`, so it outlives the request.
+    """
+    with NamedTemporaryFile(dir=get_settings().UPLOAD_DIR, suffix=".xlsx", delete=False) as saved:
+        shutil.copyfileobj(file, saved)
+    return saved.name
+
+
+def file_extension(filename: str) -> str:
+    """
+    Extension of uploaded file in lower case, like `.xlsx`.
+    """
+    return PurePosixPath(filename).suffix.lower()
+
+
+def save_archive(file: BinaryIO, filename: str) -> list[tuple[str, str]]:
+    """
+    Copies `.xlsx` files of uploaded ZIP archive to `UPLOAD_DIR`, every file is ingested by its own job.
+
+    Returns names of files, `<archive>/<member>`, and paths of saved files. Directories,
+    service files of macOS and lock files of Excel are skipped. Names of members without
+    the UTF-8 flag are decoded as cp866, like Windows archivers write Russian names.
+
+    Raises `ValueError` before anything is extracted, if the archive has more files than
+    `UPLOAD_ARCHIVE_MAX_FILES`, they are larger than `UPLOAD_ARCHIVE_MAX_SIZE` in total or
+    a file is compressed more than `UPLOAD_ARCHIVE_MAX_RATIO` times. Sizes are taken from the archive,
+    and `zipfile` doesn't extract more than them, so a forged size doesn't bypass the limits.
+    """
+    saved = []
+    try:
+        with zipfile.ZipFile(file, metadata_encoding="cp866") as archive:
+            members = []
+            for member in archive.infolist():
+                name = PurePosixPath(member.filename)
+                if (
+                    member.is_dir()
+                    or file_extension(name.name) != ".xlsx"
+                    or "__MACOSX" in name.parts
+                    or name.name.startswith((".", "~$"))
+                ):
+                    continue
+                if member.file_size > UPLOAD_ARCHIVE_MAX_RATIO * max(member.compress_size, 1):
+                    raise ValueError(f"File of archive is compressed too much: {member.filename}")
+                members.append(member)
+            if len(members) > UPLOAD_ARCHIVE_MAX_FILES:
+                raise ValueError(f"Archive has more than {UPLOAD_ARCHIVE_MAX_FILES} xlsx files")
+            if sum(member.file_size for member in members) > UPLOAD_ARCHIVE_MAX_SIZE:
+                raise ValueError(f"Files of archive are larger than {UPLOAD_ARCHIVE_MAX_SIZE} bytes")
+
+            for member in members:
+                with archive.open(member) as content:
+                    saved.append((f"{filename}/{member.filename}", save_upload(content)))
+    except Exception:
+        for _, path in saved:
+            os.remove(path)
+        raise
+    return saved
+
+
+def summarize_batch(batch_id: UUID, jobs: Sequence[UploadJob]) -> UploadBatchSchema:
+    """
+    Summary of jobs of files uploaded together: the batch is finished, when all its files are.
+    """
+    statuses = {job.status for job in jobs}
+    if statuses == {UploadJobStatus.done.value}:
+        batch_status = UploadJobStatus.done
+    elif statuses <= {UploadJobStatus.done.value, UploadJobStatus.failed.value}:
+        batch_status = UploadJobStatus.failed
+    elif statuses == {UploadJobStatus.pending.value}:
+        batch_status = UploadJobStatus.pending
+    else:
+        batch_status = UploadJobStatus.running
+    return UploadBatchSchema(
+        id=batch_id,
+        status=batch_status,
+        rows_parsed=sum(job.rows_parsed for job in jobs),
+        rows_inserted=sum(job.rows_inserted for job in jobs),
+        rows_rejected=sum(job.rows_rejected for job in jobs),
+        created_at=min(job.created_at for job in jobs),
+        finished_at=max(job.finished_at for job in jobs) if batch_status in (
+            UploadJobStatus.done, UploadJobStatus.failed,
+        ) else None,
+        jobs=[UploadJobSchema.model_validate(job) for job in jobs],
+    )
+
+
+def start_upload_job(job_id: UUID, path: str, database_uri: str) -> None:
+    """
+    Runs ingest of saved file in the process pool and returns at once.
+    """
+    jobs = _running_jobs.setdefault(database_uri, {})
+    task = asyncio.create_task(_watch_upload_job(job_id, path, database_uri))
+    jobs[job_id] = task
+    task.add_done_callback(lambda _: jobs.pop(job_id, None))
+    if database_uri not in _heartbeats:
+        _heartbeats[database_uri] = asyncio.create_task(_beat_upload_jobs(database_uri))
+
+
+async def _beat_upload_jobs(database_uri: str) -> None:
+    """
+    Marks unfinished jobs of this worker alive every `UPLOAD_HEARTBEAT_SECONDS`, until it has none.
+
+    Jobs run inside of the web worker: when the worker is stopped or killed, its jobs
+    are not marked alive anymore, and `fail_stale_upload_jobs` fails them.
+    """
+    jobs = _running_jobs[database_uri]
+    while True:
+        await asyncio.sleep(UPLOAD_HEARTBEAT_SECONDS)
+        if not jobs:
+            # no await between the check and removal, so a new job always finds a running heartbeat or none
+            del _heartbeats[database_uri]
+            return
+        try:
+            async with _job_session(database_uri) as session:
+                await UploadJobRepository().beat(session, list(jobs))
+        except Exception:  # pylint: disable=broad-except
+            # the next beat may succeed, jobs are failed only after `UPLOAD_STALE_SECONDS`
+            continue
+
+
+async def fail_stale_upload_jobs(session: AsyncSession | None = None) -> None:
+    """
+    Fails jobs, which lost their web worker (see `_beat_upload_jobs`): on start of the application
+    with its own session and before jobs are read.
+    """
+    stale_after = timedelta(seconds=get_settings().UPLOAD_STALE_SECONDS)
+    if session is not None:
+        await UploadJobRepository().fail_stale(session, stale_after)
+        return
+    async with SessionManager().get_session_maker()() as own_session:
+        await UploadJobRepository().fail_stale(own_session, stale_after)
+
+
+async def _watch_upload_job(job_id: UUID, path: str, database_uri: str) -> None:
+    try:
+        await ingest_executor.run(
+            run_upload_job,
+            job_id,
+            path,
+            database_uri,
+            get_settings().UPLOAD_CHUNK_SIZE,
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        # the process of the job died and couldn't save the failure itself
+        async with _job_session(database_uri) as session:
+            job = await UploadJobRepository().get(session, job_id)
+            if job.finished_at is None:
+                await _finish_upload_job(session, job, exception)
+
+
+def run_upload_job(job_id: UUID, path: str, database_uri: str, chunk_size: int) -> None:
+    """
+    Entry point of ingest job in the process of the pool.
+    """
+    try:
+        asyncio.run(process_upload(job_id, path, database_uri, chunk_size))
+    finally:
+        os.remove(path)
+
+
+async def process_upload(job_id: UUID, path: str, database_uri: str, chunk_size: int) -> None:
+    """
+    Parses, geocodes and inserts flights of saved file chunk by chunk.
+
+    Counters and timings of every stage are saved to the job after each chunk,
+    so the progress can be read from any worker of the application.
+    """
+    async with _job_session(database_uri) as session:
+        job_repository = UploadJobRepository()
+        job = await job_repository.get(session, job_id)
+        job = await job_repository.update(session, db_obj=job, obj_in={"status": UploadJobStatus.running.value})
+        try:
+            with open(path, "rb") as file:
+                await _ingest(session, job, file, chunk_size)
+        except Exception as exception:  # pylint: disable=broad-except
+            await session.rollback()
+            # rollback expires the job, it can't be loaded lazily in async session
+            await session.refresh(job)
+            await _finish_upload_job(session, job, exception)
+        else:
+            await _finish_upload_job(session, job)
+
+
+async def _ingest(session: AsyncSession, job: UploadJob, file: BinaryIO, chunk_size: int) -> None:
+    job_repository = UploadJobRepository()
+    flight_repository = FlightRepository()
+    progress = {
+        "rows_parsed": 0,
+        "rows_geocoded": 0,
+        "rows_inserted": 0,
+        "rows_rejected": 0,
+        "row_errors": [],
+        "region_cache_hits": 0,
+        "region_cache_misses": 0,
+        "parse_seconds": 0.0,
+        "geocode_seconds": 0.0,
+        "insert_seconds": 0.0,
+    }
+
+    max_row_errors = get_settings().UPLOAD_MAX_ROW_ERRORS
+    chunks = read_excel_chunks(file, chunk_size)
+    while True:
+        start = perf_counter()
+        df = next(chunks, None)
+        if df is None:
+            break
+        decode_dataframe(df)
+        progress["parse_seconds"] += perf_counter() - start
+        progress["rows_parsed"] += len(df)
+
+        start = perf_counter()
+        hits, misses = region_cells.hits, region_cells.misses
+        for lons, lats in ((df["LON_DEP"], df["LAT_DEP"]), (df["LON_ARR"], df["LAT_ARR"])):
+            await region_cells.load(session, lons, lats)
+        geocode_dataframe(df, region_cells)
+        await region_cells.save(session)
+        progress["geocode_seconds"] += perf_counter() - start
+        progress["rows_geocoded"] += len(df)
+        progress["region_cache_hits"] += region_cells.hits - hits
+        progress["region_cache_misses"] += region_cells.misses - misses
+
+        start = perf_counter()
+        flights = build_flight_rows(df)
+        summary = await flight_repository.create_batch(session, objs_in=flights.rows, columns=FLIGHT_ROW_COLUMNS)
+        progress["insert_seconds"] += perf_counter() - start
+        progress["rows_inserted"] += summary.inserted
+        progress["rows_rejected"] += summary.skipped + len({error.row for error in flights.errors})
+        progress["row_errors"] = progress["row_errors"] + [
+            error._asdict() for error in flights.errors[:max(max_row_errors - len(progress["row_errors"]), 0)]
+        ]
+
+        job = await job_repository.update(session, db_obj=job, obj_in=progress)
+
+
+async def _finish_upload_job(session: AsyncSession, job: UploadJob, exception: Exception | None = None) -> None:
+    await UploadJobRepository().update(
+        session,
+        db_obj=job,
+        obj_in={
+            "status": (UploadJobStatus.failed if exception else UploadJobStatus.done).value,
+            "error": repr(exception) if exception else None,
+            "finished_at": datetime.now(timezone.utc),
+        },
+    )
+
+
+@asynccontextmanager
+async def _job_session(database_uri: str) -> AsyncIterator[AsyncSession]:
+    """
+    Session with its own engine: jobs run outside of the application and its `SessionManager`.
+    """
+    engine = create_async_engine(database_uri)
+    try:
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            yield session
+    finally:
+        await engine.dispose()
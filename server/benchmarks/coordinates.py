@@ -0,0 +1,48 @@
+"""
+Benchmark of decoding departure/arrival coordinates.
+
+Usage: python -m benchmarks.coordinates [--rows 1000000] [--scalar-rows 100000]
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from app.utils.flight.coordinates import decode_coordinates
+from tests.reference import parse_coord
+
+
+def random_coordinates(rows: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    lat = [f"{d:02d}{m:02d}{s:02d}" for d, m, s in rng.integers(0, 60, (rows, 3))]
+    lon = [f"{d:03d}{m:02d}" for d, m in rng.integers(0, 60, (rows, 2))]
+    lat_hemisphere = rng.choice(["N", "С", "S"], rows)
+    lon_hemisphere = rng.choice(["E", "В", "W"], rows)
+    return pd.Series([a + b + c + d for a, b, c, d in zip(lat, lat_hemisphere, lon, lon_hemisphere)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    coords = random_coordinates(args.rows)
+
+    start = perf_counter()
+    scalar = coords[:args.scalar_rows].apply(lambda x: pd.Series(parse_coord(x)))
+    scalar_time = perf_counter() - start
+
+    start = perf_counter()
+    lat, lon = decode_coordinates(coords)
+    vectorized_time = perf_counter() - start
+
+    assert np.array_equal(lat[:args.scalar_rows], scalar[0].to_numpy(dtype=float)), "Latitudes differ"
+    assert np.array_equal(lon[:args.scalar_rows], scalar[1].to_numpy(dtype=float)), "Longitudes differ"
+    print(f"parse_coord (apply):  {args.scalar_rows / scalar_time:12,.0f} rows/s ({args.scalar_rows} rows)")
+    print(f"decode_coordinates:   {args.rows / vectorized_time:12,.0f} rows/s ({args.rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
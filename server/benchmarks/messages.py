@@ -0,0 +1,72 @@
+"""
+Benchmark of field extraction from SHR/DEP/ARR messages.
+
+Usage: python -m benchmarks.messages [--rows 1000000]
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from app.utils.flight.messages import tokenize_messages
+from tests.reference import extract_with_regex_passes
+
+
+def flight_message(sid: int, day: int, departure_time: str, coordinate: str, zona: bool) -> tuple[str, str, str]:
+    """
+    SHR, DEP and ARR messages of one flight.
+    """
+    shr = (
+        f"(SHR-ZZZZZ\n-ZZZZ{departure_time}\n-M0000/M0005 "
+        + (f"/ZONA R0,5 {coordinate}/" if zona else "")
+        + f"\n-DEP/{coordinate} DEST/{coordinate} DOF/2502{day:02d} OPR/ООО РЕГ/0263 TYP/BLA RMK/ТЕСТ SID/{sid})"
+    )
+    dep = (
+        f"-TITLE IDEP\n-SID {sid}\n-ADD 2502{day:02d}\n-ATD {departure_time}\n"
+        f"-ADEP ZZZZ\n-ADEPZ {coordinate}"
+    )
+    arr = (
+        f"-TITLE IARR\n-SID {sid}\n-ADA 2502{day:02d}\n-ATA {departure_time}\n"
+        f"-ADARR ZZZZ\n-ADARRZ {coordinate}"
+    )
+    return shr, dep, arr
+
+
+def synthetic_messages(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sids = rng.integers(7_000_000_000, 8_000_000_000, rows)
+    days = rng.integers(1, 29, rows)
+    times = [f"{hour:02d}{minute:02d}" for hour, minute in zip(rng.integers(0, 24, rows), rng.integers(0, 60, rows))]
+    coordinates = [
+        f"{lat:04d}N{lon:05d}E" for lat, lon in zip(rng.integers(4100, 8200, rows), rng.integers(2000, 18000, rows))
+    ]
+    with_zona = rng.random(rows) < 0.5
+
+    messages = map(flight_message, sids, days, times, coordinates, with_zona)
+    return pd.DataFrame(messages, columns=["SHR", "DEP", "ARR"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_messages(args.rows)
+
+    start = perf_counter()
+    expected = extract_with_regex_passes(df)
+    passes_time = perf_counter() - start
+
+    start = perf_counter()
+    fields = tokenize_messages(df)
+    tokenizer_time = perf_counter() - start
+
+    assert fields["sid"].astype(str).tolist() == expected["sid"].tolist(), "Results differ"
+    assert fields["zona"].tolist() == expected["zona"].tolist(), "Results differ"
+    print(f"regex passes:  {passes_time:8.2f} s, {args.rows / passes_time:12,.0f} rows/s")
+    print(f"tokenizer:     {tokenizer_time:8.2f} s, {args.rows / tokenizer_time:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
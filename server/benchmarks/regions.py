@@ -0,0 +1,73 @@
+"""
+Benchmark of region lookup for departure/arrival points.
+
+Usage: python -m benchmarks.regions [--rows 1000000] [--scalar-rows 2000]
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from app.utils.flight.regions import RegionLocator, get_region_locator, get_regions, resolve_regions
+from tests.reference import reg
+
+
+def random_points(rows: int, seed: int = 0) -> tuple[pd.Series, pd.Series]:
+    min_lon, min_lat, max_lon, max_lat = get_regions().total_bounds
+    rng = np.random.default_rng(seed)
+    lons = pd.Series(np.round(rng.uniform(min_lon, max_lon, rows), 3))
+    lats = pd.Series(np.round(rng.uniform(min_lat, max_lat, rows), 3))
+    return lons, lats
+
+
+def rtree_within(lons: pd.Series, lats: pd.Series) -> np.ndarray:
+    """
+    Points queried with predicate `within` against the spatial index of regions, without grid.
+    """
+    regions = get_regions()
+    points = shapely.points(lons.to_numpy(), lats.to_numpy())
+    point_idx, region_idx = regions.sindex.query(points, predicate="within")
+    first_region = np.full(len(lons), len(regions))
+    np.minimum.at(first_region, point_idx, region_idx)
+    return first_region
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    lons, lats = random_points(args.rows)
+    get_region_locator()
+
+    start = perf_counter()
+    scalar = [reg(lon, lat) for lon, lat in zip(lons[:args.scalar_rows], lats[:args.scalar_rows])]
+    scalar_time = perf_counter() - start
+
+    start = perf_counter()
+    rtree_within(lons, lats)
+    rtree_time = perf_counter() - start
+
+    locator = RegionLocator(get_regions().geometry.to_numpy())
+    start = perf_counter()
+    locator.locate(lons.to_numpy(), lats.to_numpy())
+    prepared_time = perf_counter() - start
+
+    locator = get_region_locator()
+    start = perf_counter()
+    batched = resolve_regions(lons, lats)
+    batched_time = perf_counter() - start
+
+    assert batched[:args.scalar_rows].tolist() == scalar, "Results of reg and resolve_regions differ"
+    print(f"reg (row by row):         {args.scalar_rows / scalar_time:12,.0f} rows/s ({args.scalar_rows} rows)")
+    print(f"R-tree, within:           {args.rows / rtree_time:12,.0f} rows/s ({args.rows} rows)")
+    print(f"bounds, prepared:         {args.rows / prepared_time:12,.0f} rows/s ({args.rows} rows)")
+    print(f"resolve_regions (grid):   {args.rows / batched_time:12,.0f} rows/s ({args.rows} rows)")
+    print(f"settled by grid:          {locator.grid_points / (locator.grid_points + locator.exact_points):12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark of a request of statistic over all flights in the database: flights loaded and counted
+in seven passes (as `format_flight_data` did before) or one by one (`expected_statistic` of tests),
+and daily counters aggregated on insert (`FlightDailyStatsRepository.get_statistic` and `format_statistic`).
+
+Flights are inserted into a temporary database, which is created and migrated like in tests.
+
+Usage: python -m benchmarks.statistic [--rows 1000000] [--repeat 3]
+"""
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+from statistics import median
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+from alembic import command
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from yarl import URL
+
+from app.config.utils import settings
+from app.db.models import Flight
+from app.db.repository import FlightDailyStatsRepository, FlightRepository
+from app.schemas.flights import DURATION_BINS, NULL_FEATURES
+from app.utils.flight import format_statistic
+from app.utils.flight.statistic import get_time_key
+from tests.reference import expected_statistic
+from tests.utils import alembic_config_from_url, tmp_database
+
+FULL_DATASET = {
+    "departure_date_from": None,
+    "departure_date_to": None,
+    "region": None,
+    "flag_full_dataset": True,
+}
+
+
+def flight_rows(rows: int, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Flights of two years with all kinds of durations and missing values, as rows of `create_batch`.
+    """
+    rng = np.random.default_rng(seed)
+    departures = [
+        datetime(2024, 1, 1) + timedelta(minutes=int(minutes)) for minutes in rng.integers(0, 730 * 24 * 60, rows)
+    ]
+    durations = rng.exponential(120, rows).round()
+    missing = rng.random((rows, 3)) < 0.1
+    types = rng.choice(["BLA", "AER", "SHAR", ""], rows)
+    coordinates = rng.choice([55.75, 37.617, 0.0], rows)
+    regions = rng.choice(["Москва", "Тверская область", ""], rows)
+    flights = []
+    for i, departure in enumerate(departures):
+        arrival = departure + timedelta(minutes=float(durations[i]))
+        flights.append({
+            "sid": i + 1,
+            "type_aircraft": str(types[i]),
+            "departure_date": departure.date(),
+            "departure_time": None if missing[i, 0] else departure.time(),
+            "reg_departure": str(regions[i]) or None,
+            "departure_latitude": None if missing[i, 1] else float(coordinates[i]),
+            "departure_longitude": None if missing[i, 1] else float(coordinates[i]),
+            "arrival_date": arrival.date(),
+            "arrival_time": None if missing[i, 2] else arrival.time(),
+        })
+    return flights
+
+
+def seven_passes(flights: list[Flight], linear_step: str) -> None:
+    """
+    Counting of the former `format_flight_data`: a pass over flights for every part of statistic.
+    """
+    durations = []
+    for flight in flights:
+        if flight.departure_date and flight.departure_time and flight.arrival_date and flight.arrival_time:
+            departure = datetime.combine(flight.departure_date, flight.departure_time)
+            arrival = datetime.combine(flight.arrival_date, flight.arrival_time)
+            if arrival < departure:
+                arrival += timedelta(days=1)
+            durations.append((arrival - departure).total_seconds() / 60)
+    Counter(flight.departure_date.weekday() for flight in flights if flight.departure_date)
+    duration_counts = Counter()
+    for duration in durations:
+        for label, limit in DURATION_BINS:
+            if duration <= limit:
+                duration_counts[label] += 1
+                break
+    Counter(flight.type_aircraft for flight in flights if flight.type_aircraft)
+    null_features = Counter()
+    for flight in flights:
+        for label, column in NULL_FEATURES.items():
+            if not getattr(flight, column):
+                null_features[label] += 1
+    Counter(get_time_key(flight.departure_date, linear_step) for flight in flights if flight.departure_date)
+
+
+async def load_flights(session: AsyncSession) -> list[Flight]:
+    return (await session.scalars(select(Flight))).all()
+
+
+async def latency(request: Callable[[], Awaitable[Any]], repeat: int) -> tuple[float, Any]:
+    """
+    Median time of the request in milliseconds and its last result.
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = await request()
+        times.append((perf_counter() - start) * 1000)
+    return median(times), result
+
+
+async def run(rows: int, repeat: int) -> None:
+    async with tmp_database(URL(settings.database_uri), "benchmark") as url:
+        command.upgrade(alembic_config_from_url(url.replace("+asyncpg", "+psycopg2")), "head")
+        engine = create_async_engine(url)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                start = perf_counter()
+                await FlightRepository().create_batch(session, objs_in=flight_rows(rows))
+                print(f"insert of {rows:,} flights: {perf_counter() - start:8.2f} s")
+
+            async def passes_request():
+                async with async_sessionmaker(engine)() as session:
+                    seven_passes(await load_flights(session), "week")
+
+            async def scalar_request():
+                async with async_sessionmaker(engine)() as session:
+                    return expected_statistic(await load_flights(session), "week")
+
+            async def daily_stats_request():
+                async with async_sessionmaker(engine)() as session:
+                    groups = await FlightDailyStatsRepository().get_statistic(session, **FULL_DATASET)
+                    return format_statistic(groups, "week")
+
+            passes_time, _ = await latency(passes_request, repeat)
+            scalar_time, expected = await latency(scalar_request, repeat)
+            daily_stats_time, statistic = await latency(daily_stats_request, repeat)
+        finally:
+            await engine.dispose()
+
+    assert statistic == expected, "Statistics differ"
+    print(f"seven passes (before):   {passes_time:10,.1f} ms/request")
+    print(f"one by one:              {scalar_time:10,.1f} ms/request")
+    print(f"daily counters:          {daily_stats_time:10,.1f} ms/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from app.db.connection import get_session
 from tests.utils import alembic_config_from_url, tmp_database
 
 pytest_plugins = [
+    "tests.fixtures.flight",
     "tests.fixtures.user",
 ]
 
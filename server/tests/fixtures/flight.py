@@ -0,0 +1,103 @@
+import io
+from datetime import date, time, timedelta
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Polygon, box
+
+
+@pytest.fixture
+def regions_sample() -> gpd.GeoDataFrame:
+    """
+    Small set of regions, including overlapping ones and a region with a hole.
+    """
+    return gpd.GeoDataFrame(
+        {
+            "name_ru": [
+                "Первый регион",
+                "Второй регион",
+                "Перекрывающий регион",
+                "Регион с дыркой",
+            ],
+        },
+        geometry=[
+            box(30, 50, 40, 60),
+            Polygon([(40, 50), (50, 50), (45, 60)]),
+            box(35, 55, 45, 65),
+            Polygon(
+                [(60, 50), (70, 50), (70, 60), (60, 60)],
+                holes=[[(63, 53), (67, 53), (67, 57), (63, 57)]],
+            ),
+        ],
+        crs="EPSG:4326",
+    )
+
+
+def flight_messages(count: int, first_sid: int = 7772251100) -> list[dict]:
+    """
+    Rows of the uploaded xlsx file with SHR/DEP/ARR messages of `count` flights.
+    """
+    rows = []
+    for i in range(count):
+        sid = first_sid + i
+        day = 1 + i % 28
+        rows.append({
+            "Центр ЕС ОрВД": "Московский",
+            "SHR": (
+                f"(SHR-ZZZZZ\n-ZZZZ0705\n-M0000/M0005 /ZONA R0,5 5540N03730E/\n-ZZZZ0900\n"
+                f"-DEP/5540N03730E DEST/5540N03730E DOF/2502{day:02d} TYP/BLA SID/{sid})"
+            ),
+            "DEP": (
+                f"-TITLE IDEP\n-SID {sid}\n-ADD 2502{day:02d}\n-ATD 07{i % 60:02d}\n"
+                f"-ADEP ZZZZ\n-ADEPZ 554000N0373000E"
+            ),
+            "ARR": (
+                f"-TITLE IARR\n-SID {sid}\n-ADA 2502{day:02d}\n-ATA 09{i % 60:02d}\n"
+                f"-ADARR ZZZZ\n-ADARRZ 5540С03730В"
+            ),
+        })
+    return rows
+
+
+def random_flights(count: int, seed: int = 0) -> list[dict]:
+    """
+    Flights with all kinds of durations and missing values.
+    """
+    rng = np.random.default_rng(seed)
+    flights = []
+    for sid in range(1, count + 1):
+        departure_date = date(2025, 1, 1) + timedelta(days=int(rng.integers(0, 60)))
+        departure_time = time(int(rng.integers(0, 24)), int(rng.integers(0, 60)))
+        arrival_date = departure_date + timedelta(days=int(rng.choice([0, 0, 0, 1, 2])))
+        arrival_time = time(int(rng.integers(0, 24)), int(rng.integers(0, 60)))
+        flights.append({
+            "sid": sid,
+            "type_aircraft": rng.choice(["BLA", "AER", "SHAR", "", None]),
+            "departure_date": departure_date if rng.random() > 0.1 else None,
+            "departure_time": departure_time if rng.random() > 0.1 else None,
+            "reg_departure": rng.choice(["Москва", "Тверская область", "", None]),
+            "departure_latitude": rng.choice([55.75, 0, None]),
+            "departure_longitude": rng.choice([37.617, 0, None]),
+            "arrival_date": arrival_date if rng.random() > 0.1 else None,
+            "arrival_time": arrival_time if rng.random() > 0.1 else None,
+            "reg_arrival": rng.choice(["Москва", None]),
+            "arrival_latitude": rng.choice([56.5, None]),
+            "arrival_longitude": rng.choice([38.25, None]),
+        })
+    return flights
+
+
+def make_xlsx(rows: list[dict]) -> bytes:
+    content = io.BytesIO()
+    pd.DataFrame(rows).to_excel(content, index=False)
+    return content.getvalue()
+
+
+@pytest.fixture
+def flights_xlsx() -> bytes:
+    """
+    Xlsx file with 5 flights in the format of the upload.
+    """
+    return make_xlsx(flight_messages(5))
@@ -0,0 +1,135 @@
+"""
+Reference implementations the optimized code is checked against in tests and benchmarks:
+straightforward row-by-row versions of what the application does in bulk.
+"""
+import re
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Point
+
+from app.schemas.flights import DURATION_BINS, NULL_FEATURES, FlightCreateModel, Statistic
+from app.utils.flight import StatisticAccumulator
+from app.utils.flight.regions import get_regions
+
+
+def parse_dms(part: str) -> float:
+    direction = part[-1].upper()
+    digits = part[:-1]
+
+    if direction in "NS":
+        deg_len = 2
+    else:
+        deg_len = 3
+
+    d = int(digits[:deg_len])
+    m = int(digits[deg_len:deg_len+2]) if len(digits) >= deg_len+2 else 0
+    s = int(digits[deg_len+2:deg_len+4]) if len(digits) >= deg_len+4 else 0
+
+    dd = d + m/60 + s/3600
+    if direction in "SW":
+        dd *= -1
+    return dd
+
+
+def parse_coord(coord: str):
+    """
+    Decodes one coordinate like `5540С03730В` or `554000N0373000E`, the expected answer of `decode_coordinates`.
+    """
+    if not isinstance(coord, str) or coord.strip() == "":
+        return None, None
+
+    match = re.match(r"(\d+[NSС])(\d+[EWВ])", coord)
+    if not match:
+        return None, None
+
+    lat_raw, lon_raw = match.groups()
+    lat_raw = lat_raw.replace("С", "N")
+    lon_raw = lon_raw.replace("В", "E")
+    return parse_dms(lat_raw), parse_dms(lon_raw)
+
+
+def reg(lon, lat, regions_gdf: gpd.GeoDataFrame | None = None):
+    """
+    Finds region for one point by scanning all polygons, the expected answer of `resolve_regions`.
+    """
+    if regions_gdf is None:
+        regions_gdf = get_regions()
+    point = Point(lon, lat)
+    region = regions_gdf[regions_gdf.contains(point)]
+    if len(region) > 0:
+        return region['name_ru'].values[0]
+    return None
+
+
+def extract_with_regex_passes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extraction with separate regex pass for every field, as it was done before tokenizer.
+    """
+    zona1 = df['SHR'].str.extract(r'/ZONA\s+([^/\s]+)')[0]
+    zona2 = df['SHR'].str.extract(r'(\d+[NSС]\d+[EWВ])')[0]
+    return pd.DataFrame({
+        "sid": df['SHR'].str.extract(r"SID/([0-9]+)")[0],
+        "type_aircraft": df['SHR'].str.extract(r"TYP/[0-9]*([a-zA-Z]+)")[0],
+        "zona": zona1.fillna(zona2),
+        "departure_date": pd.to_datetime(df['DEP'].str.extract(r"ADD\s([0-9]{6})")[0], format="%y%m%d"),
+        "departure_time": pd.to_datetime(df['DEP'].str.extract(r"ATD\s([0-9]{4})")[0], format="%H%M"),
+        "departure_coordinate": df['DEP'].str.extract(r"ADEPZ\s(\d+[NSС]\d+[EWВ])")[0],
+        "arrival_date": pd.to_datetime(df['ARR'].str.extract(r"ADA\s([0-9]{6})")[0], format="%y%m%d"),
+        "arrival_time": pd.to_datetime(df['ARR'].str.extract(r"ATA\s([0-9]{4})")[0], format="%H%M"),
+        "arrival_coordinate": df['ARR'].str.extract(r"ADARRZ\s(\d+[NSС]\d+[EWВ])")[0],
+    })
+
+
+def build_flights(df: pd.DataFrame) -> list[FlightCreateModel]:
+    """
+    Model of flight from every row of decoded and geocoded flights, made row by row,
+    which rows of `build_flight_rows` are checked against.
+    """
+    def value(row: pd.Series, column: str, digits: int | None = None):
+        if not row[column] or pd.isna(row[column]):
+            return None
+        return row[column] if digits is None else round(row[column], digits)
+
+    return [
+        FlightCreateModel(
+            sid=row["SID"],
+            type_aircraft=value(row, "TYP"),
+            departure_date=value(row, "DODEP"),
+            departure_time=value(row, "TODEP"),
+            reg_departure=value(row, "REG DEP"),
+            departure_latitude=value(row, "LAT_DEP", 3),
+            departure_longitude=value(row, "LON_DEP", 3),
+            arrival_date=value(row, "DOARR"),
+            arrival_time=value(row, "TOARR"),
+            reg_arrival=value(row, "REG ARR"),
+            arrival_latitude=value(row, "LAT_ARR", 3),
+            arrival_longitude=value(row, "LON_ARR", 3),
+        )
+        for _, row in df.iterrows()
+    ]
+
+
+def expected_statistic(flights: list, linear_step: str) -> Statistic:
+    """
+    Statistic of flights (ORM objects or alike) counted one by one,
+    which statistic from counters aggregated in the database is checked against.
+    """
+    accumulator = StatisticAccumulator()
+    for flight in flights:
+        accumulator.total_count_flights += 1
+        if flight.duration_minutes is not None:
+            accumulator.total_duration += flight.duration_minutes
+            accumulator.count_durations += 1
+            for label, limit in DURATION_BINS:
+                if flight.duration_minutes <= limit:
+                    accumulator.flights_by_duration[label] += 1
+                    break
+        if flight.departure_date:
+            accumulator.flights_by_date[flight.departure_date] += 1
+        if flight.type_aircraft:
+            accumulator.flights_by_type[flight.type_aircraft] += 1
+        for label, column in NULL_FEATURES.items():
+            if not getattr(flight, column):
+                accumulator.null_features[label] += 1
+    return accumulator.to_statistic(linear_step)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from app.utils.executor import MeteredExecutor, pool, process_executor, run_cpu_bound
+from app.utils.flight import format_routes
+
+
+def make_executor(max_concurrency: int) -> MeteredExecutor:
+    return MeteredExecutor("test", partial(ThreadPoolExecutor, max_workers=4), max_concurrency)
+
+
+class TestMeteredExecutor:
+    @pytest.mark.asyncio()
+    async def test_concurrency_limit(self):
+        executor = make_executor(max_concurrency=1)
+        release = threading.Event()
+
+        tasks = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        metrics = executor.metrics()
+        assert (metrics["running"], metrics["queued"]) == (1, 2)
+
+        release.set()
+        assert await asyncio.gather(*tasks) == [True, True, True]
+        metrics = executor.metrics()
+        assert (metrics["running"], metrics["queued"], metrics["completed"], metrics["failed"]) == (0, 0, 3, 0)
+        executor.shutdown()
+
+    @pytest.mark.asyncio()
+    async def test_failed(self):
+        executor = make_executor(max_concurrency=2)
+
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(divmod, 1, 0)
+        assert await executor.run(divmod, 7, 2) == (3, 1)
+
+        metrics = executor.metrics()
+        assert (metrics["running"], metrics["completed"], metrics["failed"]) == (0, 1, 1)
+        executor.shutdown()
+
+    def test_other_event_loop(self):
+        executor = make_executor(max_concurrency=1)
+
+        async def run_together():
+            return await asyncio.gather(*(executor.run(divmod, 7, 2) for _ in range(3)))
+
+        # calls waited on the semaphore in the first loop, the second loop gets its own semaphore
+        assert asyncio.run(run_together()) == [(3, 1)] * 3
+        assert asyncio.run(run_together()) == [(3, 1)] * 3
+        assert executor.metrics()["completed"] == 6
+        executor.shutdown()
+
+
+class TestFunctionRunCpuBound:
+    groups = [
+        {"reg_departure": "Москва", "reg_arrival": "Тверь", "flights": 3, "duration_total": 90, "duration_count": 3},
+        {"reg_departure": "Тверь", "reg_arrival": "Москва", "flights": 1, "duration_total": 0, "duration_count": 0},
+    ]
+
+    @pytest.mark.asyncio()
+    async def test_inline(self):
+        completed = process_executor.completed
+        assert await run_cpu_bound(format_routes, self.groups) == format_routes(self.groups)
+        assert process_executor.completed == completed
+
+    @pytest.mark.asyncio()
+    async def test_in_process(self, monkeypatch):
+        monkeypatch.setattr(pool, "PROCESS_MIN_ROWS", 1)
+        completed = process_executor.completed
+
+        assert await run_cpu_bound(format_routes, self.groups) == format_routes(self.groups)
+        assert process_executor.completed == completed + 1
@@ -0,0 +1,39 @@
+import json
+import shutil
+
+import shapely
+from shapely.geometry import Polygon
+
+from app.utils.flight.boundaries import simplify_regions
+from app.utils.flight.region_index import REGIONS_PATH, shapefile_digest
+
+
+class TestFunctionSimplifyRegions:
+    def test_fewer_points(self, regions_sample):
+        wavy = Polygon([(30 + i / 100, 50 + (i % 2) / 1000) for i in range(1000)] + [(40, 60), (30, 60)])
+        regions_sample.loc[0, "geometry"] = wavy
+
+        collection = json.loads(simplify_regions(0.01, regions_sample))
+
+        names = [feature["properties"]["name"] for feature in collection["features"]]
+        assert names == regions_sample["name_ru"].tolist()
+        simplified = shapely.from_geojson(json.dumps(collection["features"][0]["geometry"]))
+        assert shapely.get_num_coordinates(simplified) < 10
+        assert simplified.is_valid
+        assert abs(simplified.area - wavy.area) < 0.1
+
+    def test_holes_kept(self, regions_sample):
+        collection = json.loads(simplify_regions(0.05, regions_sample))
+        assert len(collection["features"][3]["geometry"]["coordinates"]) == 2
+
+
+class TestFunctionShapefileDigest:
+    def test_changes_with_shapefile(self, tmp_path):
+        for part in REGIONS_PATH.parent.glob(f"{REGIONS_PATH.stem}.*"):
+            shutil.copy(part, tmp_path / part.name)
+        copy = tmp_path / REGIONS_PATH.name
+        assert shapefile_digest(copy) == shapefile_digest()
+
+        dbf = copy.with_suffix(".dbf")
+        dbf.write_bytes(dbf.read_bytes() + b"\0")
+        assert shapefile_digest(copy) != shapefile_digest()
@@ -0,0 +1,113 @@
+import io
+from datetime import date, time
+
+from app.utils.flight.business_logic import (
+    FLIGHT_ROW_COLUMNS,
+    RowError,
+    build_flight_rows,
+    decode_dataframe,
+    geocode_dataframe,
+    read_excel_chunks,
+)
+from tests.fixtures.flight import flight_messages, make_xlsx
+from tests.reference import build_flights
+
+
+def parse_chunks(content: bytes, chunk_size: int = 10_000) -> list[list[dict]]:
+    """
+    Flights of every chunk of xlsx file, parsed like upload jobs parse them.
+    """
+    return [
+        [
+            dict(zip(FLIGHT_ROW_COLUMNS, row))
+            for row in build_flight_rows(geocode_dataframe(decode_dataframe(df))).rows
+        ]
+        for df in read_excel_chunks(io.BytesIO(content), chunk_size)
+    ]
+
+
+class TestFunctionParseFile:
+    def test_parse_file(self, flights_xlsx):
+        (flights,) = parse_chunks(flights_xlsx)
+
+        assert [flight["sid"] for flight in flights] == list(range(7772251100, 7772251105))
+        flight = flights[0]
+        assert flight["type_aircraft"] == "BLA"
+        assert flight["departure_date"] == date(2025, 2, 1)
+        assert flight["departure_time"] == time(7, 0)
+        assert flight["arrival_date"] == date(2025, 2, 1)
+        assert flight["arrival_time"] == time(9, 0)
+        assert (flight["departure_latitude"], flight["departure_longitude"]) == (55.667, 37.5)
+        assert (flight["arrival_latitude"], flight["arrival_longitude"]) == (55.667, 37.5)
+
+    def test_parse_chunks(self, flights_xlsx):
+        chunks = parse_chunks(flights_xlsx, chunk_size=2)
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [flight for chunk in chunks for flight in chunk] == parse_chunks(flights_xlsx)[0]
+
+    def test_parse_rows_without_messages(self):
+        rows = flight_messages(3)
+        rows[1]["DEP"] = None
+        rows[1]["ARR"] = None
+        for row in rows[2:]:
+            row["DEP"] = None
+
+        flights = [flight for chunk in parse_chunks(make_xlsx(rows), chunk_size=1) for flight in chunk]
+
+        assert len(flights) == 3
+        assert flights[1]["departure_date"] is None
+        assert flights[1]["arrival_latitude"] is None
+        assert flights[2]["departure_time"] is None
+        assert flights[2]["arrival_time"] == time(9, 2)
+
+
+def decoded_dataframe(rows: list[dict]):
+    (df,) = read_excel_chunks(io.BytesIO(make_xlsx(rows)), chunk_size=len(rows))
+    return geocode_dataframe(decode_dataframe(df))
+
+
+class TestFunctionBuildFlightRows:
+    def test_same_as_build_flights(self):
+        rows = flight_messages(20)
+        for i, row in enumerate(rows):
+            if i % 3 == 0:
+                row["DEP"] = None
+            if i % 4 == 0:
+                row["ARR"] = row["ARR"].replace("5540С03730В", f"{40 + i}00N0{30 + i}00E")
+            if i % 5 == 0:
+                row["ARR"] = row["ARR"].replace("-ADARRZ", "-ADARR")
+        df = decoded_dataframe(rows)
+
+        flights = build_flight_rows(df)
+
+        assert flights.errors == []
+        expected = [tuple(flight.model_dump().values()) for flight in build_flights(df)]
+        assert flights.rows == expected
+        assert tuple(build_flights(df)[0].model_dump()) == FLIGHT_ROW_COLUMNS
+
+    def test_invalid_rows(self):
+        rows = flight_messages(5)
+        rows[1]["SHR"] = rows[1]["SHR"].replace("SID/", "")
+        rows[2]["SHR"] = rows[2]["SHR"].replace("TYP/BLA ", "")
+        rows[3]["DEP"] = rows[3]["DEP"].replace("554000N0373000E", "954000N0373000E")
+        rows[4]["ARR"] = rows[4]["ARR"].replace("5540С03730В", "5540С19930В")
+        df = decoded_dataframe(rows)
+
+        flights = build_flight_rows(df)
+
+        assert [row[0] for row in flights.rows] == [7772251100]
+        assert flights.errors == [
+            RowError(3, "sid", "is missing"),
+            RowError(4, "type_aircraft", "is missing"),
+            RowError(5, "departure_latitude", "must be between -90 and 90"),
+            RowError(6, "arrival_longitude", "must be between -180 and 180"),
+        ]
+
+    def test_sid_less_than_one(self):
+        df = decoded_dataframe(flight_messages(2, first_sid=0))
+
+        flights = build_flight_rows(df)
+
+        assert [row[0] for row in flights.rows] == [1]
+        assert flights.errors == [RowError(2, "sid", "must be at least 1")]
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.utils.flight import LRUCache, SingleFlight, cached_by_dataset_version, is_not_modified
+from app.utils.flight import cache as flight_cache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class TestFunctionLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_expires(self):
+        timer = FakeTimer()
+        cache = LRUCache(maxsize=2, ttl=60, timer=timer)
+        cache.set("a", 1)
+
+        timer.now = 60
+        assert cache.get("a") == 1
+        timer.now = 61
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestFunctionSingleFlight:
+    @pytest.mark.asyncio()
+    async def test_coalesces_concurrent_calls(self):
+        flights = SingleFlight(maxsize=10)
+        calls = []
+
+        async def call(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value
+
+        results = await asyncio.gather(
+            *(flights.do("a", lambda: call(1)) for _ in range(3)),
+            flights.do("b", lambda: call(2)),
+        )
+
+        assert results == [1, 1, 1, 2]
+        assert calls == [1, 2]
+        assert dict(flights.coalesced) == {"a": 2}
+        assert flights.metrics() == {"running": 0, "coalesced": [{"key": "'a'", "count": 2}]}
+
+        assert await flights.do("a", lambda: call(3)) == 3
+        assert calls == [1, 2, 3]
+
+    @pytest.mark.asyncio()
+    async def test_shares_exception(self):
+        flights = SingleFlight(maxsize=10)
+        calls = []
+
+        async def call():
+            calls.append(None)
+            await asyncio.sleep(0.05)
+            raise ValueError
+
+        results = await asyncio.gather(flights.do("a", call), flights.do("a", call), return_exceptions=True)
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio()
+    async def test_cancelled_caller(self):
+        flights = SingleFlight(maxsize=10)
+
+        async def call():
+            await asyncio.sleep(0.05)
+            return 1
+
+        first = asyncio.create_task(flights.do("a", call))
+        second = asyncio.create_task(flights.do("a", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 1
+        assert first.cancelled()
+
+    @pytest.mark.asyncio()
+    async def test_forgets_old_keys(self):
+        flights = SingleFlight(maxsize=2)
+
+        async def call():
+            await asyncio.sleep(0.01)
+
+        for key in "abc":
+            await asyncio.gather(flights.do(key, call), flights.do(key, call))
+        assert list(flights.coalesced) == ["b", "c"]
+
+
+class TestFunctionCachedByDatasetVersion:
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_build_has_own_session(self, engine, monkeypatch):
+        monkeypatch.setattr(flight_cache, "statistic_cache", LRUCache(maxsize=10, ttl=60))
+        monkeypatch.setattr(flight_cache, "statistic_flights", SingleFlight(maxsize=10))
+        session_maker = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        sessions = []
+
+        async def build(session):
+            sessions.append(session)
+            await asyncio.sleep(0.2)
+            return await session.scalar(text("SELECT 1"))
+
+        async def get_value(session):
+            return await cached_by_dataset_version(make_request(), Response(), session, ("key",), build)
+
+        async with session_maker() as first, session_maker() as second:
+            first_request = asyncio.create_task(get_value(first))
+            second_request = asyncio.create_task(get_value(second))
+            while not sessions:
+                await asyncio.sleep(0.01)
+            # the request, which started the build, ends before it
+            first_request.cancel()
+            await first.close()
+
+            assert await second_request == 1
+            assert len(sessions) == 1
+            assert sessions[0] not in (first, second)
+
+
+class TestFunctionIsNotModified:
+    last_modified = datetime(2025, 3, 1, 12, 30, 15, 500, tzinfo=timezone.utc)
+
+    def test_if_none_match(self):
+        assert is_not_modified(make_request(If_None_Match='"x", "abc"'), '"abc"', self.last_modified)
+        assert is_not_modified(make_request(If_None_Match='W/"abc"'), '"abc"', self.last_modified)
+        assert is_not_modified(make_request(If_None_Match="*"), '"abc"', self.last_modified)
+        assert not is_not_modified(make_request(If_None_Match='"x"'), '"abc"', self.last_modified)
+
+    def test_if_modified_since(self):
+        etag = '"abc"'
+        assert is_not_modified(
+            make_request(If_Modified_Since="Sat, 01 Mar 2025 12:30:15 GMT"), etag, self.last_modified,
+        )
+        assert not is_not_modified(
+            make_request(If_Modified_Since="Sat, 01 Mar 2025 12:30:14 GMT"), etag, self.last_modified,
+        )
+        assert not is_not_modified(make_request(If_Modified_Since="yesterday"), etag, self.last_modified)
+        assert not is_not_modified(make_request(), etag, self.last_modified)
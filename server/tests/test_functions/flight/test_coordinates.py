@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.utils.flight.coordinates import decode_coordinates
+from tests.reference import parse_coord
+
+coordinates = st.from_regex(r"\A\d{1,9}[NSС]\d{1,9}[EWВ]", fullmatch=False)
+ascii_coordinates = st.from_regex(r"\A[0-9]{1,9}[NSС][0-9]{1,9}[EWВ]\Z")
+noise = st.text(alphabet="0123456789NSEWСВ /-Z٠", max_size=20)
+cells = st.one_of(coordinates, ascii_coordinates, noise, st.none(), st.floats(), st.integers())
+
+
+def decode_one_by_one(values: list) -> tuple[list, list]:
+    decoded = [parse_coord(value) for value in values]
+    return (
+        [np.nan if lat is None else lat for lat, _ in decoded],
+        [np.nan if lon is None else lon for _, lon in decoded],
+    )
+
+
+class TestFunctionDecodeCoordinates:
+    @settings(max_examples=300, deadline=None)
+    @given(st.lists(cells, max_size=50))
+    def test_same_as_parse_coord(self, values):
+        lat, lon = decode_coordinates(values)
+
+        expected_lat, expected_lon = decode_one_by_one(values)
+        np.testing.assert_array_equal(lat, expected_lat)
+        np.testing.assert_array_equal(lon, expected_lon)
+
+    @pytest.mark.parametrize(
+        "coord, expected",
+        [
+            ("554000N0373000E", (55 + 40/60, 37 + 30/60)),
+            ("5540С03730В", (55 + 40/60, 37 + 30/60)),
+            ("554012S0373015W", (-(55 + 40/60 + 12/3600), -(37 + 30/60 + 15/3600))),
+            ("55N037E/ZONA", (55.0, 37.0)),
+            ("5N3E", (5.0, 3.0)),
+            ("٥٥٤٠N٠٣٧٣٠E", (55 + 40/60, 37 + 30/60)),
+            (" 5540N03730E", (np.nan, np.nan)),
+            ("5540N", (np.nan, np.nan)),
+            ("N03730E", (np.nan, np.nan)),
+            ("", (np.nan, np.nan)),
+            (None, (np.nan, np.nan)),
+        ],
+    )
+    def test_values(self, coord, expected):
+        lat, lon = decode_coordinates([coord])
+        np.testing.assert_array_equal([lat[0], lon[0]], expected)
+
+    def test_long_values(self):
+        coord = "5540N03730E" + "0" * 100
+        lat, lon = decode_coordinates([coord, "5540С03730В"])
+        np.testing.assert_array_equal(lat, [55 + 40/60, 55 + 40/60])
+        np.testing.assert_array_equal(lon, [37 + 30/60, 37 + 30/60])
+
+    def test_empty(self):
+        lat, lon = decode_coordinates([])
+        assert lat.shape == lon.shape == (0,)
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import date, datetime, time
+
+import pytest
+from alembic import command
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Flight
+from app.db.repository import FlightRepository
+from app.schemas.flights import FlightCreateModel
+from tests.fixtures.flight import random_flights
+
+
+def flight_sample(sid: int) -> FlightCreateModel:
+    return FlightCreateModel(
+        sid=sid,
+        type_aircraft="BLA",
+        departure_date=date(2025, 2, 1),
+        departure_time=time(7, 30),
+        reg_departure="Москва",
+        departure_latitude=55.667,
+        departure_longitude=37.5,
+        arrival_date=date(2025, 2, 1),
+        arrival_time=time(9, 0),
+        reg_arrival=None,
+        arrival_latitude=None,
+        arrival_longitude=None,
+    )
+
+
+class TestFunctionFlightDatabase:
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_create_batch(self, db_session):
+        summary = await FlightRepository().create_batch(
+            db_session,
+            objs_in=[flight_sample(sid) for sid in range(1, 8)],
+            chunk_size=3,
+        )
+        assert (summary.inserted, summary.skipped) == (7, 0)
+
+        flight = await db_session.scalar(select(Flight).where(Flight.sid == 5))
+        assert flight.departure_date == date(2025, 2, 1)
+        assert flight.departure_time == time(7, 30)
+        assert float(flight.departure_latitude) == 55.667
+        assert flight.reg_arrival is None
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_create_batch_skips_duplicates(self, db_session):
+        flight_repository = FlightRepository()
+        await flight_repository.create_batch(db_session, objs_in=[flight_sample(1), flight_sample(2)])
+
+        summary = await flight_repository.create_batch(
+            db_session,
+            objs_in=[flight_sample(2), flight_sample(3), flight_sample(3), flight_sample(1)],
+            chunk_size=2,
+        )
+        assert (summary.inserted, summary.skipped) == (1, 3)
+
+        sids = await db_session.scalars(select(Flight.sid).order_by(Flight.sid))
+        assert sids.all() == [1, 2, 3]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_partitions(self, db_session):
+        flights = [flight_sample(sid) for sid in range(1, 4)]
+        flights[1].departure_date = date(2025, 3, 31)
+        flights[2].departure_date = None
+        await FlightRepository().create_batch(db_session, objs_in=flights)
+
+        partitions = await db_session.execute(
+            text("SELECT sid, tableoid::regclass::text FROM flights ORDER BY sid"),
+        )
+        assert partitions.all() == [(1, "flights_2025_02"), (2, "flights_2025_03"), (3, "flights_default")]
+
+        plan = await db_session.scalars(
+            text("EXPLAIN SELECT * FROM flights WHERE departure_date BETWEEN '2025-03-01' AND '2025-03-15'"),
+        )
+        plan = "\n".join(plan.all())
+        assert "flights_2025_03" in plan
+        assert "flights_2025_02" not in plan and "flights_default" not in plan
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_concurrent_partitions(self, engine, db_session):
+        months = [date(2025, month, 1) for month in range(1, 7)]
+        flights = [flight_sample(sid) for sid in range(1, 601)]
+        for flight in flights:
+            flight.departure_date = months[flight.sid % len(months)]
+            flight.reg_departure = f"Регион {flight.sid % 7}"
+
+        # both uploads create the same partitions and regions and share half of flights
+        session_maker = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with session_maker() as first, session_maker() as second:
+            summaries = await asyncio.gather(
+                FlightRepository().create_batch(first, objs_in=flights[:400], chunk_size=50),
+                FlightRepository().create_batch(second, objs_in=flights[:199:-1], chunk_size=50),
+            )
+        assert sum(summary.inserted for summary in summaries) == 600
+        assert sum(summary.skipped for summary in summaries) == 200
+
+        partitions = await db_session.execute(
+            text("SELECT tableoid::regclass::text, count(*) FROM flights GROUP BY 1 ORDER BY 1"),
+        )
+        assert partitions.all() == [(f"flights_2025_{month:02}", 100) for month in range(1, 7)]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_partitions_migration(self, db_session, alembic_config):
+        await db_session.commit()
+        command.downgrade(alembic_config, "deda52f121ce")
+        flights = [flight_sample(sid).model_dump() for sid in range(1, 4)]
+        flights[1]["departure_date"] = date(2024, 12, 31)
+        flights[2]["departure_date"] = None
+        await db_session.execute(
+            text(
+                "INSERT INTO flights (sid, type_aircraft, departure_date) "
+                "VALUES (:sid, :type_aircraft, :departure_date)",
+            ),
+            flights,
+        )
+        await db_session.commit()
+
+        command.upgrade(alembic_config, "head")
+
+        partitions = await db_session.execute(
+            text("SELECT sid, tableoid::regclass::text FROM flights ORDER BY sid"),
+        )
+        assert partitions.all() == [(1, "flights_2025_02"), (2, "flights_2024_12"), (3, "flights_default")]
+        summary = await FlightRepository().create_batch(db_session, objs_in=[flight_sample(2), flight_sample(4)])
+        assert (summary.inserted, summary.skipped) == (1, 1)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_flight_times(self, db_session):
+        flights = [flight_sample(sid) for sid in range(1, 4)]
+        flights[1].arrival_time = time(0, 15)
+        flights[2].arrival_date = None
+        await FlightRepository().create_batch(db_session, objs_in=flights)
+
+        times = await db_session.execute(
+            select(Flight.departure_at, Flight.arrival_at, Flight.duration_minutes).order_by(Flight.sid),
+        )
+        assert times.all() == [
+            (datetime(2025, 2, 1, 7, 30), datetime(2025, 2, 1, 9, 0), 90),
+            (datetime(2025, 2, 1, 7, 30), datetime(2025, 2, 2, 0, 15), 16 * 60 + 45),
+            (datetime(2025, 2, 1, 7, 30), None, None),
+        ]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_flight_times_backfill(self, db_session, alembic_config):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        query = select(Flight.sid, Flight.departure_at, Flight.arrival_at, Flight.duration_minutes).order_by(Flight.sid)
+        expected = (await db_session.execute(query)).all()
+        await db_session.commit()
+
+        command.downgrade(alembic_config, "eec9c7cea4b6")
+        command.upgrade(alembic_config, "head")
+
+        assert (await db_session.execute(query)).all() == expected
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from app.utils.flight.messages import MIDNIGHT, tokenize_messages
+from tests.fixtures.flight import flight_messages
+from tests.reference import extract_with_regex_passes
+
+
+class TestFunctionTokenizeMessages:
+    @pytest.mark.parametrize(
+        "row",
+        [
+            {"SHR": "(SHR-ZZZZZ -DEP/5957N02905E DEST/5957N02905E TYP/2BLA SID/123)", "DEP": None, "ARR": None},
+            {"SHR": "(SHR-ZZZZZ TYP/BLA\n-M0000/M0005 /ZONA MR010,5957N02905E/ SID/5 SID/6)", "DEP": "", "ARR": ""},
+            {"SHR": "TYP/1 TYP/UAV 4408N04308E 4409N04309E", "DEP": "-ADD 250101 -ADD 250102", "ARR": "-ATA 1200"},
+            {"SHR": None, "DEP": "-ADEPZ 440846С0430829В -ATD 2359", "ARR": "-ADARRZ 44S043W -ADA 251231"},
+            {"SHR": 12345, "DEP": "-ADEPZ 4408N -ADEPZ 4408N04308E", "ARR": "-ADARRZ\n4408N04308E"},
+        ],
+    )
+    def test_same_as_regex_passes(self, row):
+        df = pd.DataFrame(flight_messages(3) + [row])
+
+        fields = tokenize_messages(df)
+        expected = extract_with_regex_passes(df)
+
+        assert fields["sid"].tolist() == [int(sid) if pd.notna(sid) else pd.NA for sid in expected["sid"]]
+        for column in ("type_aircraft", "zona", "departure_coordinate", "arrival_coordinate"):
+            assert fields[column].tolist() == expected[column].where(expected[column].notna(), None).tolist()
+        for column in ("departure_date", "arrival_date"):
+            pd.testing.assert_series_equal(fields[column], expected[column], check_names=False)
+        for column in ("departure_time", "arrival_time"):
+            pd.testing.assert_series_equal(MIDNIGHT + fields[column], expected[column], check_names=False)
+
+    def test_types(self):
+        fields = tokenize_messages(pd.DataFrame(flight_messages(2)))
+
+        assert fields.dtypes.to_dict() == {
+            "sid": "Int64",
+            "type_aircraft": object,
+            "zona": object,
+            "departure_date": "datetime64[ns]",
+            "departure_time": "timedelta64[ns]",
+            "departure_coordinate": object,
+            "arrival_date": "datetime64[ns]",
+            "arrival_time": "timedelta64[ns]",
+            "arrival_coordinate": object,
+        }
+        assert fields.iloc[1].to_dict() == {
+            "sid": 7772251101,
+            "type_aircraft": "BLA",
+            "zona": "R0,5",
+            "departure_date": pd.Timestamp("2025-02-02"),
+            "departure_time": pd.Timedelta(hours=7, minutes=1),
+            "departure_coordinate": "554000N0373000E",
+            "arrival_date": pd.Timestamp("2025-02-02"),
+            "arrival_time": pd.Timedelta(hours=9, minutes=1),
+            "arrival_coordinate": "5540С03730В",
+        }
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.flight.region_cells import BOUNDARY, RegionCells
+from app.utils.flight.regions import resolve_regions
+
+
+def random_points(count: int, seed: int = 42) -> tuple[pd.Series, pd.Series]:
+    """
+    Points around few sites, like launch sites of drones, and points on boundaries of regions.
+    """
+    rng = np.random.default_rng(seed)
+    sites = np.column_stack([rng.uniform(25, 75, 20), rng.uniform(45, 70, 20)])
+    points = sites[rng.integers(0, len(sites), count)] + rng.normal(0, 0.002, (count, 2))
+    points[::10] = np.round(points[::10])
+    points[5::10, 0] = 40.0
+    return pd.Series(points[:, 0]), pd.Series(points[:, 1])
+
+
+class TestFunctionRegionCells:
+    def test_same_as_resolve_regions(self, regions_sample):
+        cells = RegionCells(maxsize=10000, regions_gdf=regions_sample, shapefile="test")
+        lons, lats = random_points(2000)
+        lons[3] = np.nan
+
+        for _ in range(2):
+            regions = cells.resolve(lons, lats)
+            assert regions.tolist() == resolve_regions(lons, lats, regions_sample).tolist()
+        assert BOUNDARY in cells.new_cells.values()
+
+    def test_counters(self, regions_sample):
+        cells = RegionCells(maxsize=10000, regions_gdf=regions_sample, shapefile="test")
+        lons, lats = pd.Series([35.0001, 35.0002, 35.0003, 50.0]), pd.Series([52.0, 52.0, 52.0, 50.0005])
+
+        cells.resolve(lons, lats)
+        assert (cells.hits, cells.misses) == (0, 4)
+        cells.resolve(lons, lats)
+        # the last point is on the boundary of the second region, so it is tested again
+        assert (cells.hits, cells.misses) == (3, 5)
+
+    def test_bounded(self, regions_sample):
+        cells = RegionCells(maxsize=10, regions_gdf=regions_sample, shapefile="test")
+        lons, lats = random_points(500)
+
+        regions = cells.resolve(lons, lats)
+
+        assert len(cells) == 10
+        assert regions.tolist() == resolve_regions(lons, lats, regions_sample).tolist()
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("migrated_db")
+    async def test_saved_to_database(self, regions_sample, db_session):
+        lons, lats = random_points(500)
+        cells = RegionCells(maxsize=10000, regions_gdf=regions_sample, shapefile="test")
+        cells.resolve(lons, lats)
+        await cells.save(db_session)
+        await db_session.commit()
+        assert not cells.new_cells
+
+        other = RegionCells(maxsize=10000, regions_gdf=regions_sample, shapefile="test")
+        await other.load(db_session, lons, lats)
+        regions = other.resolve(lons, lats)
+
+        assert not other.new_cells
+        assert regions.tolist() == resolve_regions(lons, lats, regions_sample).tolist()
+
+        changed = RegionCells(maxsize=10000, regions_gdf=regions_sample, shapefile="changed")
+        await changed.load(db_session, lons, lats)
+        assert len(changed) == 0
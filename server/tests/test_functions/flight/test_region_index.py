@@ -0,0 +1,50 @@
+import shutil
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from app.utils.flight.region_index import REGIONS_PATH, load_region_index
+
+
+@pytest.fixture(name="shapefile")
+def shapefile_copy(tmp_path):
+    """
+    Copy of the shapefile of regions, which can be changed by test.
+    """
+    for part in REGIONS_PATH.parent.glob(f"{REGIONS_PATH.stem}.*"):
+        shutil.copy(part, tmp_path / part.name)
+    return tmp_path / REGIONS_PATH.name
+
+
+class TestFunctionRegionIndex:
+    def test_same_as_shapefile(self, tmp_path):
+        index = load_region_index(REGIONS_PATH, tmp_path / "index")
+
+        regions_gdf = gpd.read_file(str(REGIONS_PATH))
+        assert index.names == regions_gdf["name_ru"].tolist()
+        assert index.crs == regions_gdf.crs.to_string()
+        assert isinstance(index.bounds, np.memmap)
+        np.testing.assert_array_equal(index.bounds, shapely.bounds(regions_gdf.geometry.to_numpy()))
+        assert shapely.equals_exact(index.geometries(), regions_gdf.geometry.to_numpy(), tolerance=0).all()
+
+    def test_compiled_once(self, shapefile):
+        load_region_index(shapefile, shapefile.parent / "index")
+        load_region_index.cache_clear()
+        load_region_index(shapefile, shapefile.parent / "index")
+
+        assert len(list((shapefile.parent / "index").iterdir())) == 1
+
+    def test_compiled_again_when_shapefile_changes(self, shapefile):
+        first = load_region_index(shapefile, shapefile.parent / "index")
+
+        regions_gdf = gpd.read_file(str(shapefile))
+        regions_gdf.loc[0, "name_ru"] = "Новый регион"
+        regions_gdf.to_file(str(shapefile), encoding="utf-8")
+        load_region_index.cache_clear()
+        second = load_region_index(shapefile, shapefile.parent / "index")
+
+        assert len(list((shapefile.parent / "index").iterdir())) == 2
+        assert first.names[0] != "Новый регион"
+        assert second.names[0] == "Новый регион"
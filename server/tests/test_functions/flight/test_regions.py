@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import shapely
+
+from app.utils.flight.region_index import BORDER, OUTSIDE, compile_region_grid
+from app.utils.flight.regions import RegionLocator, get_region_locator, resolve_regions
+from tests.reference import reg
+
+
+class TestFunctionResolveRegions:
+    def test_same_as_reg(self, regions_sample):
+        rng = np.random.default_rng(42)
+        lons = pd.Series(np.round(rng.uniform(25, 75, 500), 3))
+        lats = pd.Series(np.round(rng.uniform(45, 70, 500), 3))
+
+        regions = resolve_regions(lons, lats, regions_sample)
+
+        expected = [reg(lon, lat, regions_sample) for lon, lat in zip(lons, lats)]
+        assert regions.tolist() == expected
+
+    def test_overlapping_regions(self, regions_sample):
+        regions = resolve_regions(
+            pd.Series([37.0, 42.0, 65.0, 61.0]),
+            pd.Series([57.0, 62.0, 55.0, 51.0]),
+            regions_sample,
+        )
+        assert regions.tolist() == [
+            "Первый регион",
+            "Перекрывающий регион",
+            None,
+            "Регион с дыркой",
+        ]
+
+    def test_missing_coordinates(self, regions_sample):
+        lons = pd.Series([None, 37.0, np.nan, 37.0], index=[10, 11, 12, 13])
+        lats = pd.Series([55.0, None, np.nan, 55.0], index=[10, 11, 12, 13])
+
+        regions = resolve_regions(lons, lats, regions_sample)
+
+        assert regions.index.tolist() == [10, 11, 12, 13]
+        assert regions.tolist() == [None, None, None, "Первый регион"]
+
+    def test_empty(self, regions_sample):
+        regions = resolve_regions(pd.Series([], dtype=float), pd.Series([], dtype=float), regions_sample)
+        assert regions.empty
+
+
+class TestRegionLocator:
+    def test_grid_same_as_reg(self, regions_sample):
+        grid, origin = compile_region_grid(regions_sample.geometry.to_numpy(), cells_per_degree=2)
+        locator = RegionLocator(regions_sample.geometry.to_numpy(), grid, origin, grid_cells_per_degree=2)
+        rng = np.random.default_rng(7)
+        x = np.concatenate([np.round(rng.uniform(20, 80, 2000), 3), [30.0, 40.0, 45.0, 63.0, 65.0, 19.0, 81.0]])
+        y = np.concatenate([np.round(rng.uniform(40, 70, 2000), 3), [55.0, 50.0, 60.0, 55.0, 55.0, 55.0, 55.0]])
+
+        regions = locator.locate(x, y)
+
+        names = regions_sample["name_ru"].tolist()
+        expected = [reg(lon, lat, regions_sample) for lon, lat in zip(x, y)]
+        assert [names[region] if region >= 0 else None for region in regions] == expected
+        assert locator.grid_points > locator.exact_points > 0
+
+    def test_index_bounds(self):
+        locator = get_region_locator()
+        assert isinstance(locator.bounds, np.memmap)
+        np.testing.assert_array_equal(locator.bounds, shapely.bounds(locator.geometries))
+
+    def test_grid(self, regions_sample):
+        grid, origin = compile_region_grid(regions_sample.geometry.to_numpy(), cells_per_degree=1)
+
+        assert origin == (30, 50)
+        assert grid.shape == (16, 41)
+        # the first region, also where the overlapping region covers it
+        assert grid[2, 2] == grid[7, 7] == 0
+        assert grid[5, 9] == BORDER
+        # the hole of the last region
+        assert grid[4, 34] == OUTSIDE
+        assert grid[1, 31] == 3
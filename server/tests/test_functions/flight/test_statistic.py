@@ -0,0 +1,178 @@
+from datetime import date, time, timedelta
+
+import numpy as np
+import pytest
+from alembic import command
+from sqlalchemy import select
+
+from app.db.models import Flight, Region
+from app.db.repository import FlightDailyStatsRepository, FlightRepository, RegionRepository
+from app.db.repository.flight import filter_statistic
+from app.schemas.flights import Weekday
+from app.utils.flight import format_region_statistic, format_statistic
+from app.utils.flight.statistic import count_by_time_key, get_time_key
+from tests.fixtures.flight import random_flights
+from tests.reference import expected_statistic
+
+FULL_DATASET = {
+    "departure_date_from": None,
+    "departure_date_to": None,
+    "region": None,
+    "flag_full_dataset": True,
+}
+
+
+class TestFunctionFlightStatistic:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize("linear_step", ["day", "week", "month", "year"])
+    @pytest.mark.usefixtures("client")
+    async def test_same_as_flights(self, db_session, linear_step):
+        flight_repository = FlightRepository()
+        await flight_repository.create_batch(db_session, objs_in=random_flights(500))
+        filters = {
+            "departure_date_from": date(2025, 1, 10),
+            "departure_date_to": date(2025, 2, 10),
+            "region": "моск",
+            "flag_full_dataset": False,
+        }
+
+        daily_groups = await FlightDailyStatsRepository().get_statistic(db_session, **filters)
+
+        query = filter_statistic(
+            select(Flight),
+            Flight,
+            departure_date_from=filters["departure_date_from"],
+            departure_date_to=filters["departure_date_to"],
+            region_ids=await RegionRepository().find_ids(db_session, filters["region"]),
+            flag_full_dataset=False,
+        )
+        flights = (await db_session.scalars(query)).all()
+        assert sum(group["flights"] for group in daily_groups) == len(flights)
+        assert format_statistic(daily_groups, linear_step) == expected_statistic(flights, linear_step)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_daily_stats_skip_duplicates(self, db_session):
+        flight_repository = FlightRepository()
+        flights = random_flights(300)
+        await flight_repository.create_batch(db_session, objs_in=flights[:200], chunk_size=70)
+        await flight_repository.create_batch(db_session, objs_in=flights[100:], chunk_size=70)
+
+        groups = await FlightDailyStatsRepository().get_statistic(db_session, **FULL_DATASET)
+        flights = (await db_session.scalars(select(Flight))).all()
+        assert sum(group["flights"] for group in groups) == 300
+        assert format_statistic(groups, "month") == expected_statistic(flights, "month")
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_daily_stats_backfill(self, db_session, alembic_config):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        expected = await FlightDailyStatsRepository().get_statistic(db_session, **FULL_DATASET)
+        await db_session.commit()
+
+        command.downgrade(alembic_config, "3fe9bcf49670")
+        command.upgrade(alembic_config, "head")
+
+        groups = await FlightDailyStatsRepository().get_statistic(db_session, **FULL_DATASET)
+        assert format_statistic(groups, "day") == format_statistic(expected, "day")
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_filter_by_region(self, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+
+        for region in ("моск", "Тверская", "ОБЛ", "нет такого"):
+            filters = {**FULL_DATASET, "region": region}
+            flights = (await db_session.scalars(select(Flight))).all()
+            expected = [
+                flight for flight in flights
+                if region.lower() in (flight.reg_departure or "").lower()
+                or region.lower() in (flight.reg_arrival or "").lower()
+            ]
+            groups = await FlightDailyStatsRepository().get_statistic(db_session, **filters)
+            assert sum(group["flights"] for group in groups) == len(expected)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_regions_backfill(self, db_session, alembic_config):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        expected = (await db_session.execute(
+            select(Flight.sid, Flight.reg_departure_id, Flight.reg_arrival_id).order_by(Flight.sid)
+        )).all()
+        await db_session.commit()
+
+        command.downgrade(alembic_config, "cbede98e9aca")
+        command.upgrade(alembic_config, "head")
+
+        flights = (await db_session.execute(
+            select(Flight.sid, Flight.reg_departure, Flight.reg_departure_id, Flight.reg_arrival_id)
+            .order_by(Flight.sid)
+        )).all()
+        regions = dict((await db_session.execute(select(Region.id, Region.name))).all())
+        assert [flight.reg_departure_id is None for flight in flights] == [
+            flight.reg_departure_id is None for flight in expected
+        ]
+        assert all(
+            regions[flight.reg_departure_id] == flight.reg_departure
+            for flight in flights if flight.reg_departure_id
+        )
+
+    @pytest.mark.asyncio()
+    @pytest.mark.usefixtures("client")
+    async def test_values(self, db_session):
+        flights = random_flights(4)
+        flights[0].update(departure_date=date(2025, 3, 3), departure_time=time(23, 50),
+                          arrival_date=date(2025, 3, 3), arrival_time=time(0, 10), type_aircraft="BLA")
+        flights[1].update(departure_date=date(2025, 3, 4), departure_time=time(10, 0),
+                          arrival_date=date(2025, 3, 4), arrival_time=time(10, 10), type_aircraft="BLA")
+        flights[2].update(departure_date=date(2025, 3, 4), departure_time=time(10, 0),
+                          arrival_date=date(2025, 3, 6), arrival_time=time(10, 0), type_aircraft="AER")
+        flights[3].update(departure_date=None, arrival_time=None, type_aircraft="")
+        await FlightRepository().create_batch(db_session, objs_in=flights)
+
+        groups = await FlightDailyStatsRepository().get_statistic(db_session, **FULL_DATASET)
+        statistic = format_statistic(groups, "day")
+
+        assert statistic.total_count_flights == 4
+        assert statistic.total_duration == 20 + 10 + 2 * 1440
+        assert statistic.mean_duration == round((20 + 10 + 2 * 1440) / 3)
+        assert statistic.distribution_by_flight_duration[0] == {"< 10 мин": 1}
+        assert statistic.distribution_by_flight_duration[1] == {"10 - 30 мин": 1}
+        assert statistic.distribution_by_flight_duration[-1] == {"24+ ч": 1}
+        assert statistic.distribution_by_type == {"AER": 1, "BLA": 2}
+        assert statistic.count_flights_per_weekday[0] == {Weekday.Monday: 1}
+        assert statistic.count_flights_per_weekday[1] == {Weekday.Tuesday: 2}
+        assert statistic.count_flights_by_month == [{"03.03.2025": 1}, {"04.03.2025": 2}]
+        assert statistic.distribution_null_features["Дата вылета"] == 1
+        assert statistic.distribution_null_features["Тип ВС"] == 1
+
+
+class TestFunctionTimeKey:
+    @pytest.mark.parametrize("linear_step", ["day", "week", "month", "year"])
+    def test_count_by_time_key(self, linear_step):
+        dates = [date(2019, 12, 20) + timedelta(days=days) for days in range(0, 2400, 3)]
+        counts = list(range(1, len(dates) + 1))
+
+        expected = {}
+        for departure_date, count in zip(dates, counts):
+            key = get_time_key(departure_date, linear_step)
+            expected[key] = expected.get(key, 0) + count
+        assert count_by_time_key(np.array(dates, dtype="datetime64[D]"), np.array(counts), linear_step) == expected
+
+
+class TestFunctionRegionStatistic:
+    def test_values(self):
+        groups = [
+            {"reg_departure": "A", "reg_arrival": "A", "flights": 2, "duration_total": 20, "duration_count": 2},
+            {"reg_departure": "A", "reg_arrival": "B", "flights": 3, "duration_total": 90, "duration_count": 1},
+            {"reg_departure": None, "reg_arrival": "B", "flights": 1, "duration_total": 0, "duration_count": 0},
+            {"reg_departure": "", "reg_arrival": None, "flights": 4, "duration_total": 40, "duration_count": 4},
+        ]
+        statistic = {item.region: item for item in format_region_statistic(groups, ["A", "B", "C"])}
+
+        assert list(statistic) == ["A", "B", "C"]
+        assert (statistic["A"].departure_count, statistic["A"].arrival_count, statistic["A"].total_count) == (5, 2, 5)
+        assert (statistic["B"].departure_count, statistic["B"].arrival_count, statistic["B"].total_count) == (0, 4, 4)
+        assert statistic["A"].mean_duration == round(110 / 3)
+        assert statistic["B"].mean_duration == 90
+        assert statistic["C"].total_count == statistic["C"].mean_duration == 0
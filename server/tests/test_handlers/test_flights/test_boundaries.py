@@ -0,0 +1,75 @@
+import pytest
+from starlette import status
+
+from app.utils.flight import region_names
+
+
+class TestRegionBoundaries:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/regions/boundaries/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client):
+        response = await client.get(url=self.get_url(), headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/geo+json"
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+        collection = response.json()
+        assert collection["type"] == "FeatureCollection"
+        assert sorted({feature["properties"]["name"] for feature in collection["features"]}) == region_names()
+
+    @pytest.mark.asyncio
+    async def test_without_gzip(self, client):
+        compressed = await client.get(url=self.get_url(), headers={"Accept-Encoding": "gzip"})
+        response = await client.get(url=self.get_url(), headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Content-Encoding" not in response.headers
+        assert response.json() == compressed.json()
+        assert response.headers["ETag"] != compressed.headers["ETag"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "accept_encoding, content_encoding",
+        [
+            ("gzip;q=0, identity", None),
+            ("br, gzip;q=0.5", "gzip"),
+            ("*;q=0.1", "gzip"),
+            ("*, gzip;q=0", None),
+            ("", None),
+        ],
+    )
+    async def test_accept_encoding(self, client, accept_encoding, content_encoding):
+        response = await client.get(url=self.get_url(), headers={"Accept-Encoding": accept_encoding})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers.get("Content-Encoding") == content_encoding
+        assert response.headers["ETag"].endswith('-gzip"') == (content_encoding == "gzip")
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client):
+        response = await client.get(url=self.get_url(), params={"detail": "low"})
+
+        response = await client.get(
+            url=self.get_url(),
+            params={"detail": "low"},
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+
+        response = await client.get(
+            url=self.get_url(),
+            params={"detail": "low"},
+            headers={"If-None-Match": response.headers["ETag"], "Accept-Encoding": "identity"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_bad_detail(self, client):
+        response = await client.get(url=self.get_url(), params={"detail": "ultra"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
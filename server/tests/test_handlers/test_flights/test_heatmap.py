@@ -0,0 +1,68 @@
+import math
+from collections import Counter
+
+import pytest
+from sqlalchemy import select
+from starlette import status
+
+from app.db.models import Flight
+from app.db.repository import FlightRepository
+from tests.fixtures.flight import random_flights
+
+
+class TestHeatmap:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/heatmap/"
+
+    @staticmethod
+    def flights_with_points(count: int) -> list[dict]:
+        flights = random_flights(count)
+        for i, flight in enumerate(flights):
+            flight["departure_latitude"] = None if i % 10 == 0 else round(-10 + i * 0.137, 6)
+            flight["departure_longitude"] = round(30 + (i % 17) * 0.29, 6)
+        return flights
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("resolution", [0.01, 0.5, 2])
+    async def test_base_scenario(self, client, db_session, resolution):
+        await FlightRepository().create_batch(db_session, objs_in=self.flights_with_points(300))
+        flights = (await db_session.scalars(select(Flight))).all()
+        expected = Counter(
+            (
+                math.floor(round((float(flight.departure_latitude) + 90) / resolution, 9)),
+                math.floor(round((float(flight.departure_longitude) + 180) / resolution, 9)),
+            )
+            for flight in flights if flight.departure_latitude is not None
+        )
+
+        response = await client.get(url=self.get_url(), params={"flag_full_dataset": True, "resolution": resolution})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"]
+        grid = response.json()
+        assert grid["resolution"] == resolution
+        cells = {
+            (round((lat + 90) / resolution - 0.5), round((lon + 180) / resolution - 0.5)): count
+            for lat, lon, count in zip(grid["latitude"], grid["longitude"], grid["count_flights"])
+        }
+        assert cells == expected
+
+    @pytest.mark.asyncio
+    async def test_arrival(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(100))
+        flights = (await db_session.scalars(select(Flight))).all()
+
+        response = await client.get(url=self.get_url(), params={"flag_full_dataset": True, "point": "arrival"})
+        assert response.status_code == status.HTTP_200_OK
+        assert sum(response.json()["count_flights"]) == sum(
+            flight.arrival_latitude is not None and flight.arrival_longitude is not None for flight in flights
+        )
+
+    @pytest.mark.asyncio
+    async def test_bad_parameters(self, client):
+        response = await client.get(url=self.get_url(), params={"resolution": 0.015})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = await client.get(url=self.get_url(), params={"resolution": 0.001})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response = await client.get(url=self.get_url(), params={"point": "zone"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
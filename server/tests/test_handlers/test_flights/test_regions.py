@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from starlette import status
+
+from app.db.models import Flight
+from app.db.repository import FlightRepository
+from app.utils.flight import region_names
+from tests.fixtures.flight import random_flights
+
+
+class TestRegionStatistic:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/regions/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        flights = (await db_session.scalars(select(Flight))).all()
+
+        response = await client.get(url=self.get_url(), params={"flag_full_dataset": True})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"]
+        result = {item["region"]: item for item in response.json()}
+        assert set(region_names()) <= set(result)
+
+        moscow = result["Москва"]
+        assert moscow["departure_count"] == sum(flight.reg_departure == "Москва" for flight in flights)
+        assert moscow["arrival_count"] == sum(flight.reg_arrival == "Москва" for flight in flights)
+        moscow_flights = [flight for flight in flights if "Москва" in (flight.reg_departure, flight.reg_arrival)]
+        assert moscow["total_count"] == len(moscow_flights)
+        durations = [flight.duration_minutes for flight in moscow_flights if flight.duration_minutes is not None]
+        assert moscow["mean_duration"] == round(sum(durations) / len(durations))
+
+    @pytest.mark.asyncio
+    async def test_date_filter(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        flights = (await db_session.scalars(select(Flight))).all()
+
+        response = await client.get(url=self.get_url(), params={"from": "2025-01-10", "to": "2025-01-20"})
+        assert response.status_code == status.HTTP_200_OK
+        result = {item["region"]: item for item in response.json()}
+        assert result["Москва"]["departure_count"] == sum(
+            flight.reg_departure == "Москва"
+            and flight.departure_date is not None
+            and date(2025, 1, 10) <= flight.departure_date <= date(2025, 1, 20)
+            for flight in flights
+        )
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(100))
+        response = await client.get(url=self.get_url())
+        etag = response.headers["ETag"]
+
+        response = await client.get(url=self.get_url(), headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(200)[100:])
+        response = await client.get(url=self.get_url(), headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_empty(self, client):
+        response = await client.get(url=self.get_url())
+        assert response.status_code == status.HTTP_200_OK
+        assert all(item["total_count"] == 0 for item in response.json())
+        assert [item["region"] for item in response.json()] == region_names()
@@ -0,0 +1,64 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import select
+from starlette import status
+
+from app.db.models import Flight
+from app.db.repository import FlightRepository
+from tests.fixtures.flight import random_flights
+
+
+class TestRoutes:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/routes/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        flights = (await db_session.scalars(select(Flight))).all()
+        routes = Counter(
+            (flight.reg_departure, flight.reg_arrival) for flight in flights
+            if flight.reg_departure and flight.reg_arrival
+        )
+
+        response = await client.get(url=self.get_url(), params={"flag_full_dataset": True})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"]
+        matrix = response.json()
+        assert set(matrix) == {"departure", "arrival", "count_flights", "mean_duration"}
+        result = dict(zip(zip(matrix["departure"], matrix["arrival"]), matrix["count_flights"]))
+        assert result == routes
+        assert matrix["count_flights"] == sorted(matrix["count_flights"], reverse=True)
+
+        durations = [
+            flight.duration_minutes for flight in flights
+            if (flight.reg_departure, flight.reg_arrival) == ("Москва", "Москва")
+            and flight.duration_minutes is not None
+        ]
+        index = list(result).index(("Москва", "Москва"))
+        assert matrix["mean_duration"][index] == round(sum(durations) / len(durations))
+
+    @pytest.mark.asyncio
+    async def test_filters(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(300))
+        flights = (await db_session.scalars(select(Flight))).all()
+
+        response = await client.get(
+            url=self.get_url(),
+            params={"flag_full_dataset": True, "type_aircraft": "BLA", "limit": 1},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        matrix = response.json()
+        routes = Counter(
+            (flight.reg_departure, flight.reg_arrival) for flight in flights
+            if flight.reg_departure and flight.reg_arrival and flight.type_aircraft == "BLA"
+        )
+        assert len(matrix["count_flights"]) == 1
+        assert matrix["count_flights"][0] == max(routes.values())
+
+    @pytest.mark.asyncio
+    async def test_bad_limit(self, client):
+        response = await client.get(url=self.get_url(), params={"limit": 0})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,70 @@
+import pytest
+from starlette import status
+
+from app.db.repository import FlightRepository
+from tests.fixtures.flight import random_flights
+
+
+class TestStatistic:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(100))
+
+        response = await client.get(url=self.get_url(), params={"flag_full_dataset": True})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_count_flights"] == 100
+        assert len(response.json()["count_flights_per_weekday"]) == 7
+        assert len(response.json()["distribution_by_flight_duration"]) == 9
+        assert response.headers["ETag"]
+        assert response.headers["Last-Modified"]
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client, db_session):
+        await FlightRepository().create_batch(db_session, objs_in=random_flights(100))
+        params = {"flag_full_dataset": True}
+        response = await client.get(url=self.get_url(), params=params)
+
+        etag = response.headers["ETag"]
+        response = await client.get(url=self.get_url(), params=params, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert not response.content
+
+        last_modified = response.headers["Last-Modified"]
+        response = await client.get(url=self.get_url(), params=params, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = await client.get(
+            url=self.get_url(),
+            params={**params, "linear_step": "day"},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_upload_invalidates(self, client, db_session):
+        flights = random_flights(200)
+        await FlightRepository().create_batch(db_session, objs_in=flights[:100])
+        params = {"flag_full_dataset": True}
+        response = await client.get(url=self.get_url(), params=params)
+        etag = response.headers["ETag"]
+
+        summary = await FlightRepository().create_batch(db_session, objs_in=flights[:50])
+        assert summary.inserted == 0
+        response = await client.get(url=self.get_url(), params=params, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        await FlightRepository().create_batch(db_session, objs_in=flights[100:])
+        response = await client.get(url=self.get_url(), params=params, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.json()["total_count_flights"] == 200
+
+    @pytest.mark.asyncio
+    async def test_no_flights(self, client):
+        response = await client.get(url=self.get_url())
+        assert response.status_code == status.HTTP_404_NOT_FOUND
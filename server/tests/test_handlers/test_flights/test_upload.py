@@ -0,0 +1,278 @@
+import asyncio
+import io
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from starlette import status
+
+from app.db.models import Flight, UploadJob
+from app.utils.flight import upload
+from tests.fixtures.flight import flight_messages, make_xlsx
+
+
+async def wait_for_upload_job(client, job_id: str, timeout: float = 120) -> dict:
+    """
+    Polls status of upload job until it is finished.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        response = await client.get(url=f"/api/v1/flights/upload/{job_id}")
+        assert response.status_code == status.HTTP_200_OK
+        job = response.json()
+        if job["status"] in ("done", "failed") or loop.time() > deadline:
+            return job
+        await asyncio.sleep(0.2)
+
+
+async def wait_for_upload_batch(client, batch_id: str, timeout: float = 120) -> dict:
+    """
+    Polls status of upload batch until all its files are finished.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        response = await client.get(url=f"/api/v1/flights/upload/batch/{batch_id}")
+        assert response.status_code == status.HTTP_200_OK
+        batch = response.json()
+        if batch["status"] in ("done", "failed") or loop.time() > deadline:
+            return batch
+        await asyncio.sleep(0.2)
+
+
+def make_zip(files: dict[str, bytes], compression: int = zipfile.ZIP_STORED) -> bytes:
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w", compression=compression) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return content.getvalue()
+
+
+class TestUpload:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/upload/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client, db_session, flights_xlsx):
+        files = {"file": ("flights.xlsx", flights_xlsx)}
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["status"] == "pending"
+        assert response.json()["filename"] == "flights.xlsx"
+
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "done"
+        assert job["error"] is None
+        assert job["finished_at"] is not None
+        assert (job["rows_parsed"], job["rows_geocoded"], job["rows_inserted"], job["rows_rejected"]) == (5, 5, 5, 0)
+        assert job["parse_seconds"] > 0 and job["geocode_seconds"] > 0 and job["insert_seconds"] > 0
+        assert job["region_cache_hits"] + job["region_cache_misses"] == 10
+
+        count = await db_session.scalar(select(func.count()).select_from(Flight))
+        assert count == 5
+
+    @pytest.mark.asyncio
+    async def test_duplicate_sids(self, client, db_session):
+        response = await client.post(
+            url=self.get_url(),
+            files={"file": ("flights.xlsx", make_xlsx(flight_messages(3)))},
+        )
+        await wait_for_upload_job(client, response.json()["id"])
+
+        rows = flight_messages(4, first_sid=7772251101) + flight_messages(1, first_sid=7772251104)
+        response = await client.post(url=self.get_url(), files={"file": ("flights.xlsx", make_xlsx(rows))})
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "done"
+        assert (job["rows_parsed"], job["rows_inserted"], job["rows_rejected"]) == (5, 2, 3)
+
+        count = await db_session.scalar(select(func.count()).select_from(Flight))
+        assert count == 5
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows(self, client, db_session):
+        rows = flight_messages(4)
+        rows[1]["SHR"] = rows[1]["SHR"].replace("SID/", "")
+        rows[3]["SHR"] = rows[3]["SHR"].replace("TYP/BLA ", "")
+        response = await client.post(url=self.get_url(), files={"file": ("flights.xlsx", make_xlsx(rows))})
+
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "done"
+        assert (job["rows_parsed"], job["rows_inserted"], job["rows_rejected"]) == (4, 2, 2)
+        assert job["row_errors"] == [
+            {"row": 3, "column": "sid", "reason": "is missing"},
+            {"row": 5, "column": "type_aircraft", "reason": "is missing"},
+        ]
+
+        count = await db_session.scalar(select(func.count()).select_from(Flight))
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_broken_file(self, client):
+        files = {"file": ("flights.xlsx", b"not a workbook")}
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "failed"
+        assert job["error"]
+        assert job["rows_parsed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat(self, client, db_session, flights_xlsx, monkeypatch):
+        monkeypatch.setattr(upload, "UPLOAD_HEARTBEAT_SECONDS", 0.05)
+        response = await client.post(url=self.get_url(), files={"file": ("flights.xlsx", flights_xlsx)})
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "done"
+
+        job = await db_session.get(UploadJob, uuid.UUID(job["id"]))
+        assert job.heartbeat_at > job.created_at
+
+    @pytest.mark.asyncio
+    async def test_stale_job(self, client, db_session):
+        lost_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        stale = UploadJob(filename="lost.xlsx", status="running", created_at=lost_at, heartbeat_at=lost_at)
+        alive = UploadJob(filename="alive.xlsx", status="running", created_at=lost_at)
+        db_session.add_all([stale, alive])
+        await db_session.commit()
+
+        response = await client.get(url=f"{self.get_url()}{stale.id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "failed"
+        assert response.json()["error"] == "Worker of the job has stopped"
+        assert response.json()["finished_at"] is not None
+
+        response = await client.get(url=f"{self.get_url()}{alive.id}")
+        assert response.json()["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, client):
+        response = await client.get(url=f"{self.get_url()}{uuid.uuid4()}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_bad_extension(self, client, flights_xlsx):
+        files = {"file": ("flights.csv", flights_xlsx)}
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_extension_case(self, client, flights_xlsx):
+        response = await client.post(url=self.get_url(), files={"file": ("FLIGHTS.XLSX", flights_xlsx)})
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        job = await wait_for_upload_job(client, response.json()["id"])
+        assert job["status"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_empty_file(self, client):
+        files = {"file": ("flights.xlsx", b"")}
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestBatchUpload:
+    @staticmethod
+    def get_url() -> str:
+        return "/api/v1/flights/upload/batch/"
+
+    @pytest.mark.asyncio
+    async def test_base_scenario(self, client, db_session):
+        archive = make_zip({
+            "2025/march.xlsx": make_xlsx(flight_messages(2, first_sid=7772251200)),
+            "2025/readme.txt": b"flights of march",
+            "__MACOSX/2025/._march.xlsx": b"",
+        })
+        files = [
+            ("files", ("january.xlsx", make_xlsx(flight_messages(3, first_sid=7772251100)))),
+            ("files", ("february.xlsx", make_xlsx(flight_messages(4, first_sid=7772251103)))),
+            ("files", ("spring.zip", archive)),
+        ]
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert [job["filename"] for job in response.json()["jobs"]] == [
+            "january.xlsx",
+            "february.xlsx",
+            "spring.zip/2025/march.xlsx",
+        ]
+
+        batch = await wait_for_upload_batch(client, response.json()["id"])
+        assert batch["status"] == "done"
+        assert batch["finished_at"] is not None
+        assert (batch["rows_parsed"], batch["rows_inserted"], batch["rows_rejected"]) == (9, 9, 0)
+        assert [(job["rows_parsed"], job["rows_inserted"]) for job in batch["jobs"]] == [(3, 3), (4, 4), (2, 2)]
+        assert all(job["batch_id"] == batch["id"] for job in batch["jobs"])
+
+        count = await db_session.scalar(select(func.count()).select_from(Flight))
+        assert count == 9
+
+    @pytest.mark.asyncio
+    async def test_duplicate_sids(self, client, db_session):
+        files = [
+            ("files", ("first.xlsx", make_xlsx(flight_messages(3)))),
+            ("files", ("second.xlsx", make_xlsx(flight_messages(3)))),
+        ]
+        response = await client.post(url=self.get_url(), files=files)
+
+        batch = await wait_for_upload_batch(client, response.json()["id"])
+        assert batch["status"] == "done"
+        assert (batch["rows_parsed"], batch["rows_inserted"], batch["rows_rejected"]) == (6, 3, 3)
+
+        count = await db_session.scalar(select(func.count()).select_from(Flight))
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_broken_file(self, client, flights_xlsx):
+        files = [
+            ("files", ("flights.xlsx", flights_xlsx)),
+            ("files", ("broken.xlsx", b"not a workbook")),
+        ]
+        response = await client.post(url=self.get_url(), files=files)
+
+        batch = await wait_for_upload_batch(client, response.json()["id"])
+        assert batch["status"] == "failed"
+        assert [job["status"] for job in batch["jobs"]] == ["done", "failed"]
+        assert batch["rows_inserted"] == 5
+
+    @pytest.mark.asyncio
+    async def test_unknown_batch(self, client):
+        response = await client.get(url=f"{self.get_url()}{uuid.uuid4()}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "filename, content",
+        [
+            ("flights.csv", b"sid"),
+            ("flights.xlsx", b""),
+            ("flights.zip", b"not an archive"),
+            ("flights.zip", make_zip({"readme.txt": b"no flights"})),
+            ("flights.zip", make_zip({"bomb.xlsx": bytes(10 ** 7)}, compression=zipfile.ZIP_DEFLATED)),
+        ],
+    )
+    async def test_bad_files(self, client, flights_xlsx, filename, content):
+        files = [("files", ("flights.xlsx", flights_xlsx)), ("files", (filename, content))]
+        response = await client.post(url=self.get_url(), files=files)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "limit, value",
+        [
+            ("UPLOAD_ARCHIVE_MAX_FILES", 1),
+            ("UPLOAD_ARCHIVE_MAX_SIZE", 1000),
+            ("UPLOAD_ARCHIVE_MAX_RATIO", 0.5),
+        ],
+    )
+    async def test_archive_limits(self, client, db_session, monkeypatch, limit, value):
+        monkeypatch.setattr(upload, limit, value)
+        content = make_xlsx(flight_messages(1))
+        archive = make_zip({"first.xlsx": content, "second.xlsx": content}, compression=zipfile.ZIP_DEFLATED)
+        response = await client.post(url=self.get_url(), files=[("files", ("flights.zip", archive))])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        jobs = await db_session.scalars(select(UploadJob))
+        assert jobs.all() == []
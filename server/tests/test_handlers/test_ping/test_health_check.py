@@ -18,3 +18,21 @@ class TestHealthCheckHandler:
         url = self.get_url() + '/ping_database'
         response = await client.get(url=url)
         assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio()
+    async def test_executors(self, client):
+        url = self.get_url() + '/executors'
+        response = await client.get(url=url)
+        assert response.status_code == status.HTTP_200_OK
+        metrics = {executor["name"]: executor for executor in response.json()}
+        assert set(metrics) == {"threads", "processes", "ingest"}
+        assert all(executor["running"] >= 0 and executor["queued"] >= 0 for executor in metrics.values())
+
+    @pytest.mark.asyncio()
+    async def test_caches(self, client):
+        url = self.get_url() + '/caches'
+        response = await client.get(url=url)
+        assert response.status_code == status.HTTP_200_OK
+        metrics = {cache["name"]: cache for cache in response.json()}
+        assert set(metrics) == {"statistic"}
+        assert all(isinstance(calls["count"], int) for calls in metrics["statistic"]["coalesced"])